@@ -1,5 +1,15 @@
+import atexit
+
 from django.apps import AppConfig
 
 
 class ActivityConfig(AppConfig):
     name = 'apps.activity'
+
+    def ready(self):
+        from django.core.signals import request_finished
+        from .buffer import activity_buffer
+
+        # Flush queued audit entries after each response and drain on shutdown
+        request_finished.connect(activity_buffer.flush, dispatch_uid='activity_buffer_flush')
+        atexit.register(activity_buffer.flush)
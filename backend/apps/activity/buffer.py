@@ -0,0 +1,84 @@
+import logging
+import threading
+
+from django.conf import settings
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'BATCH_SIZE': 100,
+    'MAX_PENDING': 10000,
+}
+
+
+class ActivityLogBuffer:
+    """
+    In-process queue of unsaved ActivityLog entries written with bulk_create.
+
+    A flush happens when BATCH_SIZE entries are pending, at the end of
+    every request and at interpreter shutdown; there is no timer, so code
+    logging outside a request (management commands, scripts) should call
+    flush() when it is done. Entries beyond MAX_PENDING are dropped rather
+    than growing the queue without bound.
+    """
+
+    def __init__(self, enabled=True, batch_size=100, max_pending=10000):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = []
+        self._counters = {'queued': 0, 'flushed': 0, 'dropped': 0}
+
+    @classmethod
+    def from_settings(cls):
+        options = {**DEFAULTS, **getattr(settings, 'ACTIVITY_LOG_BUFFER', {})}
+        return cls(
+            enabled=options['ENABLED'],
+            batch_size=options['BATCH_SIZE'],
+            max_pending=options['MAX_PENDING'],
+        )
+
+    def add(self, entry):
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self._counters['dropped'] += 1
+                return False
+            self._pending.append(entry)
+            self._counters['queued'] += 1
+            due = len(self._pending) >= self.batch_size
+        if due:
+            self.flush()
+        return True
+
+    def flush(self, **kwargs):
+        """
+        Writes every pending entry. Accepts and ignores signal kwargs so it
+        can be connected to request_finished directly.
+        """
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+
+        try:
+            ActivityLog.objects.bulk_create(batch, batch_size=self.batch_size)
+        except Exception:
+            logger.exception("Dropping %d activity log entries after a failed flush", len(batch))
+            with self._lock:
+                self._counters['dropped'] += len(batch)
+            return 0
+
+        with self._lock:
+            self._counters['flushed'] += len(batch)
+        return len(batch)
+
+    def counters(self):
+        with self._lock:
+            return {**self._counters, 'pending': len(self._pending)}
+
+
+activity_buffer = ActivityLogBuffer.from_settings()
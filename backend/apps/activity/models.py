@@ -1,6 +1,7 @@
 
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 class ActivityLog(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -12,7 +13,8 @@ class ActivityLog(models.Model):
         blank=True
     )
     action = models.CharField(max_length=255)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the entry is logged, not when the buffered write reaches the DB
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         indexes = [
@@ -0,0 +1,14 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ActivityLogCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the audit feed. Pages are located by a
+    `created_at` cursor rather than an OFFSET, so together with the
+    (project, created_at) index the cost of a page does not depend on
+    how much history sits behind it.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-created_at', '-id')
@@ -14,3 +14,19 @@ class ActivityLogSerializer(serializers.ModelSerializer):
             'task', 'task_name', 'action', 'created_at'
         ]
         read_only_fields = ['created_at']
+
+class ActivityLogCompactSerializer(serializers.ModelSerializer):
+    """
+    Lightweight feed representation: ids plus display names only.
+    """
+    user_name = serializers.CharField(source='user.name', read_only=True)
+    task_name = serializers.CharField(source='task.title', read_only=True)
+    project_name = serializers.CharField(source='project.name', read_only=True)
+
+    class Meta:
+        model = ActivityLog
+        fields = [
+            'id', 'user', 'user_name', 'project', 'project_name',
+            'task', 'task_name', 'action', 'created_at'
+        ]
+        read_only_fields = fields
@@ -1,3 +1,137 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from apps.projects.models import Client, Project
+from apps.tasks.models import TaskType
+from apps.users.models import Department, Role, User
+from .buffer import ActivityLogBuffer
+from .models import ActivityLog
+from .serializers import ActivityLogCompactSerializer, ActivityLogSerializer
+from .utils import log_system_activity
+
+
+class ActivityLogFixtureMixin:
+    def setUp(self):
+        department = Department.objects.create(name='Development')
+        self.user = User.objects.create_user(
+            username='admin', email='admin@example.com', password='secret', name='Admin',
+            role=Role.objects.create(name='SUPER_ADMIN'), department=department
+        )
+        client = Client.objects.create(
+            name='Acme', email='acme@example.com', phone='123', company_name='Acme Ltd', address='Street 1'
+        )
+        self.project = Project.objects.create(
+            name='Website', client=client, department=department,
+            project_manager=self.user, created_by=self.user,
+            start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+        )
+
+
+class ActivityLogFeedTests(ActivityLogFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        ActivityLog.objects.bulk_create([
+            ActivityLog(user=self.user, project=self.project, action=f'Action {i}') for i in range(60)
+        ])
+        self.client.force_authenticate(user=self.user)
+
+    def test_feed_is_cursor_paginated(self):
+        response = self.client.get('/api/v1/activity-logs/', {'project_id': self.project.id})
+
+        self.assertEqual(len(response.data['results']), 50)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIsNone(response.data['next'])
+
+    def test_compact_mode_ships_names_only(self):
+        response = self.client.get('/api/v1/activity-logs/', {'compact': 'true', 'page_size': 1})
+
+        entry = response.data['results'][0]
+        self.assertNotIn('user_details', entry)
+        self.assertEqual(entry['user_name'], 'Admin')
+        self.assertEqual(entry['project_name'], 'Website')
+
+    def test_sparse_fields_keep_the_cursor_working(self):
+        response = self.client.get('/api/v1/activity-logs/', {'fields': 'id,action'})
+
+        self.assertEqual(set(response.data['results'][0]), {'id', 'action'})
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 10)
+
+
+class ActivityLogFastListTests(ActivityLogFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        ActivityLog.objects.create(user=self.user, project=self.project, action='No task')
+        ActivityLog.objects.create(
+            user=self.user, project=self.project, action='With task',
+            task=self.project.tasks.create(
+                title='Landing page', description='', priority='low', due_date=date(2024, 6, 1),
+                created_by=self.user, task_type=TaskType.objects.create(name='Dev')
+            )
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def assertMatchesSerializer(self, serializer_class, params):
+        response = self.client.get('/api/v1/activity-logs/', params)
+
+        expected = serializer_class(ActivityLog.objects.order_by('-created_at', '-id'), many=True).data
+        self.assertEqual(JSONRenderer().render(response.data['results']), JSONRenderer().render(expected))
+
+    def test_full_representation_matches_serializer(self):
+        self.assertMatchesSerializer(ActivityLogSerializer, {})
+
+    def test_compact_representation_matches_serializer(self):
+        self.assertMatchesSerializer(ActivityLogCompactSerializer, {'compact': 'true'})
+
+    def test_rows_are_read_without_model_instances(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/v1/activity-logs/', {'fields': 'id,task_name'})
+
+        # ETag aggregate plus one values() query with the task joined in
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertIn('"tasks_task"."title"', ctx.captured_queries[-1]['sql'])
+
+
+class ActivityLogBufferTests(ActivityLogFixtureMixin, APITestCase):
+    def make_entry(self, action='Did something'):
+        return ActivityLog(user=self.user, project=self.project, action=action)
+
+    def test_flushes_when_batch_is_full(self):
+        buffer = ActivityLogBuffer(batch_size=3)
+        buffer.add(self.make_entry())
+        buffer.add(self.make_entry())
+        self.assertEqual(ActivityLog.objects.count(), 0)
+
+        buffer.add(self.make_entry())
+        self.assertEqual(ActivityLog.objects.count(), 3)
+        self.assertEqual(buffer.counters(), {'queued': 3, 'flushed': 3, 'dropped': 0, 'pending': 0})
+
+    def test_drops_entries_beyond_capacity(self):
+        buffer = ActivityLogBuffer(batch_size=10, max_pending=2)
+        for _ in range(3):
+            buffer.add(self.make_entry())
+
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(buffer.counters()['dropped'], 1)
+
+    def test_entries_are_written_after_commit_and_request_end(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            log_system_activity(user=self.user, project=self.project, action='Created task: A')
+
+        # The buffer is drained when the next request finishes
+        self.client.get('/api/v1/activity-logs/')
+        self.assertTrue(ActivityLog.objects.filter(action='Created task: A').exists())
+
+    def test_entries_wait_for_commit(self):
+        log_system_activity(user=self.user, project=self.project, action='Uncommitted')
+        self.client.get('/api/v1/activity-logs/')
+
+        self.assertFalse(ActivityLog.objects.filter(action='Uncommitted').exists())
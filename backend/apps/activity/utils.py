@@ -1,12 +1,25 @@
+from django.db import transaction
+from django.utils import timezone
+
+from apps.activity.buffer import activity_buffer
 from apps.activity.models import ActivityLog
 
 def log_system_activity(user, project, action, task=None):
     """
     Utility function to create an audit log entry.
+
+    The entry is stamped now but written by the shared ActivityLogBuffer
+    once the surrounding transaction commits, so it never lands for work
+    that was rolled back.
     """
-    ActivityLog.objects.create(
+    entry = ActivityLog(
         user=user,
         project=project,
         task=task,
-        action=action
+        action=action,
+        created_at=timezone.now()
     )
+    if not activity_buffer.enabled:
+        entry.save()
+        return
+    transaction.on_commit(lambda: activity_buffer.add(entry))
@@ -1,17 +1,41 @@
 from rest_framework import viewsets, permissions
+from core.mixins import ConditionalGetMixin, FastListMixin, SparseFieldsMixin
 from .models import ActivityLog
-from .serializers import ActivityLogSerializer
+from .pagination import ActivityLogCursorPagination
+from .serializers import ActivityLogSerializer, ActivityLogCompactSerializer
 
-class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
+class ActivityLogViewSet(ConditionalGetMixin, FastListMixin, SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
     """
     Centralized audit trail view. Read-only to preserve integrity.
+    Pass `?compact=true` for the id/name-only representation.
     """
     queryset = ActivityLog.objects.all()
     serializer_class = ActivityLogSerializer
     permission_classes = [permissions.IsAuthenticated]
+    use_replica = True
+    pagination_class = ActivityLogCursorPagination
+    fast_list = True
+    conditional_models = ('users.user', 'users.role', 'users.department', 'tasks.task', 'projects.project')
+
+    @property
+    def is_compact(self):
+        return self.request.query_params.get('compact', '').lower() in ('1', 'true', 'yes')
+
+    def get_serializer_class(self):
+        if self.is_compact:
+            return ActivityLogCompactSerializer
+        return ActivityLogSerializer
 
     def get_queryset(self):
-        queryset = ActivityLog.objects.all()
+        if self.is_compact:
+            queryset = ActivityLog.objects.select_related('user', 'project', 'task').only(
+                'id', 'action', 'created_at', 'user_id', 'project_id', 'task_id',
+                'user__name', 'project__name', 'task__title'
+            )
+        else:
+            queryset = ActivityLog.objects.select_related(
+                'user__role', 'user__department', 'project', 'task'
+            )
         project_id = self.request.query_params.get('project_id')
         task_id = self.request.query_params.get('task_id')
         
@@ -0,0 +1,136 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import ProtectedError, RestrictedError
+from django.db.models.deletion import Collector
+from django.utils import timezone
+
+from apps.activity.models import ActivityLog
+from apps.archive.models import ArchivedRecord
+from core.models import SoftDeleteModel
+
+# Never removed by archiving: rows whose cascade would reach these are kept
+RETAINED_MODELS = (ActivityLog,)
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves rows soft-deleted more than --days ago (and everything that "
+        "cascades from them) into ArchivedRecord, then hard-deletes them. "
+        "Rows protected from deletion, referenced by the activity log or with "
+        "children that were not binned along with them are kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        models = [model for model in apps.get_models() if issubclass(model, SoftDeleteModel)]
+
+        for model in models:
+            expired = model.all_objects.filter(deleted_at__lt=cutoff).order_by('pk')
+            if options['dry_run']:
+                self.stdout.write(f"{model._meta.label}: {expired.count()} rows to archive")
+                continue
+
+            archived = skipped = 0
+            last_pk = None
+            while True:
+                batch = expired if last_pk is None else expired.filter(pk__gt=last_pk)
+                batch = list(batch[:options['batch_size']])
+                if not batch:
+                    break
+                last_pk = batch[-1].pk
+                batch_archived, batch_skipped = self.archive_batch(batch)
+                archived += batch_archived
+                skipped += batch_skipped
+
+            if archived or skipped:
+                self.stdout.write(
+                    f"{model._meta.label}: archived {archived} rows, kept {skipped} protected, audited or with live children"
+                )
+
+    def archive_batch(self, batch):
+        """
+        Archives the batch one soft delete at a time (rows sharing a
+        deleted_at), falling back to single objects if anything in a group
+        has to be kept. Returns (rows archived, objects kept).
+        """
+        groups = defaultdict(list)
+        for obj in batch:
+            groups[obj.deleted_at].append(obj)
+        archived = skipped = 0
+        for group in groups.values():
+            group_archived, group_skipped = self.archive_group(group)
+            archived += group_archived
+            skipped += group_skipped
+        return archived, skipped
+
+    def archive_group(self, group):
+        archived = self.archive(group)
+        if archived is not None:
+            return archived, 0
+        if len(group) == 1:
+            return 0, 1
+        archived = skipped = 0
+        for obj in group:
+            rows = self.archive([obj])
+            if rows is None:
+                skipped += 1
+            else:
+                archived += rows
+        return archived, skipped
+
+    def collect(self, objects):
+        """The delete cascade of `objects`, or None if it must not run."""
+        collector = Collector(using='default')
+        try:
+            collector.collect(objects)
+        except (ProtectedError, RestrictedError):
+            return None
+        if any(model in RETAINED_MODELS for model in collector.data) or any(
+            queryset.model in RETAINED_MODELS and queryset.exists() for queryset in collector.fast_deletes
+        ):
+            return None
+        # Soft deletes never cascaded before this command existed, so the
+        # cascade may reach rows that are live or were binned on their own
+        deleted_at = {obj.deleted_at for obj in objects}
+        if any(
+            issubclass(model, SoftDeleteModel) and any(row.deleted_at not in deleted_at for row in rows)
+            for model, rows in collector.data.items()
+        ) or any(
+            issubclass(queryset.model, SoftDeleteModel) and queryset.exclude(deleted_at__in=deleted_at).exists()
+            for queryset in collector.fast_deletes
+        ):
+            return None
+        return collector
+
+    def archive(self, objects):
+        with transaction.atomic():
+            collector = self.collect(objects)
+            if collector is None:
+                return None
+
+            doomed = [obj for instances in collector.data.values() for obj in instances]
+            # Fast deletes are issued as bare querysets; load them so nothing is lost
+            for queryset in collector.fast_deletes:
+                doomed.extend(queryset)
+
+            ArchivedRecord.objects.bulk_create([
+                ArchivedRecord(
+                    model_label=row['model'],
+                    object_pk=str(row['pk']),
+                    data=row['fields'],
+                    deleted_at=getattr(obj, 'deleted_at', None),
+                )
+                for obj, row in zip(doomed, serializers.serialize('python', doomed))
+            ])
+            collector.delete()
+            return len(doomed)
@@ -0,0 +1,22 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class ArchivedRecord(models.Model):
+    """
+    Cold storage for rows purged by `manage.py archive_soft_deleted`.
+    Each row keeps the serialized field values of one deleted object.
+    """
+    model_label = models.CharField(max_length=100)
+    object_pk = models.CharField(max_length=64)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model_label', 'object_pk']),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label} #{self.object_pk}"
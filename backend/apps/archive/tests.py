@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.activity.models import ActivityLog
+from apps.projects.models import Client, Project
+from apps.tasks.models import Task, TaskComment, TaskType
+from apps.users.models import Department, Role, User
+from core.models import soft_delete
+from .models import ArchivedRecord
+
+
+class ArchiveSoftDeletedTests(TestCase):
+    def setUp(self):
+        department = Department.objects.create(name='Development')
+        self.user = User.objects.create_user(
+            username='admin', email='admin@example.com', password='secret', name='Admin',
+            role=Role.objects.create(name='SUPER_ADMIN'), department=department
+        )
+        client = Client.objects.create(
+            name='Acme', email='acme@example.com', phone='123', company_name='Acme Ltd', address='Street 1'
+        )
+        self.project = Project.objects.create(
+            name='Website', client=client, department=department,
+            project_manager=self.user, created_by=self.user,
+            start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+        )
+        self.task_type = TaskType.objects.create(name='Dev')
+
+    def create_task(self, deleted_days_ago):
+        task = Task.objects.create(
+            project=self.project, title='Task', description='', task_type=self.task_type,
+            priority='low', due_date=date(2024, 6, 1), created_by=self.user
+        )
+        TaskComment.objects.create(task=task, user=self.user, comment='hello')
+        soft_delete(Task.all_objects.filter(pk=task.pk), timezone.now() - timedelta(days=deleted_days_ago))
+        return task
+
+    def test_moves_expired_rows_and_their_cascade_into_the_archive(self):
+        expired = self.create_task(deleted_days_ago=120)
+        recent = self.create_task(deleted_days_ago=5)
+
+        call_command('archive_soft_deleted', days=90, stdout=StringIO())
+
+        self.assertFalse(Task.all_objects.filter(pk=expired.pk).exists())
+        self.assertTrue(Task.all_objects.filter(pk=recent.pk).exists())
+        self.assertEqual(
+            sorted(ArchivedRecord.objects.values_list('model_label', flat=True)),
+            ['tasks.task', 'tasks.taskcomment']
+        )
+        archived_task = ArchivedRecord.objects.get(model_label='tasks.task')
+        self.assertEqual(archived_task.object_pk, str(expired.pk))
+        self.assertEqual(archived_task.data['title'], 'Task')
+
+    def test_protected_rows_are_left_in_place(self):
+        self.task_type.deleted_at = timezone.now() - timedelta(days=120)
+        self.task_type.save()
+        self.create_task(deleted_days_ago=1)
+
+        call_command('archive_soft_deleted', days=90, stdout=StringIO())
+
+        self.assertTrue(TaskType.all_objects.filter(pk=self.task_type.pk).exists())
+        self.assertFalse(ArchivedRecord.objects.exists())
+
+    def test_rows_referenced_by_the_activity_log_are_kept(self):
+        ActivityLog.objects.create(user=self.user, project=self.project, action='Created project')
+        Project.all_objects.filter(pk=self.project.pk).update(deleted_at=timezone.now() - timedelta(days=120))
+        expired = self.create_task(deleted_days_ago=120)
+        ActivityLog.objects.create(user=self.user, project=self.project, task=expired, action='Created task')
+
+        call_command('archive_soft_deleted', days=90, stdout=StringIO())
+
+        # The task goes, its log entry stays and loses only the task link
+        self.assertTrue(Project.all_objects.filter(pk=self.project.pk).exists())
+        self.assertFalse(Task.all_objects.filter(pk=expired.pk).exists())
+        self.assertEqual(ActivityLog.objects.count(), 2)
+        self.assertFalse(ActivityLog.objects.filter(task__isnull=False).exists())
+
+    def test_live_children_of_expired_rows_are_kept(self):
+        # Binned before soft deletes cascaded: the project under it is live
+        Client.all_objects.filter(pk=self.project.client_id).update(
+            deleted_at=timezone.now() - timedelta(days=200)
+        )
+
+        call_command('archive_soft_deleted', days=90, stdout=StringIO())
+
+        self.assertTrue(Client.all_objects.filter(pk=self.project.client_id).exists())
+        self.assertTrue(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertFalse(ArchivedRecord.objects.exists())
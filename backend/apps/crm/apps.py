@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CrmConfig(AppConfig):
     name = 'apps.crm'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
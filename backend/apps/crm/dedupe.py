@@ -0,0 +1,123 @@
+from difflib import SequenceMatcher
+from itertools import combinations, groupby
+
+from django.db.models import Count, Q
+
+from .models import BLOCKING_FIELDS, Lead
+from .normalize import normalize_name
+
+NAME_SIMILARITY = 0.85
+MAX_CANDIDATES = 200
+# Name blocks larger than this are skipped by cluster_duplicates
+MAX_BLOCK_SIZE = 100
+
+
+def name_similarity(a, b):
+    return SequenceMatcher(None, normalize_name(a), normalize_name(b)).ratio()
+
+
+def compare(lead, candidate, threshold=NAME_SIMILARITY):
+    """
+    (score, reasons) when `candidate` looks like the same contact as
+    `lead`, else None. A shared email or phone number is a match on its
+    own; names must also be similar when they are the only link.
+    """
+    reasons = []
+    if lead.email_normalized and lead.email_normalized == candidate.email_normalized:
+        reasons.append('email')
+    if lead.phone_normalized and lead.phone_normalized == candidate.phone_normalized:
+        reasons.append('phone')
+    similarity = name_similarity(lead.name, candidate.name)
+    if similarity >= threshold:
+        reasons.append('name')
+    if not reasons:
+        return None
+    score = max(similarity, 1.0 if 'email' in reasons else 0, 0.95 if 'phone' in reasons else 0)
+    return round(score, 3), reasons
+
+
+def find_duplicates(lead, queryset=None, threshold=NAME_SIMILARITY, limit=MAX_CANDIDATES):
+    """
+    Existing leads that look like `lead` (saved or not), best match first.
+    Candidates are the rows sharing one of its blocking keys, fetched
+    through the blocking-key indexes, so the cost does not grow with the
+    table; each carries `duplicate_score` and `duplicate_reasons`.
+    """
+    lead.set_blocking_keys()
+    keys = Q()
+    for field in BLOCKING_FIELDS:
+        value = getattr(lead, field)
+        if value:
+            keys |= Q(**{field: value})
+    if not keys:
+        return []
+
+    candidates = (queryset if queryset is not None else Lead.objects.all()).filter(keys)
+    if lead.pk:
+        candidates = candidates.exclude(pk=lead.pk)
+    matches = []
+    for candidate in candidates.order_by('-created_at')[:limit]:
+        result = compare(lead, candidate, threshold)
+        if result:
+            candidate.duplicate_score, candidate.duplicate_reasons = result
+            matches.append(candidate)
+    return sorted(matches, key=lambda candidate: -candidate.duplicate_score)
+
+
+class DisjointSet:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        root = self.parent.setdefault(item, item)
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while item != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+    def groups(self):
+        clusters = {}
+        for item in self.parent:
+            clusters.setdefault(self.find(item), []).append(item)
+        return [sorted(members) for members in clusters.values() if len(members) > 1]
+
+
+def blocks(field, columns):
+    """Rows of every live lead whose `field` value is shared with another lead, grouped by that value."""
+    shared = Lead.objects.exclude(**{field: ''}).values(field).annotate(
+        count=Count('id')
+    ).filter(count__gt=1).values(field)
+    rows = Lead.objects.filter(**{f'{field}__in': shared}).order_by(field, 'id').values_list(field, *columns)
+    for _, group in groupby(rows.iterator(chunk_size=2000), key=lambda row: row[0]):
+        yield [row[1:] for row in group]
+
+
+def cluster_duplicates(threshold=NAME_SIMILARITY, max_block_size=MAX_BLOCK_SIZE):
+    """
+    Groups live leads into clusters of probable duplicates without a
+    pairwise scan of the table. Leads sharing a normalized email or phone
+    are joined outright; within each name-key block, names are compared
+    pairwise, so the work is bounded by the squared block sizes. Returns
+    (clusters as sorted id lists, number of skipped oversized blocks).
+    """
+    clusters = DisjointSet()
+    for field in ('email_normalized', 'phone_normalized'):
+        for block in blocks(field, ['id']):
+            first = block[0][0]
+            for (pk,) in block[1:]:
+                clusters.union(first, pk)
+
+    skipped = 0
+    for block in blocks('name_key', ['id', 'name']):
+        if len(block) > max_block_size:
+            skipped += 1
+            continue
+        normalized = [(pk, normalize_name(name)) for pk, name in block]
+        for (a, name_a), (b, name_b) in combinations(normalized, 2):
+            if SequenceMatcher(None, name_a, name_b).ratio() >= threshold:
+                clusters.union(a, b)
+    return sorted(clusters.groups(), key=lambda members: (-len(members), members[0])), skipped
@@ -0,0 +1,173 @@
+"""
+Streaming CSV import of leads. Rows are read and validated BATCH_SIZE at a
+time, so memory stays flat however long the file is, and each batch is
+written with bulk_create in its own transaction. bulk_create skips
+post_save, so the bulk_created signal is sent for the new rows to keep the
+dashboard snapshot, search index and response caches current.
+"""
+import csv
+import io
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+from apps.users.models import User
+from core.models import bulk_created
+from .models import Lead, LeadAssignment
+from .serializers import LeadImportRowSerializer
+
+BATCH_SIZE = 1000
+REQUIRED_COLUMNS = ('name', 'email', 'phone')
+# Problem rows listed in the report; any beyond this are only counted
+MAX_REPORTED_ROWS = 500
+
+
+class ImportFileError(ValueError):
+    pass
+
+
+def open_upload(upload):
+    """Text stream over an uploaded file, decoded as it is read."""
+    return io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = self.created = 0
+        self.failed = self.duplicates = 0
+        self.errors = []
+        self.duplicate_rows = []
+        self.aborted = None
+
+    def reject(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ROWS:
+            self.errors.append({'row': line, 'errors': errors})
+
+    def skip(self, line, lead_id):
+        self.duplicates += 1
+        if len(self.duplicate_rows) < MAX_REPORTED_ROWS:
+            self.duplicate_rows.append({'row': line, 'lead': lead_id})
+
+    def as_dict(self):
+        return {
+            'rows': self.rows, 'created': self.created,
+            'duplicates': self.duplicates, 'failed': self.failed,
+            'errors': self.errors, 'duplicate_rows': self.duplicate_rows,
+            'aborted': self.aborted,
+        }
+
+
+def numbered_rows(reader):
+    # line_num is the physical line a row ends on, which is what editors show
+    for row in reader:
+        yield reader.line_num, row
+
+
+def clean_row(row, source):
+    # Extra cells land under the None key; missing ones are None
+    row = {key: (value or '').strip() for key, value in row.items() if key is not None}
+    if not row.get('source'):
+        row['source'] = source
+    return row
+
+
+def resolve_assignees(rows):
+    emails = {row['assigned_to'] for _, row in rows if row.get('assigned_to')}
+    if not emails:
+        return {}
+    return dict(User.objects.filter(email__in=emails, deleted_at__isnull=True).values_list('email', 'id'))
+
+
+def find_existing(leads):
+    """Ids of live leads sharing a normalized email or phone, keyed by (field, value)."""
+    emails = {lead.email_normalized for lead in leads if lead.email_normalized}
+    phones = {lead.phone_normalized for lead in leads if lead.phone_normalized}
+    existing = {}
+    rows = Lead.objects.filter(
+        Q(email_normalized__in=emails) | Q(phone_normalized__in=phones)
+    ).values_list('id', 'email_normalized', 'phone_normalized')
+    for pk, email, phone in rows:
+        existing.setdefault(('email', email), pk)
+        existing.setdefault(('phone', phone), pk)
+    return existing
+
+
+def import_batch(batch, report, serializer, source, skip_duplicates):
+    validated = []
+    for line, row in batch:
+        try:
+            validated.append((line, serializer.run_validation(clean_row(row, source))))
+        except ValidationError as exc:
+            report.reject(line, exc.detail)
+
+    assignees = resolve_assignees(validated)
+    pending = []
+    for line, data in validated:
+        assignee = data.pop('assigned_to', '')
+        if assignee and assignee not in assignees:
+            report.reject(line, {'assigned_to': ['No user with this email.']})
+            continue
+        lead = Lead(**data)
+        lead.set_blocking_keys()
+        pending.append((line, lead, assignees.get(assignee)))
+
+    with transaction.atomic():
+        leads, assignments, duplicates = [], [], []
+        # Keys seen earlier in this batch; earlier batches are already in the table
+        seen = find_existing([lead for _, lead, _ in pending]) if skip_duplicates else {}
+        for line, lead, assignee_id in pending:
+            keys = [('email', lead.email_normalized), ('phone', lead.phone_normalized)]
+            match = next((seen[key] for key in keys if key[1] and key in seen), None)
+            if match is not None:
+                duplicates.append((line, match))
+                continue
+            if skip_duplicates:
+                seen.update((key, lead) for key in keys if key[1])
+            leads.append(lead)
+            if assignee_id:
+                assignments.append(LeadAssignment(lead=lead, sales_exec_id=assignee_id))
+
+        Lead.objects.bulk_create(leads)
+        LeadAssignment.objects.bulk_create(assignments)
+        bulk_created.send(sender=Lead, objs=leads)
+        if assignments:
+            bulk_created.send(sender=LeadAssignment, objs=assignments)
+
+    for line, match in duplicates:
+        # Matches within the batch were unsaved when found; they have ids now
+        report.skip(line, match.pk if isinstance(match, Lead) else match)
+    report.created += len(leads)
+
+
+def import_csv(stream, source='import', skip_duplicates=True, batch_size=BATCH_SIZE):
+    """
+    Creates leads from a CSV text stream with `name`, `email` and `phone`
+    columns and optional `source`, `status` and `assigned_to` (a user's
+    email) columns. Rows failing validation are reported, not imported;
+    with `skip_duplicates`, rows whose normalized email or phone matches
+    an existing lead or an earlier row are skipped. Returns the report
+    as a dict.
+    """
+    reader = csv.DictReader(stream)
+    try:
+        columns = reader.fieldnames or []
+    except (csv.Error, UnicodeDecodeError) as exc:
+        raise ImportFileError(f'Could not read the CSV header: {exc}')
+    missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ImportFileError(f"Missing required columns: {', '.join(missing)}")
+
+    report = ImportReport()
+    serializer = LeadImportRowSerializer()
+    rows = numbered_rows(reader)
+    try:
+        while batch := list(islice(rows, batch_size)):
+            report.rows += len(batch)
+            import_batch(batch, report, serializer, source, skip_duplicates)
+    except (csv.Error, UnicodeDecodeError) as exc:
+        # Batches before the bad line are already committed
+        report.aborted = f'Stopped after line {reader.line_num}: {exc}'
+    return report.as_dict()
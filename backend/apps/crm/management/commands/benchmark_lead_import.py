@@ -0,0 +1,63 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.crm.importer import BATCH_SIZE, import_csv
+from apps.crm.serializers import LeadSerializer
+
+HEADER = 'name,email,phone,source,status\n'
+
+
+def csv_lines(count):
+    # Every 20th row repeats an earlier email and every 50th is invalid
+    yield HEADER
+    for i in range(count):
+        email = f'lead{i - 7 if i % 20 == 19 else i}@example.com'
+        if i % 50 == 49:
+            email = 'not-an-email'
+        yield f'Lead {i},{email},+1 555 {i:07d},trade-show,new\n'
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures lead import throughput in rows/second: the streaming CSV "
+        "importer against one serializer save per row (the single POST "
+        "path). Imported rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000)
+        parser.add_argument('--single-rows', type=int, default=1000,
+                            help='Rows created one at a time for the baseline')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = time.perf_counter()
+            report = import_csv(
+                io.StringIO(''.join(csv_lines(options['rows']))), source='benchmark',
+                batch_size=options['batch_size']
+            )
+            elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        self.stdout.write(
+            f"Streaming import: {report['rows']} rows in {elapsed:.2f} s = {report['rows'] / elapsed:,.0f} rows/s "
+            f"({report['created']} created, {report['duplicates']} duplicates, {report['failed']} failed)"
+        )
+
+        count = options['single_rows']
+        with transaction.atomic():
+            started = time.perf_counter()
+            for i in range(count):
+                serializer = LeadSerializer(data={
+                    'name': f'Lead {i}', 'email': f'lead{i}@example.com',
+                    'phone': f'+1 555 {i:07d}', 'source': 'benchmark',
+                })
+                serializer.is_valid(raise_exception=True)
+                with transaction.atomic():
+                    serializer.save()
+            elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        self.stdout.write(f"Row by row: {count} rows in {elapsed:.2f} s = {count / elapsed:,.0f} rows/s")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps.crm.dedupe import MAX_BLOCK_SIZE, NAME_SIMILARITY, cluster_duplicates
+from apps.crm.models import Lead
+
+
+class Command(BaseCommand):
+    help = "Lists clusters of probable duplicate leads found through the blocking-key indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=NAME_SIMILARITY,
+                            help='Minimum name similarity (0-1) for leads linked only by name')
+        parser.add_argument('--max-block-size', type=int, default=MAX_BLOCK_SIZE,
+                            help='Skip name blocks with more leads than this')
+
+    def handle(self, *args, **options):
+        clusters, skipped = cluster_duplicates(options['threshold'], options['max_block_size'])
+        names = dict(Lead.objects.filter(
+            pk__in=[pk for members in clusters for pk in members]
+        ).values_list('id', 'name'))
+        for members in clusters:
+            self.stdout.write(', '.join(f'#{pk} {names[pk]}' for pk in members))
+        if skipped:
+            self.stdout.write(self.style.WARNING(f"Skipped {skipped} name blocks over {options['max_block_size']} leads"))
+        self.stdout.write(self.style.SUCCESS(f"Found {len(clusters)} duplicate clusters"))
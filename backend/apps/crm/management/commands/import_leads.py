@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.crm.importer import BATCH_SIZE, ImportFileError, import_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports leads from a CSV file with name, email and phone columns "
+        "(optionally source, status and assigned_to), in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--source', default='import', help='Source for rows without one')
+        parser.add_argument('--allow-duplicates', action='store_true',
+                            help='Import rows matching an existing lead by email or phone')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+            try:
+                report = import_csv(
+                    stream, source=options['source'],
+                    skip_duplicates=not options['allow_duplicates'], batch_size=options['batch_size']
+                )
+            except ImportFileError as exc:
+                raise CommandError(str(exc))
+
+        for error in report['errors']:
+            self.stdout.write(f"Line {error['row']}: {error['errors']}")
+        if report['aborted']:
+            self.stdout.write(self.style.ERROR(report['aborted']))
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['rows']} rows: {report['created']} created, "
+            f"{report['duplicates']} duplicates skipped, {report['failed']} failed"
+        ))
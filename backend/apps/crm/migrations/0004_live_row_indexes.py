@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0003_initial'),
+        ('projects', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='lead',
+            name='crm_lead_status_18283c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['status', 'created_at'], name='lead_live_status_created_idx'),
+        ),
+    ]
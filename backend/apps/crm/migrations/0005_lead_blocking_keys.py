@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:10
+
+from django.db import migrations, models
+
+from apps.crm.normalize import blocking_keys
+
+
+def backfill_keys(apps, schema_editor):
+    Lead = apps.get_model('crm', 'Lead')
+    db_alias = schema_editor.connection.alias
+    leads = []
+    for lead in Lead._base_manager.using(db_alias).only('name', 'email', 'phone').iterator(chunk_size=1000):
+        for field, value in blocking_keys(lead.name, lead.email, lead.phone).items():
+            setattr(lead, field, value)
+        leads.append(lead)
+    Lead._base_manager.using(db_alias).bulk_update(
+        leads, ['email_normalized', 'phone_normalized', 'name_key'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0004_live_row_indexes'),
+        ('projects', '0003_live_row_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='email_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=150),
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='name_key',
+            field=models.CharField(blank=True, editable=False, max_length=8),
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='phone_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.RunPython(backfill_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['email_normalized'], name='lead_live_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['phone_normalized'], name='lead_live_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['name_key'], name='lead_live_name_key_idx'),
+        ),
+    ]
@@ -1,7 +1,10 @@
 from django.db import models
-from core.models import SoftDeleteModel
+from core.models import SoftDeleteModel, live_index
+from .normalize import blocking_keys
 from django.conf import settings
 
+BLOCKING_FIELDS = ('email_normalized', 'phone_normalized', 'name_key')
+
 class Lead(SoftDeleteModel):
     STATUS_CHOICES = [
         ('new', 'New'),
@@ -16,12 +19,30 @@ class Lead(SoftDeleteModel):
     source = models.CharField(max_length=100)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='new')
     converted_project = models.ForeignKey('projects.Project', on_delete=models.SET_NULL, null=True, blank=True)
+    # Blocking keys for duplicate detection (apps.crm.dedupe), derived on save
+    email_normalized = models.CharField(max_length=150, blank=True, editable=False)
+    phone_normalized = models.CharField(max_length=20, blank=True, editable=False)
+    name_key = models.CharField(max_length=8, blank=True, editable=False)
 
     class Meta:
         indexes = [
-            models.Index(fields=['status', 'created_at']),
+            live_index('status', 'created_at', name='lead_live_status_created_idx'),
+            live_index('email_normalized', name='lead_live_email_idx'),
+            live_index('phone_normalized', name='lead_live_phone_idx'),
+            live_index('name_key', name='lead_live_name_key_idx'),
         ]
 
+    def set_blocking_keys(self):
+        for field, value in blocking_keys(self.name, self.email, self.phone).items():
+            setattr(self, field, value)
+
+    def save(self, *args, **kwargs):
+        self.set_blocking_keys()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'name', 'email', 'phone'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, *BLOCKING_FIELDS}
+        super().save(*args, **kwargs)
+
 class LeadAssignment(models.Model):
     lead = models.ForeignKey(Lead, on_delete=models.CASCADE, related_name='assignments')
     sales_exec = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -0,0 +1,73 @@
+import re
+import unicodedata
+
+# Provider-specific local-part rules: dots are ignored by these mailboxes
+DOTLESS_DOMAINS = {'gmail.com', 'googlemail.com'}
+PHONE_DIGITS = 10
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'), 'l': '4', **dict.fromkeys('mn', '5'), 'r': '6',
+}
+
+
+def normalize_email(email):
+    """Lower-cased address without +tags, and without dots for Gmail."""
+    email = (email or '').strip().lower()
+    local, at, domain = email.rpartition('@')
+    if not at:
+        return email
+    local = local.split('+', 1)[0]
+    if domain in DOTLESS_DOMAINS:
+        local = local.replace('.', '')
+        domain = 'gmail.com'
+    return f'{local}@{domain}'
+
+
+def normalize_phone(phone):
+    """
+    The last ten digits, which drops country codes and trunk prefixes;
+    numbers too short to identify anyone normalize to ''.
+    """
+    digits = re.sub(r'\D', '', phone or '')
+    return digits[-PHONE_DIGITS:] if len(digits) >= 7 else ''
+
+
+def name_tokens(name):
+    ascii_name = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode()
+    return re.findall(r'[a-z]+', ascii_name.lower())
+
+
+def normalize_name(name):
+    return ' '.join(name_tokens(name))
+
+
+def soundex(word):
+    codes = [SOUNDEX_CODES.get(char, '') for char in word]
+    key = word[0].upper()
+    previous = codes[0]
+    for char, code in zip(word[1:], codes[1:]):
+        if code and code != previous:
+            key += code
+        if char not in 'hw':
+            previous = code
+    return (key + '000')[:4]
+
+
+def name_key(name):
+    """
+    Blocking key shared by spelling variants of one person: the Soundex
+    code of the last name plus the first initial ('Jon Smith' and
+    'John Smith' both give 'S530J').
+    """
+    tokens = name_tokens(name)
+    if not tokens:
+        return ''
+    return soundex(tokens[-1]) + (tokens[0][0].upper() if len(tokens) > 1 else '')
+
+
+def blocking_keys(name, email, phone):
+    return {
+        'email_normalized': normalize_email(email),
+        'phone_normalized': normalize_phone(phone),
+        'name_key': name_key(name),
+    }
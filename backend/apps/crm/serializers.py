@@ -30,3 +30,57 @@ class LeadSerializer(serializers.ModelSerializer):
             'followups', 'assignments', 'created_at', 'updated_at'
         ]
         read_only_fields = ['converted_project']
+
+class LeadListSerializer(serializers.ModelSerializer):
+    """
+    List representation: the latest follow-up and current assignee only.
+    Expects the `latest_followups` / `latest_assignments` prefetches set up
+    by LeadViewSet; the full history is served on the detail route.
+    """
+    latest_followup = serializers.SerializerMethodField()
+    current_assignee = serializers.SerializerMethodField()
+    converted_project_name = serializers.CharField(source='converted_project.name', read_only=True)
+
+    class Meta:
+        model = Lead
+        fields = [
+            'id', 'name', 'email', 'phone', 'source', 'status',
+            'converted_project', 'converted_project_name',
+            'latest_followup', 'current_assignee', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+        field_sources = {
+            'latest_followup': ('latest_followups',),
+            'current_assignee': ('latest_assignments',),
+        }
+
+    def get_latest_followup(self, obj):
+        followups = obj.latest_followups
+        return LeadFollowupSerializer(followups[0]).data if followups else None
+
+    def get_current_assignee(self, obj):
+        assignments = obj.latest_assignments
+        return LeadAssignmentSerializer(assignments[0]).data if assignments else None
+
+class LeadDuplicateSerializer(serializers.ModelSerializer):
+    """A probable duplicate found by apps.crm.dedupe.find_duplicates."""
+    score = serializers.FloatField(source='duplicate_score', read_only=True)
+    reasons = serializers.ListField(source='duplicate_reasons', read_only=True)
+
+    class Meta:
+        model = Lead
+        fields = ['id', 'name', 'email', 'phone', 'status', 'score', 'reasons', 'created_at']
+        read_only_fields = fields
+
+class LeadImportRowSerializer(serializers.ModelSerializer):
+    """One CSV row of a bulk import; `assigned_to` is the email of an existing user."""
+    assigned_to = serializers.EmailField(required=False, allow_blank=True)
+
+    class Meta:
+        model = Lead
+        fields = ['name', 'email', 'phone', 'source', 'status', 'assigned_to']
+
+class LeadImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    source = serializers.CharField(max_length=100, default='import')
+    skip_duplicates = serializers.BooleanField(default=True)
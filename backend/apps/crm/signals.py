@@ -0,0 +1,8 @@
+from core.models import touch_parents
+from .models import LeadAssignment, LeadFollowup
+
+
+def connect():
+    # Children rendered inside the lead serializers
+    touch_parents(LeadFollowup, 'lead')
+    touch_parents(LeadAssignment, 'lead')
@@ -1,3 +1,224 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import date
+from io import StringIO
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from apps.reports.stats import get_snapshot
+from apps.search.index import search
+from apps.users.models import Department, Role, User
+from .dedupe import cluster_duplicates
+from .models import Lead, LeadAssignment, LeadFollowup
+
+
+class LeadFixtureMixin:
+    def setUp(self):
+        department = Department.objects.create(name='Sales')
+        self.manager = User.objects.create_user(
+            username='manager', email='manager@example.com', password='secret', name='Manager',
+            role=Role.objects.create(name='SALES_MANAGER'), department=department
+        )
+        self.executive = User.objects.create_user(
+            username='exec', email='exec@example.com', password='secret', name='Exec',
+            role=Role.objects.create(name='SALES_EXECUTIVE'), department=department
+        )
+
+    def create_leads(self, count):
+        for i in range(count):
+            lead = Lead.objects.create(
+                name=f'Lead {i}', email=f'lead{i}@example.com', phone=str(i), source='web'
+            )
+            for note in ('first call', 'second call'):
+                LeadFollowup.objects.create(
+                    lead=lead, followup_type='call', notes=note,
+                    next_followup=date(2024, 6, 1), created_by=self.manager
+                )
+            LeadAssignment.objects.create(lead=lead, sales_exec=self.manager)
+            LeadAssignment.objects.create(lead=lead, sales_exec=self.executive)
+
+
+class LeadListTests(LeadFixtureMixin, APITestCase):
+    def list_leads(self, user):
+        self.client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/v1/leads/')
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_query_count_is_constant_as_leads_grow(self):
+        self.create_leads(2)
+        small, _ = self.list_leads(self.manager)
+        self.create_leads(8)
+        large, data = self.list_leads(self.manager)
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(data), 10)
+
+    def test_list_ships_latest_followup_and_assignee_only(self):
+        self.create_leads(1)
+        _, data = self.list_leads(self.manager)
+
+        self.assertNotIn('followups', data[0])
+        self.assertEqual(data[0]['latest_followup']['notes'], 'second call')
+        self.assertEqual(data[0]['current_assignee']['sales_exec_details']['name'], 'Exec')
+
+    def test_executive_sees_each_assigned_lead_once(self):
+        self.create_leads(3)
+        lead = Lead.objects.first()
+        LeadAssignment.objects.create(lead=lead, sales_exec=self.executive)
+
+        _, data = self.list_leads(self.executive)
+
+        self.assertEqual(sorted(row['id'] for row in data), list(Lead.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_sparse_list_skips_unrequested_prefetches(self):
+        self.create_leads(2)
+        self.client.force_authenticate(user=self.manager)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/v1/leads/', {'fields': 'id,name,latest_followup'})
+
+        self.assertEqual(set(response.data[0]), {'id', 'name', 'latest_followup'})
+        self.assertEqual(response.data[0]['latest_followup']['notes'], 'second call')
+        # Conditional GET aggregate, leads, latest follow-ups
+        self.assertEqual(len(ctx.captured_queries), 3)
+
+    def test_detail_keeps_full_history(self):
+        self.create_leads(1)
+        self.client.force_authenticate(user=self.manager)
+
+        response = self.client.get(f'/api/v1/leads/{Lead.objects.get().id}/')
+
+        self.assertEqual(len(response.data['followups']), 2)
+        self.assertEqual(len(response.data['assignments']), 2)
+
+
+class LeadDuplicateTests(LeadFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.lead = Lead.objects.create(
+            name='John Smith', email='John.Smith+crm@gmail.com', phone='+1 (555) 010-2030', source='web'
+        )
+        self.client.force_authenticate(user=self.manager)
+
+    def duplicates(self, lead):
+        response = self.client.get(f'/api/v1/leads/{lead.id}/duplicates/')
+        self.assertEqual(response.status_code, 200)
+        return {row['id']: row['reasons'] for row in response.data}
+
+    def test_keys_are_normalized(self):
+        self.assertEqual(self.lead.email_normalized, 'johnsmith@gmail.com')
+        self.assertEqual(self.lead.phone_normalized, '5550102030')
+        self.assertEqual(self.lead.name_key, 'S530J')
+
+    def test_matches_email_phone_and_similar_names(self):
+        by_email = Lead.objects.create(name='J. Smith Co', email='johnsmith@googlemail.com', phone='', source='web')
+        by_phone = Lead.objects.create(name='Front desk', email='', phone='555-010-2030', source='web')
+        by_name = Lead.objects.create(name='Jon Smith', email='jon@example.com', phone='', source='web')
+        Lead.objects.create(name='Jane Smith', email='jane@example.com', phone='', source='web')
+
+        self.assertEqual(self.duplicates(self.lead), {
+            by_email.id: ['email'], by_phone.id: ['phone'], by_name.id: ['name'],
+        })
+
+    def test_executive_only_sees_assigned_duplicates(self):
+        twin = Lead.objects.create(name='John Smith', email='', phone='', source='web')
+        LeadAssignment.objects.create(lead=self.lead, sales_exec=self.executive)
+        self.client.force_authenticate(user=self.executive)
+
+        self.assertEqual(self.duplicates(self.lead), {})
+        LeadAssignment.objects.create(lead=twin, sales_exec=self.executive)
+        self.assertEqual(self.duplicates(self.lead), {twin.id: ['name']})
+
+    def test_create_reports_possible_duplicates(self):
+        response = self.client.post('/api/v1/leads/', {
+            'name': 'Johnny Smith', 'email': 'johnsmith@gmail.com', 'phone': '999', 'source': 'web',
+        })
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual([row['id'] for row in response.data['possible_duplicates']], [self.lead.id])
+
+    def test_cluster_duplicates_joins_blocks(self):
+        by_phone = Lead.objects.create(name='Front desk', email='', phone='5550102030', source='web')
+        by_name = Lead.objects.create(name='Jon Smith', email='', phone='', source='web')
+        Lead.objects.create(name='Jane Smith', email='', phone='', source='web')
+        pair = [Lead.objects.create(name='Acme Ltd', email='hi@acme.example', phone='', source='web').id
+                for _ in range(2)]
+
+        clusters, skipped = cluster_duplicates()
+
+        self.assertEqual(clusters, [sorted([self.lead.id, by_phone.id, by_name.id]), pair])
+        self.assertEqual(skipped, 0)
+        self.assertEqual(cluster_duplicates(max_block_size=2)[0], [sorted([self.lead.id, by_phone.id]), pair])
+
+
+class LeadImportTests(LeadFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.existing = Lead.objects.create(name='Ann Lee', email='ann@example.com', phone='5550001111', source='web')
+        self.client.force_authenticate(user=self.manager)
+
+    def upload(self, text, **data):
+        upload = SimpleUploadedFile('leads.csv', text.encode(), content_type='text/csv')
+        return self.client.post('/api/v1/leads/import/', {'file': upload, **data}, format='multipart')
+
+    def test_import_reports_errors_and_skips_duplicates(self):
+        response = self.upload(
+            'name,email,phone,assigned_to\n'
+            'Bob Stone,bob@example.com,555 000 2222,exec@example.com\n'
+            'Ann L.,ANN@example.com,12,\n'
+            'Bad Email,not-an-email,5550003333,\n'
+            'Nobody,nobody@example.com,5550004444,ghost@example.com\n'
+            'Bobby Stone,bob.s@example.com,+1 555 000 2222,\n',
+            source='trade-show'
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            {key: response.data[key] for key in ('rows', 'created', 'duplicates', 'failed')},
+            {'rows': 5, 'created': 1, 'duplicates': 2, 'failed': 2}
+        )
+        self.assertEqual([error['row'] for error in response.data['errors']], [4, 5])
+        self.assertIn('email', response.data['errors'][0]['errors'])
+        bob = Lead.objects.get(email='bob@example.com')
+        self.assertEqual(response.data['duplicate_rows'], [{'row': 3, 'lead': self.existing.id}, {'row': 6, 'lead': bob.id}])
+        self.assertEqual(bob.source, 'trade-show')
+        self.assertEqual(bob.phone_normalized, '5550002222')
+        self.assertEqual(list(bob.assignments.values_list('sales_exec', flat=True)), [self.executive.id])
+        self.assertEqual([hit['id'] for hit in search('stone', kinds=['lead'])], [bob.id])
+
+    def test_duplicates_can_be_imported_and_stats_follow(self):
+        self.assertEqual(get_snapshot().total_leads, 1)
+        response = self.upload('name,email,phone\nAnn Lee,ann@example.com,5550001111\n', skip_duplicates='false')
+
+        self.assertEqual(response.data['created'], 1)
+        # bulk_create skips post_save; the import sends bulk_created instead
+        self.assertEqual(get_snapshot().total_leads, 2)
+
+    def test_missing_columns_are_rejected(self):
+        response = self.upload('name,email\nBob,bob@example.com\n')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('phone', response.data['error'])
+
+    def test_executives_cannot_import(self):
+        self.client.force_authenticate(user=self.executive)
+
+        self.assertEqual(self.upload('name,email,phone\n').status_code, 403)
+
+    def test_command_imports_in_batches(self):
+        path = os.path.join(tempfile.mkdtemp(), 'leads.csv')
+        with open(path, 'w') as stream:
+            stream.write('name,email,phone\n')
+            stream.writelines(f'Lead {i},lead{i}@example.com,555100{i:04d}\n' for i in range(25))
+        out = StringIO()
+
+        call_command('import_leads', path, '--batch-size', '10', stdout=out)
+
+        self.assertIn('25 rows: 25 created', out.getvalue())
+        self.assertEqual(Lead.objects.filter(source='import').count(), 25)
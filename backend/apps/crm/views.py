@@ -1,24 +1,103 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from .models import Lead, LeadFollowup, LeadAssignment
-from .serializers import LeadSerializer, LeadFollowupSerializer
+from .dedupe import find_duplicates
+from .importer import ImportFileError, import_csv, open_upload
+from .serializers import LeadDuplicateSerializer, LeadImportSerializer, LeadSerializer, LeadListSerializer, LeadFollowupSerializer
 from apps.projects.models import Project
 from apps.projects.serializers import ProjectSerializer
+from core.authentication import get_user_instance
+from core.mixins import ConditionalGetMixin, SparseFieldsMixin
 from core.permissions import IsSalesManager
+from core.roles import get_request_role
 from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch
 
-class LeadViewSet(viewsets.ModelViewSet):
+class LeadViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Lead.objects.all()
     serializer_class = LeadSerializer
     permission_classes = [permissions.IsAuthenticated]
+    conditional_models = ('users.user', 'users.role', 'users.department', 'projects.project')
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return LeadListSerializer
+        return LeadSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        if user.role.name in ['SUPER_ADMIN', 'SALES_MANAGER']:
-            return Lead.objects.all()
-        # Sales Executives only see leads assigned to them
-        return Lead.objects.filter(assignments__sales_exec=user)
+        return self.filter_visible(self.with_related(Lead.objects.all()))
+
+    def filter_visible(self, queryset):
+        if get_request_role(self.request) in ['SUPER_ADMIN', 'SALES_MANAGER']:
+            return queryset
+        # Sales Executives only see leads assigned to them; EXISTS keeps each lead once
+        return queryset.filter(Exists(
+            LeadAssignment.objects.filter(lead=OuterRef('pk'), sales_exec=self.request.user.pk)
+        ))
+
+    def with_related(self, queryset):
+        followups = LeadFollowup.objects.select_related('created_by').order_by('-created_at', '-id')
+        assignments = LeadAssignment.objects.select_related(
+            'sales_exec__role', 'sales_exec__department'
+        ).order_by('-assigned_at', '-id')
+
+        queryset = queryset.select_related('converted_project')
+        if self.action == 'list':
+            # Only the newest row of each collection, fetched with a windowed prefetch
+            return queryset.prefetch_related(
+                Prefetch('followups', queryset=followups[:1], to_attr='latest_followups'),
+                Prefetch('assignments', queryset=assignments[:1], to_attr='latest_assignments'),
+            )
+        return queryset.prefetch_related(
+            Prefetch('followups', queryset=followups),
+            Prefetch('assignments', queryset=assignments),
+        )
+
+    def create(self, request, *args, **kwargs):
+        # Saved regardless; the caller decides whether to merge or follow up
+        response = super().create(request, *args, **kwargs)
+        response.data['possible_duplicates'] = LeadDuplicateSerializer(
+            find_duplicates(self.created_lead, self.filter_visible(Lead.objects.all())), many=True
+        ).data
+        return response
+
+    def perform_create(self, serializer):
+        self.created_lead = serializer.save()
+
+    @action(detail=True)
+    def duplicates(self, request, pk=None):
+        """
+        Visible leads that share the lead's email, phone or name blocking key
+        and look like the same contact, best match first.
+        GET /api/v1/leads/{id}/duplicates/
+        """
+        lead = self.get_object()
+        matches = find_duplicates(lead, self.filter_visible(Lead.objects.all()))
+        return Response(LeadDuplicateSerializer(matches, many=True).data)
+
+    @action(
+        detail=False, methods=['post'], url_path='import',
+        permission_classes=[IsSalesManager], parser_classes=[MultiPartParser]
+    )
+    def import_csv(self, request):
+        """
+        Bulk-creates leads from an uploaded CSV, streamed and validated in
+        batches. Returns per-row errors and skipped duplicates.
+        POST /api/v1/leads/import/ (multipart: file, source, skip_duplicates)
+        """
+        serializer = LeadImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        options = serializer.validated_data
+        try:
+            report = import_csv(
+                open_upload(options['file']), source=options['source'],
+                skip_duplicates=options['skip_duplicates']
+            )
+        except ImportFileError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report)
 
     @action(detail=True, methods=['post'], permission_classes=[IsSalesManager])
     def convert_to_project(self, request, pk=None):
@@ -65,13 +144,14 @@ class LeadViewSet(viewsets.ModelViewSet):
                 'project_id': project.id
             }, status=status.HTTP_201_CREATED)
 
-class LeadFollowupViewSet(viewsets.ModelViewSet):
+class LeadFollowupViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = LeadFollowup.objects.all()
     serializer_class = LeadFollowupSerializer
     permission_classes = [permissions.IsAuthenticated]
+    conditional_models = ('users.user',)
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        serializer.save(created_by=get_user_instance(self.request.user))
 
     def get_queryset(self):
         lead_id = self.request.query_params.get('lead_id')
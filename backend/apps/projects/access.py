@@ -0,0 +1,11 @@
+from .models import ProjectMember
+
+
+def get_accessible_project_ids(user_id):
+    """
+    Ids of the projects a user is a member of, as a lazy queryset. Filters
+    such as `project_id__in=` embed it as a subquery on the indexed
+    ProjectMember.user column, so there is nothing cached to go stale when
+    a membership changes in another process.
+    """
+    return ProjectMember.objects.filter(user=user_id).values_list('project_id', flat=True)
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class ProjectsConfig(AppConfig):
     name = 'apps.projects'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_initial'),
+        ('users', '0002_user_token_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='project',
+            name='projects_pr_status_f023cb_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='project',
+            name='projects_pr_client__06571b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['status'], name='project_live_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['client'], name='project_live_client_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectmilestone',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['project'], name='milestone_live_project_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:29
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_live_row_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='project',
+            name='project_live_client_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='projectmilestone',
+            name='milestone_live_project_idx',
+        ),
+    ]
@@ -1,5 +1,5 @@
 from django.db import models
-from core.models import SoftDeleteModel
+from core.models import SoftDeleteModel, live_index
 from django.conf import settings
 
 class Client(SoftDeleteModel):
@@ -33,8 +33,7 @@ class Project(SoftDeleteModel):
 
     class Meta:
         indexes = [
-            models.Index(fields=['status']),
-            models.Index(fields=['client']),
+            live_index('status', name='project_live_status_idx'),
         ]
 
 class ProjectMilestone(SoftDeleteModel):
@@ -0,0 +1,12 @@
+from core.cache import invalidate_on_change
+from core.models import touch_parents
+from .models import Client, Project, ProjectMember, ProjectMilestone
+
+
+def connect():
+    touch_parents(ProjectMilestone, 'project')
+
+    invalidate_on_change(Project, 'pk')
+    invalidate_on_change(ProjectMilestone, 'project')
+    invalidate_on_change(ProjectMember, 'project')
+    invalidate_on_change(Client)
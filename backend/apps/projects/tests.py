@@ -1,3 +1,102 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from apps.users.models import Department, Role, User
+from core.cache import response_cache
+from .models import Client, Project, ProjectMember, ProjectMilestone
+from .serializers import ClientSerializer
+
+
+class ProjectAccessTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        response_cache.clear()
+        self.department = Department.objects.create(name='Development')
+        self.user = User.objects.create_user(
+            username='pm', email='pm@example.com', password='secret', name='PM',
+            role=Role.objects.create(name='PROJECT_MANAGER'), department=self.department
+        )
+        self.acme = Client.objects.create(
+            name='Acme', email='acme@example.com', phone='123', company_name='Acme Ltd', address='Street 1'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def create_projects(self, count, member=True):
+        for i in range(count):
+            project = Project.objects.create(
+                name=f'Project {i}', client=self.acme, department=self.department,
+                project_manager=self.user, created_by=self.user,
+                start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+            )
+            ProjectMilestone.objects.create(project=project, title='Kickoff', due_date=date(2024, 2, 1))
+            ProjectMilestone.objects.create(
+                project=project, title='Dropped', due_date=date(2024, 3, 1)
+            ).delete()
+            if member:
+                ProjectMember.objects.create(project=project, user=self.user, role_in_project='PM')
+
+    def list_projects(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/v1/projects/')
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_list_is_flat_and_skips_deleted_milestones(self):
+        self.create_projects(2)
+        self.list_projects()
+        small, _ = self.list_projects()
+        self.create_projects(6)
+        self.list_projects()
+        large, data = self.list_projects()
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(data), 8)
+        self.assertEqual([m['title'] for m in data[0]['milestones']], ['Kickoff'])
+        self.assertEqual(data[0]['client_name'], 'Acme Ltd')
+
+    def test_membership_changes_invalidate_access(self):
+        self.create_projects(1, member=False)
+        self.assertEqual(len(self.list_projects()[1]), 0)
+
+        member = ProjectMember.objects.create(
+            project=Project.objects.get(), user=self.user, role_in_project='PM'
+        )
+        self.assertEqual(len(self.list_projects()[1]), 1)
+
+        member.delete()
+        self.assertEqual(len(self.list_projects()[1]), 0)
+
+
+class ClientFastListTests(APITestCase):
+    def setUp(self):
+        user = User.objects.create_user(
+            username='pm', email='pm@example.com', password='secret', name='PM',
+            role=Role.objects.create(name='PROJECT_MANAGER'),
+            department=Department.objects.create(name='Development')
+        )
+        Client.objects.create(
+            name='Acme', email='acme@example.com', phone='123', company_name='Acme Ltd',
+            gst_no='GST1', address='Street 1'
+        )
+        Client.objects.create(name='Globex', email='g@example.com', phone='456', company_name='Globex', address='')
+        Client.objects.create(name='Gone', email='x@example.com', phone='0', company_name='Gone', address='').delete()
+        self.client.force_authenticate(user=user)
+
+    def test_list_matches_serializer(self):
+        response = self.client.get('/api/v1/clients/')
+
+        expected = ClientSerializer(Client.objects.all(), many=True).data
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+
+    def test_sparse_fields_use_the_fast_path(self):
+        response = self.client.get('/api/v1/clients/', {'fields': 'id,gst_no'})
+
+        self.assertEqual(response.json(), [
+            {'id': client.id, 'gst_no': client.gst_no} for client in Client.objects.all()
+        ])
@@ -1,20 +1,30 @@
+from django.db.models import Prefetch
 from rest_framework import viewsets, permissions
-from .models import Project, Client
+from .access import get_accessible_project_ids
+from .models import Project, Client, ProjectMilestone
 from .serializers import ProjectSerializer, ClientSerializer
+from core.mixins import CachedListMixin, ConditionalGetMixin, FastListMixin, SparseFieldsMixin
 from core.permissions import IsProjectManager
+from core.roles import get_request_role
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ConditionalGetMixin, CachedListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [IsProjectManager]
+    use_replica = True
+    cache_models = ('projects.project', 'projects.projectmilestone', 'projects.projectmember', 'projects.client')
 
     def get_queryset(self):
         user = self.request.user
-        if user.role.name == 'SUPER_ADMIN':
-            return Project.objects.all()
-        return Project.objects.filter(members__user=user)
+        queryset = Project.objects.select_related('client').prefetch_related(
+            Prefetch('milestones', queryset=ProjectMilestone.objects.all())
+        )
+        if get_request_role(self.request) == 'SUPER_ADMIN':
+            return queryset
+        return queryset.filter(id__in=get_accessible_project_ids(user.pk))
 
-class ClientViewSet(viewsets.ModelViewSet):
+class ClientViewSet(ConditionalGetMixin, FastListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Client.objects.all()
     serializer_class = ClientSerializer
     permission_classes = [permissions.IsAuthenticated]
+    fast_list = True
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class ReportsConfig(AppConfig):
     name = 'apps.reports'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from apps.reports.models import DashboardStats
+from apps.reports.stats import compute_totals, rebuild_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the dashboard stats snapshot from the live tables. "
+        "Run periodically to reconcile drift from bulk updates that bypass signals."
+    )
+
+    def handle(self, *args, **options):
+        current = DashboardStats.objects.filter(pk=DashboardStats.SNAPSHOT_ID).values().first() or {}
+        totals = compute_totals()
+        drift = {
+            field: value - current.get(field, 0)
+            for field, value in totals.items()
+            if value != current.get(field, 0)
+        }
+        rebuild_snapshot()
+
+        if drift:
+            self.stdout.write(self.style.WARNING(f"Corrected drift: {drift}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Dashboard stats already in sync."))
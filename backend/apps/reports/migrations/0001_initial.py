@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_projects', models.IntegerField(default=0)),
+                ('project_progress_sum', models.BigIntegerField(default=0)),
+                ('total_users', models.IntegerField(default=0)),
+                ('total_leads', models.IntegerField(default=0)),
+                ('converted_leads', models.IntegerField(default=0)),
+                ('tasks_todo', models.IntegerField(default=0)),
+                ('tasks_in_progress', models.IntegerField(default=0)),
+                ('tasks_done', models.IntegerField(default=0)),
+                ('tasks_blocked', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'dashboard stats',
+            },
+        ),
+    ]
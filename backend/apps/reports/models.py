@@ -1,3 +1,27 @@
 from django.db import models
 
-# Create your models here.
+
+class DashboardStats(models.Model):
+    """
+    Single-row (pk=1) materialized snapshot backing DashboardStatsView.
+    Kept current by the save/delete signals in apps.reports.signals and
+    rebuilt from scratch by `manage.py rebuild_dashboard_stats`.
+    """
+    SNAPSHOT_ID = 1
+
+    total_projects = models.IntegerField(default=0)
+    project_progress_sum = models.BigIntegerField(default=0)
+    total_users = models.IntegerField(default=0)
+    total_leads = models.IntegerField(default=0)
+    converted_leads = models.IntegerField(default=0)
+    tasks_todo = models.IntegerField(default=0)
+    tasks_in_progress = models.IntegerField(default=0)
+    tasks_done = models.IntegerField(default=0)
+    tasks_blocked = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'dashboard stats'
+
+    def __str__(self):
+        return f"Dashboard stats ({self.updated_at})"
@@ -0,0 +1,96 @@
+from collections import Counter
+from copy import copy
+
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from core.models import bulk_created, bulk_updated, restored, soft_deleted
+from apps.crm.models import LeadAssignment
+from apps.projects.models import ProjectMember
+from .stats import CONTRIBUTIONS, apply_delta, invalidate_scoped_stats
+
+# Models whose writes can change some user's scoped dashboard
+SCOPE_MODELS = (*CONTRIBUTIONS, LeadAssignment, ProjectMember)
+
+
+def capture_previous(sender, instance, **kwargs):
+    contribution = CONTRIBUTIONS[sender]
+    previous = None
+    if instance.pk:
+        previous = sender._base_manager.filter(pk=instance.pk).first()
+    instance._dashboard_contribution = contribution(previous) if previous else {}
+
+
+def apply_saved(sender, instance, **kwargs):
+    before = getattr(instance, '_dashboard_contribution', {})
+    after = CONTRIBUTIONS[sender](instance)
+    apply_delta({
+        field: after.get(field, 0) - before.get(field, 0)
+        for field in before.keys() | after.keys()
+    })
+
+
+def apply_deleted(sender, instance, **kwargs):
+    apply_delta({
+        field: -value for field, value in CONTRIBUTIONS[sender](instance).items()
+    })
+
+
+def apply_bulk(sender, pks, sign):
+    delta = Counter()
+    for row in sender._base_manager.filter(pk__in=pks):
+        # Count each row as it looked while it was live
+        row.deleted_at = None
+        for field, value in CONTRIBUTIONS[sender](row).items():
+            delta[field] += sign * value
+    apply_delta(delta)
+
+
+def apply_soft_deleted(sender, pks, **kwargs):
+    apply_bulk(sender, pks, -1)
+
+
+def apply_restored(sender, pks, **kwargs):
+    apply_bulk(sender, pks, 1)
+
+
+def apply_bulk_updated(sender, objs, previous, **kwargs):
+    contribution = CONTRIBUTIONS[sender]
+    delta = Counter()
+    for obj in objs:
+        before = copy(obj)
+        for field, value in previous.get(obj.pk, {}).items():
+            setattr(before, field, value)
+        for field, value in contribution(before).items():
+            delta[field] -= value
+        for field, value in contribution(obj).items():
+            delta[field] += value
+    apply_delta(delta)
+
+
+def apply_bulk_created(sender, objs, **kwargs):
+    contribution = CONTRIBUTIONS[sender]
+    delta = Counter()
+    for obj in objs:
+        delta.update(contribution(obj))
+    apply_delta(delta)
+
+
+def connect():
+    for model in CONTRIBUTIONS:
+        uid = f'dashboard_stats_{model._meta.label_lower}'
+        pre_save.connect(capture_previous, sender=model, dispatch_uid=uid)
+        post_save.connect(apply_saved, sender=model, dispatch_uid=uid)
+        post_delete.connect(apply_deleted, sender=model, dispatch_uid=uid)
+        soft_deleted.connect(apply_soft_deleted, sender=model, dispatch_uid=uid)
+        restored.connect(apply_restored, sender=model, dispatch_uid=uid)
+        bulk_updated.connect(apply_bulk_updated, sender=model, dispatch_uid=uid)
+        bulk_created.connect(apply_bulk_created, sender=model, dispatch_uid=uid)
+
+    for model in SCOPE_MODELS:
+        uid = f'dashboard_scope_{model._meta.label_lower}'
+        post_save.connect(invalidate_scoped_stats, sender=model, dispatch_uid=uid)
+        post_delete.connect(invalidate_scoped_stats, sender=model, dispatch_uid=uid)
+        soft_deleted.connect(invalidate_scoped_stats, sender=model, dispatch_uid=uid)
+        restored.connect(invalidate_scoped_stats, sender=model, dispatch_uid=uid)
+        bulk_updated.connect(invalidate_scoped_stats, sender=model, dispatch_uid=uid)
+        bulk_created.connect(invalidate_scoped_stats, sender=model, dispatch_uid=uid)
@@ -0,0 +1,184 @@
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum
+
+from apps.crm.models import Lead, LeadAssignment
+from apps.projects.access import get_accessible_project_ids
+from apps.projects.models import Project, ProjectMember
+from apps.tasks.models import Task
+from apps.users.models import User
+from core.cache import response_cache
+from core.routers import use_primary
+from .models import DashboardStats
+
+TASK_STATUS_FIELDS = {status: f'tasks_{status}' for status, _ in Task.STATUS_CHOICES}
+
+
+def project_contribution(project):
+    if project.deleted_at:
+        return {}
+    return {'total_projects': 1, 'project_progress_sum': project.progress_percentage or 0}
+
+
+def task_contribution(task):
+    field = TASK_STATUS_FIELDS.get(task.status)
+    if task.deleted_at or not field:
+        return {}
+    return {field: 1}
+
+
+def user_contribution(user):
+    # User.objects (UserManager) does not hide soft-deleted users, so every
+    # count of users filters on deleted_at explicitly
+    if user.deleted_at or user.status != 'active':
+        return {}
+    return {'total_users': 1}
+
+
+def lead_contribution(lead):
+    if lead.deleted_at:
+        return {}
+    return {'total_leads': 1, 'converted_leads': int(lead.status == 'converted')}
+
+
+# Model -> function returning the counters a single row adds to the snapshot
+CONTRIBUTIONS = {
+    Project: project_contribution,
+    Task: task_contribution,
+    User: user_contribution,
+    Lead: lead_contribution,
+}
+
+
+SNAPSHOT_FIELDS = (
+    'total_projects', 'project_progress_sum', 'total_users',
+    'total_leads', 'converted_leads', *TASK_STATUS_FIELDS.values(),
+)
+
+# Response cache tag shared by every dashboard payload
+DASHBOARD_TAG = 'dashboard'
+
+
+def aggregate_projects(projects):
+    return projects.aggregate(
+        total_projects=Count('id'),
+        project_progress_sum=Sum('progress_percentage'),
+    )
+
+
+def aggregate_tasks(tasks):
+    return tasks.aggregate(**{
+        field: Count('id', filter=Q(status=status))
+        for status, field in TASK_STATUS_FIELDS.items()
+    })
+
+
+def aggregate_leads(leads):
+    return leads.aggregate(
+        total_leads=Count('id'),
+        converted_leads=Count('id', filter=Q(status='converted')),
+    )
+
+
+def compute_totals():
+    """
+    Full recount of every snapshot counter straight from the live tables.
+    """
+    totals = aggregate_projects(Project.objects.all())
+    totals.update(aggregate_tasks(Task.objects.all()))
+    totals.update(aggregate_leads(Lead.objects.all()))
+    totals['total_users'] = User.objects.filter(status='active', deleted_at__isnull=True).count()
+    return {key: value or 0 for key, value in totals.items()}
+
+
+def rebuild_snapshot():
+    with use_primary():
+        snapshot, _ = DashboardStats.objects.update_or_create(
+            pk=DashboardStats.SNAPSHOT_ID, defaults=compute_totals()
+        )
+    return snapshot
+
+
+def apply_delta(delta):
+    """
+    Adds the given counter deltas to the snapshot with a single UPDATE,
+    bootstrapping the row with a full rebuild if it does not exist yet.
+    """
+    delta = {field: value for field, value in delta.items() if value}
+    if not delta:
+        return
+    updated = DashboardStats.objects.filter(pk=DashboardStats.SNAPSHOT_ID).update(
+        **{field: F(field) + value for field, value in delta.items()}
+    )
+    if not updated:
+        rebuild_snapshot()
+
+
+def get_snapshot():
+    snapshot = DashboardStats.objects.filter(pk=DashboardStats.SNAPSHOT_ID).first()
+    return snapshot or rebuild_snapshot()
+
+
+def get_stats_scope(user, role_name):
+    """
+    Returns (scope, key) describing which slice of the data a user's
+    dashboard covers:
+
+    - SUPER_ADMIN: everything (served from the snapshot)
+    - PROJECT_MANAGER / TEAM_MEMBER: projects they are a member of
+    - SALES_MANAGER: all leads, users of their department
+    - SALES_EXECUTIVE: leads assigned to them, users of their department
+    """
+    if role_name == 'SUPER_ADMIN':
+        return 'global', 'global'
+    if role_name in ('PROJECT_MANAGER', 'TEAM_MEMBER'):
+        return 'projects', f'projects:{user.pk}'
+    if role_name == 'SALES_MANAGER':
+        return 'sales', f'sales:dept:{user.department_id}'
+    if role_name == 'SALES_EXECUTIVE':
+        return 'assigned', f'assigned:dept:{user.department_id}:exec:{user.pk}'
+    return 'none', 'none'
+
+
+def compute_scoped_totals(user, scope):
+    """
+    Computes the snapshot counters restricted to the user's scope using
+    conditional aggregation: at most one query per model involved.
+    """
+    totals = dict.fromkeys(SNAPSHOT_FIELDS, 0)
+
+    if scope == 'global':
+        snapshot = get_snapshot()
+        totals.update({field: getattr(snapshot, field) for field in SNAPSHOT_FIELDS})
+
+    elif scope == 'projects':
+        project_ids = get_accessible_project_ids(user.pk)
+        totals.update(aggregate_projects(Project.objects.filter(id__in=project_ids)))
+        totals.update(aggregate_tasks(Task.objects.filter(project_id__in=project_ids)))
+        totals.update(ProjectMember.objects.filter(
+            project_id__in=project_ids,
+            project__deleted_at__isnull=True,
+            user__status='active',
+            user__deleted_at__isnull=True,
+        ).aggregate(total_users=Count('user', distinct=True)))
+
+    elif scope in ('sales', 'assigned'):
+        leads = Lead.objects.all()
+        if scope == 'assigned':
+            leads = leads.filter(Exists(
+                LeadAssignment.objects.filter(lead=OuterRef('pk'), sales_exec=user.pk)
+            ))
+        totals.update(aggregate_leads(leads))
+        totals['total_users'] = User.objects.filter(
+            status='active', deleted_at__isnull=True, department_id=user.department_id
+        ).count()
+
+    return {key: value or 0 for key, value in totals.items()}
+
+
+def invalidate_scoped_stats(**kwargs):
+    # Dashboards are cached only in the response cache, whose tag
+    # versions are shared by every worker. Bumped again on commit, like
+    # core.cache.invalidate_on_change, so a read racing the transaction
+    # cannot keep pre-commit totals under the new version.
+    response_cache.invalidate(DASHBOARD_TAG)
+    transaction.on_commit(lambda: response_cache.invalidate(DASHBOARD_TAG))
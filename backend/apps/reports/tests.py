@@ -1,3 +1,144 @@
-from django.test import TestCase
+from datetime import date
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from apps.crm.models import Lead, LeadAssignment
+from apps.projects.models import Client, Project, ProjectMember
+from apps.tasks.models import Task, TaskType
+from apps.users.models import Department, Role, User
+from core.cache import response_cache
+from .models import DashboardStats
+from .stats import compute_totals
+
+
+class DashboardFixtureMixin:
+    def setUp(self):
+        cache.clear()
+        response_cache.clear()
+        self.department = Department.objects.create(name='Development')
+        self.user = User.objects.create_user(
+            username='admin', email='admin@example.com', password='secret', name='Admin',
+            role=Role.objects.create(name='SUPER_ADMIN'), department=self.department
+        )
+        self.client_obj = Client.objects.create(
+            name='Acme', email='acme@example.com', phone='123', company_name='Acme Ltd', address='Street 1'
+        )
+        self.task_type = TaskType.objects.create(name='Dev')
+        self.client.force_authenticate(user=self.user)
+
+    def create_project(self, progress):
+        return Project.objects.create(
+            name='Website', client=self.client_obj, department=self.department,
+            project_manager=self.user, created_by=self.user, progress_percentage=progress,
+            start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+        )
+
+    def create_task(self, project, status):
+        return Task.objects.create(
+            project=project, title='Task', description='', task_type=self.task_type,
+            priority='low', status=status, due_date=date(2024, 6, 1), created_by=self.user
+        )
+
+
+class DashboardStatsSnapshotTests(DashboardFixtureMixin, APITestCase):
+    def snapshot_totals(self):
+        snapshot = DashboardStats.objects.values().get(pk=DashboardStats.SNAPSHOT_ID)
+        return {field: snapshot[field] for field in compute_totals()}
+
+    def test_snapshot_tracks_saves_and_deletes(self):
+        project = self.create_project(40)
+        self.create_project(80).delete()
+        todo = self.create_task(project, 'todo')
+        self.create_task(project, 'done')
+        todo.status = 'in_progress'
+        todo.save()
+        Lead.objects.create(name='L1', email='l1@example.com', phone='1', source='web', status='converted')
+        Lead.objects.create(name='L2', email='l2@example.com', phone='2', source='web')
+
+        self.assertEqual(self.snapshot_totals(), compute_totals())
+
+    def test_soft_deleted_users_are_not_counted(self):
+        user = User.objects.create_user(
+            username='leaver', email='leaver@example.com', password='secret', name='Leaver',
+            role=self.user.role, department=self.department
+        )
+        user.delete()
+        self.assertEqual(self.snapshot_totals(), compute_totals())
+
+        User.all_objects.filter(pk=user.pk).restore()
+        self.assertEqual(self.snapshot_totals(), compute_totals())
+        self.assertEqual(compute_totals()['total_users'], 2)
+
+    def test_endpoint_is_a_single_read(self):
+        project = self.create_project(50)
+        self.create_task(project, 'todo')
+        self.create_task(project, 'done')
+
+        with self.assertNumQueries(1):
+            self.client.get('/api/v1/dashboard/stats/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/dashboard/stats/')
+
+        self.assertEqual(response.data['stats']['total_projects'], 1)
+        self.assertEqual(response.data['stats']['active_tasks'], 1)
+        self.assertEqual(response.data['stats']['avg_project_completion'], 50)
+        self.assertEqual(
+            response.data['task_distribution'],
+            [{'status': 'todo', 'count': 1}, {'status': 'done', 'count': 1}]
+        )
+
+    def test_reconcile_command_repairs_drift(self):
+        self.create_project(10)
+        Project.objects.update(progress_percentage=90)
+
+        call_command('rebuild_dashboard_stats', stdout=StringIO())
+
+        self.assertEqual(self.snapshot_totals()['project_progress_sum'], 90)
+
+
+class ScopedDashboardStatsTests(DashboardFixtureMixin, APITestCase):
+    def make_user(self, username, role_name):
+        role, _ = Role.objects.get_or_create(name=role_name)
+        return User.objects.create_user(
+            username=username, email=f'{username}@example.com', password='secret',
+            name=username.title(), role=role, department=self.department
+        )
+
+    def test_project_manager_sees_member_projects_only(self):
+        manager = self.make_user('manager', 'PROJECT_MANAGER')
+        mine = self.create_project(60)
+        self.create_project(20)
+        ProjectMember.objects.create(project=mine, user=manager, role_in_project='PM')
+        self.create_task(mine, 'todo')
+        Lead.objects.create(name='L1', email='l1@example.com', phone='1', source='web')
+        self.client.force_authenticate(user=manager)
+
+        # One aggregate per model, each filtering on the membership subquery
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/v1/dashboard/stats/')
+
+        self.assertEqual(response.data['scope'], 'projects')
+        self.assertEqual(response.data['stats']['total_projects'], 1)
+        self.assertEqual(response.data['stats']['avg_project_completion'], 60)
+        self.assertEqual(response.data['stats']['active_tasks'], 1)
+        self.assertEqual(response.data['stats']['total_users'], 1)
+        self.assertEqual(response.data['stats']['conversion_rate'], 0)
+
+    def test_sales_executive_sees_assigned_leads_and_invalidates_on_write(self):
+        executive = self.make_user('exec', 'SALES_EXECUTIVE')
+        mine = Lead.objects.create(name='L1', email='l1@example.com', phone='1', source='web')
+        Lead.objects.create(name='L2', email='l2@example.com', phone='2', source='web', status='converted')
+        LeadAssignment.objects.create(lead=mine, sales_exec=executive)
+        self.client.force_authenticate(user=executive)
+
+        response = self.client.get('/api/v1/dashboard/stats/')
+        self.assertEqual(response.data['stats']['conversion_rate'], 0)
+
+        mine.status = 'converted'
+        mine.save()
+        response = self.client.get('/api/v1/dashboard/stats/')
+        self.assertEqual(response.data['stats']['conversion_rate'], 100)
+        self.assertEqual(response.data['stats']['total_projects'], 0)
@@ -1,38 +1,52 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions
-from django.db.models import Count, Avg
-from apps.projects.models import Project
-from apps.tasks.models import Task
-from apps.users.models import User
-from apps.crm.models import Lead
+from core.cache import response_cache
+from core.roles import get_request_role
+from .stats import DASHBOARD_TAG, TASK_STATUS_FIELDS, compute_scoped_totals, get_stats_scope
 
 class DashboardStatsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    use_replica = True
 
     def get(self, request):
-        total_projects = Project.objects.count()
-        active_tasks = Task.objects.exclude(status='done').count()
-        total_users = User.objects.filter(status='active').count()
-        
+        # One cached payload per scope, shared by the users it covers
+        scope, scope_key = get_stats_scope(request.user, get_request_role(request))
+        return Response(response_cache.get_or_set(
+            f'dashboard|{scope_key}', [DASHBOARD_TAG],
+            lambda: self.build(request.user, scope)
+        ))
+
+    def build(self, user, scope):
+        totals = compute_scoped_totals(user, scope)
+
+        active_tasks = sum(
+            totals[field] for status, field in TASK_STATUS_FIELDS.items() if status != 'done'
+        )
+
         # Lead conversion rate
-        total_leads = Lead.objects.count()
-        converted_leads = Lead.objects.filter(status='converted').count()
-        conversion_rate = (converted_leads / total_leads * 100) if total_leads > 0 else 0
+        total_leads = totals['total_leads']
+        conversion_rate = (totals['converted_leads'] / total_leads * 100) if total_leads > 0 else 0
 
         # Avg project completion
-        avg_completion = Project.objects.aggregate(Avg('progress_percentage'))['progress_percentage__avg'] or 0
+        total_projects = totals['total_projects']
+        avg_completion = (totals['project_progress_sum'] / total_projects) if total_projects > 0 else 0
 
         # Task status distribution
-        status_dist = Task.objects.values('status').annotate(count=Count('id'))
+        status_dist = [
+            {'status': status, 'count': totals[field]}
+            for status, field in TASK_STATUS_FIELDS.items()
+            if totals[field]
+        ]
 
-        return Response({
+        return {
+            'scope': scope,
             'stats': {
                 'total_projects': total_projects,
                 'active_tasks': active_tasks,
-                'total_users': total_users,
+                'total_users': totals['total_users'],
                 'conversion_rate': round(conversion_rate, 2),
                 'avg_project_completion': round(avg_completion, 2)
             },
             'task_distribution': status_dist
-        })
+        }
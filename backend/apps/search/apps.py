@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    name = 'apps.search'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
@@ -0,0 +1,177 @@
+import re
+from collections import namedtuple
+
+from django.apps import apps as global_apps
+from django.db import connections, router
+
+TABLE = 'search_entry'
+CHUNK_SIZE = 500
+
+# `code` keeps each kind's rowids apart: rowid = pk * ROWID_STRIDE + code.
+# `title` and `body` are searched; `label`, when set, is shown instead of the title.
+Source = namedtuple('Source', 'code model title body project live label', defaults=(None,))
+ROWID_STRIDE = 8
+
+SOURCES = {
+    'task': Source(1, 'tasks.Task', 'title', ('description',), 'project_id', {
+        'deleted_at__isnull': True,
+    }),
+    'comment': Source(2, 'tasks.TaskComment', None, ('comment',), 'task__project_id', {
+        'deleted_at__isnull': True, 'task__deleted_at__isnull': True,
+    }, label='task__title'),
+    'lead': Source(3, 'crm.Lead', 'name', ('email', 'phone'), None, {
+        'deleted_at__isnull': True,
+    }),
+    'client': Source(4, 'projects.Client', 'company_name', (), None, {
+        'deleted_at__isnull': True,
+    }),
+    'keyword': Source(5, 'seo.SEOKeywords', 'keyword', (), 'seo_task__task__project_id', {
+        'deleted_at__isnull': True, 'seo_task__deleted_at__isnull': True,
+        'seo_task__task__deleted_at__isnull': True,
+    }),
+}
+PROJECT_KINDS = [kind for kind, source in SOURCES.items() if source.project]
+
+# (model, kind, lookup from the indexed model to that model's pk): a
+# change to the model reindexes the rows of `kind` it is rendered into
+WATCHES = (
+    ('tasks.Task', 'task', 'pk'),
+    ('tasks.Task', 'comment', 'task'),
+    ('tasks.Task', 'keyword', 'seo_task__task'),
+    ('tasks.TaskComment', 'comment', 'pk'),
+    ('crm.Lead', 'lead', 'pk'),
+    ('projects.Client', 'client', 'pk'),
+    ('seo.SEOTask', 'keyword', 'seo_task'),
+    ('seo.SEOKeywords', 'keyword', 'pk'),
+)
+
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+    "kind UNINDEXED, object_id UNINDEXED, project_id UNINDEXED, label UNINDEXED, title, body, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+
+
+def is_supported(connection):
+    return connection.vendor == 'sqlite'
+
+
+def chunks(items, size=CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def source_rows(kind, queryset):
+    """
+    Index rows (rowid, kind, object_id, project_id, label, title, body) for
+    the live rows of `queryset`.
+    """
+    source = SOURCES[kind]
+    fields = ['pk', source.project, source.label, source.title, *source.body]
+    values = queryset.filter(**source.live).values_list(*[field for field in fields if field])
+    for row in values.iterator(chunk_size=CHUNK_SIZE):
+        row = list(row)
+        pk = row.pop(0)
+        project_id = row.pop(0) if source.project else None
+        label = row.pop(0) if source.label else None
+        title = row.pop(0) if source.title else None
+        body = ' '.join(value for value in row if value)
+        yield pk * ROWID_STRIDE + source.code, kind, pk, project_id, label or '', title or '', body
+
+
+def write_rows(cursor, rows):
+    for batch in chunks(rows):
+        cursor.executemany(
+            f'INSERT INTO {TABLE} (rowid, kind, object_id, project_id, label, title, body)'
+            ' VALUES (%s, %s, %s, %s, %s, %s, %s)',
+            batch
+        )
+
+
+def reindex(kind, pks, using='default', get_model=global_apps.get_model):
+    """Replaces the index rows of `kind` for the given primary keys."""
+    connection = connections[using]
+    if not pks or not is_supported(connection):
+        return
+    source = SOURCES[kind]
+    model = get_model(source.model)
+    code = source.code
+    with connection.cursor() as cursor:
+        for batch in chunks(pks):
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(
+                f'DELETE FROM {TABLE} WHERE rowid IN ({placeholders})',
+                [pk * ROWID_STRIDE + code for pk in batch]
+            )
+            write_rows(cursor, source_rows(kind, model._base_manager.using(using).filter(pk__in=batch)))
+
+
+def rebuild(using='default', get_model=global_apps.get_model):
+    """Recreates the whole index from the source tables. Returns the number of rows indexed."""
+    connection = connections[using]
+    if not is_supported(connection):
+        return 0
+    total = 0
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_SQL)
+        cursor.execute(f'DELETE FROM {TABLE}')
+        for kind, source in SOURCES.items():
+            rows = list(source_rows(kind, get_model(source.model)._base_manager.using(using).all()))
+            write_rows(cursor, rows)
+            total += len(rows)
+        cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+    return total
+
+
+def match_expression(text):
+    """
+    FTS5 query matching every word of `text` as a prefix; user input never
+    reaches the query syntax itself.
+    """
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+
+def search(text, kinds=None, project_ids=None, lead_exec_id=None, limit=20):
+    """
+    Ranked matches for `text`, best first. `project_ids` limits the
+    project-scoped kinds to those projects and `lead_exec_id` limits leads
+    to the ones assigned to that user; None leaves them unrestricted.
+    """
+    LeadAssignment = global_apps.get_model('crm.LeadAssignment')
+    connection = connections[router.db_for_read(LeadAssignment) or 'default']
+    expression = match_expression(text)
+    if not expression:
+        return []
+
+    conditions, params = [f'{TABLE} MATCH %s'], [expression]
+    if kinds:
+        conditions.append(f"kind IN ({', '.join(['%s'] * len(kinds))})")
+        params += kinds
+    if project_ids is not None:
+        scoped = ', '.join(['%s'] * len(PROJECT_KINDS))
+        allowed = ', '.join(['%s'] * len(project_ids)) or 'NULL'
+        conditions.append(f'(kind NOT IN ({scoped}) OR project_id IN ({allowed}))')
+        params += [*PROJECT_KINDS, *project_ids]
+    if lead_exec_id is not None:
+        conditions.append(
+            f"(kind != 'lead' OR object_id IN (SELECT lead_id FROM {LeadAssignment._meta.db_table}"
+            " WHERE sales_exec_id = %s))"
+        )
+        params.append(lead_exec_id)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT kind, object_id, project_id, label, title, snippet({TABLE}, -1, '', '', '…', 16),"
+            f" bm25({TABLE}, 0, 0, 0, 0, 10.0, 1.0) AS score"
+            f" FROM {TABLE} WHERE {' AND '.join(conditions)} ORDER BY score LIMIT %s",
+            [*params, limit]
+        )
+        rows = cursor.fetchall()
+    return [
+        {
+            'type': kind, 'id': object_id, 'project_id': project_id,
+            'title': label or title, 'excerpt': excerpt, 'score': round(-score, 4),
+        }
+        for kind, object_id, project_id, label, title, excerpt, score in rows
+    ]
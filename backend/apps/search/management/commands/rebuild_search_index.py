@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.search.index import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index from the source tables."
+
+    def handle(self, *args, **options):
+        total = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} rows"))
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from apps.search.index import TABLE, rebuild
+
+
+def create_index(apps, schema_editor):
+    # FTS5 virtual table; other backends run without a search index
+    rebuild(using=schema_editor.connection.alias, get_model=apps.get_model)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0004_live_row_indexes'),
+        ('projects', '0003_live_row_indexes'),
+        ('seo', '0005_keyword_rank_history'),
+        ('tasks', '0003_live_row_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+from .index import SOURCES
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Query parameters for `search/`."""
+    q = serializers.CharField()
+    types = serializers.CharField(required=False)
+    limit = serializers.IntegerField(default=20, min_value=1, max_value=100)
+
+    def validate_types(self, value):
+        kinds = [kind.strip() for kind in value.split(',') if kind.strip()]
+        unknown = set(kinds) - SOURCES.keys()
+        if unknown:
+            raise serializers.ValidationError(f"Unknown types: {', '.join(sorted(unknown))}")
+        return kinds
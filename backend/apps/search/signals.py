@@ -0,0 +1,23 @@
+from django.apps import apps
+
+from core.models import on_rows_changed
+from .index import SOURCES, WATCHES, reindex
+
+
+def watch(model, kind, lookup):
+    indexed = apps.get_model(SOURCES[kind].model)
+
+    def changed(instance=None, pks=None):
+        pks = [instance.pk] if instance is not None else pks
+        if lookup != 'pk':
+            pks = list(indexed._base_manager.filter(**{f'{lookup}__in': pks}).values_list('pk', flat=True))
+        reindex(kind, pks)
+
+    on_rows_changed(model, changed, f'search_{kind}_{model._meta.label_lower}')
+
+
+def connect():
+    # Kept current in the writing transaction, so the index commits or
+    # rolls back with the rows it mirrors
+    for label, kind, lookup in WATCHES:
+        watch(apps.get_model(label), kind, lookup)
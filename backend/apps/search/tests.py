@@ -0,0 +1,102 @@
+from datetime import date
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APITestCase
+
+from apps.crm.models import Lead, LeadAssignment
+from apps.projects.models import Client, Project, ProjectMember
+from apps.tasks.models import Task, TaskComment, TaskType
+from apps.users.models import Department, Role, User
+from core.cache import response_cache
+from .index import TABLE
+
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        response_cache.clear()
+        self.department = Department.objects.create(name='Development')
+        self.member = self.create_user('member', 'TEAM_MEMBER')
+        self.acme = Client.objects.create(
+            name='Acme', email='acme@example.com', phone='123', company_name='Acme Rating Agency', address='-'
+        )
+        self.project = self.create_project('Website')
+        self.other_project = self.create_project('Intranet')
+        ProjectMember.objects.create(project=self.project, user=self.member, role_in_project='MEMBER')
+
+        task_type = TaskType.objects.create(name='SEO')
+        self.task = Task.objects.create(
+            project=self.project, title='Fix the GMB rating', description='Reviews dropped last week',
+            task_type=task_type, priority='high', due_date=date(2024, 6, 1), created_by=self.member
+        )
+        self.hidden = Task.objects.create(
+            project=self.other_project, title='GMB rating audit', description='',
+            task_type=task_type, priority='low', due_date=date(2024, 6, 1), created_by=self.member
+        )
+        self.comment = TaskComment.objects.create(task=self.task, user=self.member, comment='Rating is 3.9 now')
+        self.client.force_authenticate(user=self.member)
+
+    def create_user(self, username, role):
+        return User.objects.create_user(
+            username=username, email=f'{username}@example.com', password='secret', name=username.title(),
+            role=Role.objects.get_or_create(name=role)[0], department=self.department
+        )
+
+    def create_project(self, name):
+        return Project.objects.create(
+            name=name, client=self.acme, department=self.department,
+            project_manager=self.member, created_by=self.member,
+            start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+        )
+
+    def search(self, q, **params):
+        response = self.client.get('/api/v1/search/', {'q': q, **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return [(hit['type'], hit['id']) for hit in response.data]
+
+    def test_prefix_matches_are_ranked_and_scoped_to_member_projects(self):
+        hits = self.search('gmb rat')
+
+        # The hidden project's task matches too but is not visible to the member
+        self.assertEqual(hits, [('task', self.task.id)])
+        hits = self.search('rating', types='task,comment,client')
+        self.assertCountEqual(hits, [('task', self.task.id), ('client', self.acme.id), ('comment', self.comment.id)])
+        # Title matches outrank body matches
+        self.assertEqual(hits[-1], ('comment', self.comment.id))
+
+    def test_index_follows_edits_and_soft_deletes(self):
+        self.task.title = 'Fix the maps listing'
+        self.task.save()
+        self.assertEqual(self.search('gmb'), [])
+        self.assertEqual(self.search('listing'), [('task', self.task.id)])
+
+        self.task.delete()
+        self.assertEqual(self.search('listing rating'), [])
+        self.task.restore()
+        self.assertEqual(self.search('3.9'), [('comment', self.comment.id)])
+
+    def test_sales_executives_only_find_assigned_leads(self):
+        executive = self.create_user('exec', 'SALES_EXECUTIVE')
+        mine = Lead.objects.create(name='Rating Corp', email='a@rating.example', phone='1', source='web')
+        Lead.objects.create(name='Rating Inc', email='b@rating.example', phone='2', source='web')
+        LeadAssignment.objects.create(lead=mine, sales_exec=executive)
+        self.client.force_authenticate(user=executive)
+
+        self.assertEqual(self.search('rating', types='lead'), [('lead', mine.id)])
+
+    def test_unknown_types_are_rejected(self):
+        response = self.client.get('/api/v1/search/', {'q': 'gmb', 'types': 'task,invoice'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_rebuild_restores_a_cleared_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLE}')
+        self.assertEqual(self.search('reviews'), [])
+
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        self.assertEqual(self.search('reviews'), [('task', self.task.id)])
@@ -0,0 +1,40 @@
+from django.db import connection
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.projects.access import get_accessible_project_ids
+from core.roles import get_request_role
+from .index import is_supported, search
+from .serializers import SearchQuerySerializer
+
+
+class SearchView(APIView):
+    """
+    Ranked full-text search over tasks, comments, leads, clients and SEO
+    keywords, limited to what the caller's list views would show them.
+    GET /api/v1/search/?q=gmb rating&types=task,comment&limit=20
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    use_replica = True
+
+    def get(self, request):
+        if not is_supported(connection):
+            return Response(
+                {'error': 'Search requires the SQLite FTS5 backend'}, status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        serializer = SearchQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        role_name = get_request_role(request)
+        # Same visibility rules as TaskViewSet and LeadViewSet
+        project_ids = None
+        if role_name not in ('SUPER_ADMIN', 'PROJECT_MANAGER'):
+            project_ids = list(get_accessible_project_ids(request.user.pk))
+        lead_exec_id = None if role_name in ('SUPER_ADMIN', 'SALES_MANAGER') else request.user.pk
+
+        return Response(search(
+            params['q'], kinds=params.get('types'), project_ids=project_ids,
+            lead_exec_id=lead_exec_id, limit=params['limit'],
+        ))
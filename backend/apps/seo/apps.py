@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class SeoConfig(AppConfig):
     name = 'apps.seo'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.seo.rollups import recompute_since, refresh_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Folds new SocialMetrics snapshots into the daily/weekly rollups. "
+        "Run on a schedule; pass --since to also recompute buckets after edits or deletions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--since', help="Recompute every bucket from this date (YYYY-MM-DD) onwards")
+
+    def handle(self, *args, **options):
+        if options['since']:
+            day = parse_date(options['since'])
+            if day is None:
+                raise CommandError("--since must be a date in YYYY-MM-DD format")
+            recompute_since(day)
+            self.stdout.write(f"Recomputed buckets from {day}")
+
+        processed = refresh_rollups(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {processed} new snapshots"))
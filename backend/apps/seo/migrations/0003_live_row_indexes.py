@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seo', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='seokeywords',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['seo_task'], name='seokeyword_live_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seooffpage',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['seo_task'], name='seooffpage_live_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seoonpage',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['seo_task'], name='seoonpage_live_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seotechnical',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['seo_task'], name='seotech_live_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialmetrics',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['post'], name='socialmetric_live_post_idx'),
+        ),
+    ]
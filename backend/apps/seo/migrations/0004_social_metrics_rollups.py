@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:37
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_recorded_at(apps, schema_editor):
+    # Existing rows were observed when they were created
+    SocialMetrics = apps.get_model('seo', 'SocialMetrics')
+    SocialMetrics.objects.using(schema_editor.connection.alias).update(recorded_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_live_row_indexes'),
+        ('seo', '0003_live_row_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SocialMetricsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(max_length=50)),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week')], max_length=4)),
+                ('bucket_start', models.DateField()),
+                ('likes', models.BigIntegerField(default=0)),
+                ('comments', models.BigIntegerField(default=0)),
+                ('shares', models.BigIntegerField(default=0)),
+                ('reach', models.BigIntegerField(default=0)),
+                ('snapshots', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='socialmetrics',
+            name='recorded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_recorded_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='socialmetrics',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['recorded_at'], name='socialmetric_live_recorded_idx'),
+        ),
+        migrations.AddField(
+            model_name='socialmetricsrollup',
+            name='project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='social_rollups', to='projects.project'),
+        ),
+        migrations.AddIndex(
+            model_name='socialmetricsrollup',
+            index=models.Index(fields=['project', 'period', 'bucket_start'], name='socialrollup_bucket_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='socialmetricsrollup',
+            unique_together={('project', 'platform', 'period', 'bucket_start')},
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def seed_history(apps, schema_editor):
+    # Start every live keyword's series from its current rank
+    SEOKeywords = apps.get_model('seo', 'SEOKeywords')
+    SEOKeywordRankHistory = apps.get_model('seo', 'SEOKeywordRankHistory')
+    db_alias = schema_editor.connection.alias
+    SEOKeywordRankHistory.objects.using(db_alias).bulk_create([
+        SEOKeywordRankHistory(keyword_id=pk, date=updated_at.date(), rank=rank)
+        for pk, updated_at, rank in SEOKeywords.objects.using(db_alias).filter(
+            deleted_at__isnull=True
+        ).values_list('pk', 'updated_at', 'current_rank').iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seo', '0004_social_metrics_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SEOKeywordRankHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('rank', models.IntegerField()),
+                ('keyword', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rank_history', to='seo.seokeywords')),
+            ],
+            options={
+                'unique_together': {('keyword', 'date')},
+            },
+        ),
+        migrations.RunPython(seed_history, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:29
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seo', '0005_keyword_rank_history'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='seokeywords',
+            name='seokeyword_live_task_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='seooffpage',
+            name='seooffpage_live_task_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='seoonpage',
+            name='seoonpage_live_task_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='seotechnical',
+            name='seotech_live_task_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='socialmetrics',
+            name='socialmetric_live_post_idx',
+        ),
+    ]
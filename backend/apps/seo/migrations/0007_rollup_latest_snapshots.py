@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def reset_rollups(apps, schema_editor):
+    # Existing buckets summed every snapshot; drop them and rewind the
+    # watermark so the next rollup_social_metrics run rebuilds them all
+    db_alias = schema_editor.connection.alias
+    apps.get_model('seo', 'SocialMetricsRollup').objects.using(db_alias).delete()
+    apps.get_model('seo', 'RollupWatermark').objects.using(db_alias).filter(
+        name='social_metrics'
+    ).update(last_id=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seo', '0006_drop_redundant_fk_indexes'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='socialmetricsrollup',
+            old_name='snapshots',
+            new_name='posts',
+        ),
+        migrations.RunPython(reset_rollups, migrations.RunPython.noop),
+    ]
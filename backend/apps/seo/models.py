@@ -1,5 +1,6 @@
 from django.db import models
-from core.models import SoftDeleteModel
+from django.utils import timezone
+from core.models import SoftDeleteModel, live_index
 
 class SEOTask(SoftDeleteModel):
     TYPE_CHOICES = [
@@ -49,6 +50,18 @@ class SEOKeywords(SoftDeleteModel):
     current_rank = models.IntegerField()
     target_rank = models.IntegerField()
 
+class SEOKeywordRankHistory(models.Model):
+    """
+    Append-only rank observations: at most one row per keyword per day,
+    written by apps.seo.signals whenever a keyword is saved.
+    """
+    keyword = models.ForeignKey(SEOKeywords, on_delete=models.CASCADE, related_name='rank_history')
+    date = models.DateField()
+    rank = models.IntegerField()
+
+    class Meta:
+        unique_together = ('keyword', 'date')
+
 class GMBProfile(SoftDeleteModel):
     project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='gmb_profiles')
     business_name = models.CharField(max_length=200)
@@ -70,3 +83,41 @@ class SocialMetrics(SoftDeleteModel):
     comments = models.IntegerField(default=0)
     shares = models.IntegerField(default=0)
     reach = models.IntegerField(default=0)
+    # When the figures were observed; each row is a cumulative snapshot of the post's totals
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            live_index('recorded_at', name='socialmetric_live_recorded_idx'),
+        ]
+
+class SocialMetricsRollup(models.Model):
+    """
+    Latest SocialMetrics snapshot of each post in a day/week bucket,
+    summed per project and platform.
+    Maintained by `manage.py rollup_social_metrics`; never edited by hand.
+    """
+    PERIOD_CHOICES = [('day', 'Day'), ('week', 'Week')]
+
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='social_rollups')
+    platform = models.CharField(max_length=50)
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    bucket_start = models.DateField()
+    likes = models.BigIntegerField(default=0)
+    comments = models.BigIntegerField(default=0)
+    shares = models.BigIntegerField(default=0)
+    reach = models.BigIntegerField(default=0)
+    posts = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('project', 'platform', 'period', 'bucket_start')
+        indexes = [
+            models.Index(fields=['project', 'period', 'bucket_start'], name='socialrollup_bucket_idx'),
+        ]
+
+class RollupWatermark(models.Model):
+    """Highest source row id already folded into a rollup table."""
+    name = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
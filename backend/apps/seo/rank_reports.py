@@ -0,0 +1,73 @@
+import numpy as np
+
+from .models import SEOKeywordRankHistory, SEOKeywords
+
+
+def movement_report(project_id, start, end, limit=10):
+    """
+    Rank movement of a project's keywords between `start` and `end`.
+    Each keyword's first and last observation in the window are compared;
+    the arithmetic runs on NumPy arrays, so the cost is two queries plus
+    vectorized work regardless of keyword count.
+    """
+    project_keywords = SEOKeywords.objects.filter(
+        seo_task__task__project_id=project_id,
+        seo_task__deleted_at__isnull=True,
+    )
+    keywords = list(project_keywords.order_by('id').values_list('id', 'keyword', 'target_rank'))
+    history = list(SEOKeywordRankHistory.objects.filter(
+        keyword__in=project_keywords.values('id'), date__gte=start, date__lte=end
+    ).order_by('keyword_id', 'date').values_list('keyword_id', 'rank'))
+
+    report = {
+        'keywords': len(keywords),
+        'tracked': 0,
+        'average_position': None,
+        'average_change': None,
+        'average_distance_to_target': None,
+        'on_target': 0,
+        'winners': [],
+        'losers': [],
+    }
+    if not history:
+        return report
+
+    ids = np.array([row[0] for row in keywords], dtype=np.int64)
+    targets = np.array([row[2] for row in keywords], dtype=np.int64)
+    rows = np.array(history, dtype=np.int64)
+
+    # Group boundaries of the (keyword, date)-sorted observations
+    observed, first = np.unique(rows[:, 0], return_index=True)
+    last = np.append(first[1:], len(rows)) - 1
+    start_rank = rows[first, 1]
+    end_rank = rows[last, 1]
+    change = start_rank - end_rank  # positive: moved up the results page
+
+    position = np.searchsorted(ids, observed)
+    distance = np.maximum(end_rank - targets[position], 0)
+
+    def entries(order):
+        return [
+            {
+                'keyword_id': int(observed[i]),
+                'keyword': keywords[position[i]][1],
+                'start_rank': int(start_rank[i]),
+                'end_rank': int(end_rank[i]),
+                'change': int(change[i]),
+            }
+            for i in order[:limit]
+        ]
+
+    # Stable sorts keep ties in keyword id order
+    winners = np.argsort(-change, kind='stable')
+    losers = np.argsort(change, kind='stable')
+    report.update({
+        'tracked': int(observed.size),
+        'average_position': round(float(end_rank.mean()), 2),
+        'average_change': round(float(change.mean()), 2),
+        'average_distance_to_target': round(float(distance.mean()), 2),
+        'on_target': int((distance == 0).sum()),
+        'winners': entries(winners[change[winners] > 0]),
+        'losers': entries(losers[change[losers] < 0]),
+    })
+    return report
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, DateField, F, Sum, Window
+from django.db.models.functions import RowNumber
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from .models import RollupWatermark, SocialMetrics, SocialMetricsRollup
+
+WATERMARK = 'social_metrics'
+METRIC_FIELDS = ('likes', 'comments', 'shares', 'reach')
+PERIODS = {
+    'day': (TruncDate, timedelta(days=1)),
+    'week': (TruncWeek, timedelta(weeks=1)),
+}
+
+
+def bucket_for(day, period):
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def rebuild_range(period, start, end=None, project_ids=None):
+    """
+    Replaces the rollup rows of `period` for buckets starting in
+    [start, end), optionally limited to some projects. SocialMetrics rows
+    are cumulative snapshots, so each post contributes only its latest
+    snapshot in a bucket and those are summed over the posts. One grouped
+    query plus one delete and one insert.
+    """
+    trunc, _ = PERIODS[period]
+    metrics = SocialMetrics.objects.filter(post__deleted_at__isnull=True, recorded_at__date__gte=start)
+    rollups = SocialMetricsRollup.objects.filter(period=period, bucket_start__gte=start)
+    if end is not None:
+        metrics = metrics.filter(recorded_at__date__lt=end)
+        rollups = rollups.filter(bucket_start__lt=end)
+    if project_ids is not None:
+        metrics = metrics.filter(post__project_id__in=project_ids)
+        rollups = rollups.filter(project_id__in=project_ids)
+
+    bucket = trunc('recorded_at', output_field=DateField())
+    latest_ids = metrics.annotate(newest_first=Window(
+        RowNumber(), partition_by=[F('post_id'), bucket], order_by=[F('recorded_at').desc(), F('id').desc()]
+    )).filter(newest_first=1).values('id')
+    rows = SocialMetrics.objects.filter(id__in=latest_ids).values(
+        project_id=F('post__project_id'),
+        platform=F('post__platform'),
+        bucket_start=bucket,
+    ).annotate(
+        posts=Count('post_id'), **{field: Sum(field) for field in METRIC_FIELDS}
+    ).order_by()
+
+    with transaction.atomic():
+        rollups.delete()
+        SocialMetricsRollup.objects.bulk_create([SocialMetricsRollup(period=period, **row) for row in rows])
+
+
+def refresh_rollups(batch_size=5000):
+    """
+    Folds SocialMetrics rows created since the last run into the rollup
+    table. Each batch recomputes only the bucket range and projects it
+    touches, so late snapshots for past days land in the right bucket.
+    Returns the number of source rows processed.
+    """
+    watermark, _ = RollupWatermark.objects.get_or_create(name=WATERMARK)
+    processed = 0
+    while True:
+        rows = list(
+            SocialMetrics.all_objects.filter(id__gt=watermark.last_id).order_by('id').values(
+                'id', 'post__project_id', 'recorded_at'
+            )[:batch_size]
+        )
+        if not rows:
+            return processed
+
+        project_ids = {row['post__project_id'] for row in rows}
+        days = [timezone.localdate(row['recorded_at']) for row in rows]
+        for period, (_, span) in PERIODS.items():
+            rebuild_range(
+                period, bucket_for(min(days), period), bucket_for(max(days), period) + span, project_ids
+            )
+
+        watermark.last_id = rows[-1]['id']
+        watermark.save(update_fields=['last_id', 'updated_at'])
+        processed += len(rows)
+
+
+def recompute_since(day):
+    """
+    Recomputes every bucket from the one containing `day` onwards, for
+    edits and deletions that the id watermark cannot see.
+    """
+    for period in PERIODS:
+        rebuild_range(period, bucket_for(day, period))
+
+
+def get_series(period, project_id=None, platform=None, start=None, end=None):
+    """Chart series read from the rollup table: one row per bucket and platform."""
+    rollups = SocialMetricsRollup.objects.filter(period=period)
+    if project_id:
+        rollups = rollups.filter(project_id=project_id)
+    if platform:
+        rollups = rollups.filter(platform=platform)
+    if start:
+        rollups = rollups.filter(bucket_start__gte=bucket_for(start, period))
+    if end:
+        rollups = rollups.filter(bucket_start__lte=end)
+    return rollups.values('bucket_start', 'platform').annotate(
+        posts=Sum('posts'), **{field: Sum(field) for field in METRIC_FIELDS}
+    ).order_by('bucket_start', 'platform')
@@ -1,7 +1,10 @@
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
 from .models import (
     SEOTask, SEOOnPage, SEOOffPage, SEOTechnical, 
-    SEOKeywords, GMBProfile, SocialMediaPost, SocialMetrics
+    SEOKeywords, GMBProfile, SocialMediaPost, SocialMetrics, SocialMetricsRollup
 )
 
 class SEOOnPageSerializer(serializers.ModelSerializer):
@@ -24,6 +27,14 @@ class SEOKeywordsSerializer(serializers.ModelSerializer):
         model = SEOKeywords
         fields = '__all__'
 
+# Nested collections rendered by SEOTaskSerializer, selectable with ?include=
+SEO_TASK_COLLECTIONS = {
+    'onpage_metrics': SEOOnPage,
+    'offpage_activities': SEOOffPage,
+    'technical_audits': SEOTechnical,
+    'keyword_tracking': SEOKeywords,
+}
+
 class SEOTaskSerializer(serializers.ModelSerializer):
     onpage_metrics = SEOOnPageSerializer(many=True, read_only=True)
     offpage_activities = SEOOffPageSerializer(many=True, read_only=True)
@@ -35,6 +46,13 @@ class SEOTaskSerializer(serializers.ModelSerializer):
         model = SEOTask
         fields = '__all__'
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        include = self.context.get('include')
+        if include is not None:
+            for name in SEO_TASK_COLLECTIONS.keys() - include:
+                self.fields.pop(name)
+
 class SocialMetricsSerializer(serializers.ModelSerializer):
     class Meta:
         model = SocialMetrics
@@ -47,6 +65,28 @@ class SocialMediaPostSerializer(serializers.ModelSerializer):
         model = SocialMediaPost
         fields = '__all__'
 
+class SocialAnalyticsQuerySerializer(serializers.Serializer):
+    """Query parameters for `social-posts/analytics/`."""
+    period = serializers.ChoiceField(choices=SocialMetricsRollup.PERIOD_CHOICES, default='day')
+    project_id = serializers.IntegerField(required=False)
+    platform = serializers.CharField(required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+class KeywordMovementQuerySerializer(serializers.Serializer):
+    """Query parameters for `seo-keywords/movement/`; the window defaults to the last 30 days."""
+    project_id = serializers.IntegerField()
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    limit = serializers.IntegerField(default=10, min_value=1, max_value=100)
+
+    def validate(self, attrs):
+        attrs.setdefault('end', timezone.localdate())
+        attrs.setdefault('start', attrs['end'] - timedelta(days=30))
+        if attrs['start'] > attrs['end']:
+            raise serializers.ValidationError("start must not be after end.")
+        return attrs
+
 class GMBProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = GMBProfile
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from core.cache import invalidate_on_change
+from core.models import touch_parents
+from .models import (
+    SEOKeywordRankHistory, SEOKeywords, SEOOffPage, SEOOnPage, SEOTask, SEOTechnical, SocialMetrics
+)
+
+
+def record_rank(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Later saves on the same day overwrite that day's observation
+    SEOKeywordRankHistory.objects.bulk_create(
+        [SEOKeywordRankHistory(keyword=instance, date=timezone.localdate(), rank=instance.current_rank)],
+        update_conflicts=True, unique_fields=['keyword', 'date'], update_fields=['rank'],
+    )
+
+
+def connect():
+    post_save.connect(record_rank, sender=SEOKeywords, dispatch_uid='seo_keyword_rank_history')
+    # Children rendered inside SEOTaskSerializer / SocialMediaPostSerializer
+    for model in (SEOOnPage, SEOOffPage, SEOTechnical, SEOKeywords):
+        touch_parents(model, 'seo_task')
+    touch_parents(SocialMetrics, 'post')
+
+    invalidate_on_change(SEOTask, 'task__project')
+    for model in (SEOOnPage, SEOOffPage, SEOTechnical, SEOKeywords):
+        invalidate_on_change(model, 'seo_task__task__project')
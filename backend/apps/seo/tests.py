@@ -1,3 +1,210 @@
-from django.test import TestCase
+from datetime import date, datetime, timezone
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from apps.projects.models import Client, Project
+from apps.tasks.models import Task, TaskType
+from apps.users.models import Department, Role, User
+from core.cache import response_cache
+from .models import (
+    SEOKeywordRankHistory, SEOKeywords, SEOOffPage, SEOOnPage, SEOTask, SEOTechnical,
+    SocialMediaPost, SocialMetrics
+)
+
+
+class SEOFixtureMixin:
+    def setUp(self):
+        response_cache.clear()
+        department = Department.objects.create(name='Marketing')
+        self.user = User.objects.create_user(
+            username='seo', email='seo@example.com', password='secret', name='SEO',
+            role=Role.objects.create(name='SUPER_ADMIN'), department=department
+        )
+        client = Client.objects.create(
+            name='Acme', email='acme@example.com', phone='123', company_name='Acme Ltd', address='Street 1'
+        )
+        self.project = Project.objects.create(
+            name='Website', client=client, department=department,
+            project_manager=self.user, created_by=self.user,
+            start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+        )
+        self.task_type = TaskType.objects.create(name='SEO')
+        self.client.force_authenticate(user=self.user)
+
+
+class SEOTaskPrefetchTests(SEOFixtureMixin, APITestCase):
+    def create_seo_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(
+                project=self.project, title=f'Task {i}', description='', task_type=self.task_type,
+                priority='low', due_date=date(2024, 6, 1), created_by=self.user
+            )
+            seo_task = SEOTask.objects.create(task=task, seo_type='keyword')
+            SEOOnPage.objects.create(
+                seo_task=seo_task, page_url='https://example.com', keyword_density=1, page_speed_status='ok'
+            )
+            SEOOffPage.objects.create(
+                seo_task=seo_task, activity_type='guest post', submission_url='https://example.com',
+                anchor_text='acme', da=40, spam_score=1, live_status='live'
+            )
+            SEOTechnical.objects.create(
+                seo_task=seo_task, sitemap_status='updated', core_web_vitals_lcp=2, core_web_vitals_cls=0
+            )
+            for keyword in ('acme', 'dropped'):
+                SEOKeywords.objects.create(
+                    seo_task=seo_task, keyword=keyword, search_volume=100,
+                    difficulty=10, current_rank=5, target_rank=1
+                )
+            SEOKeywords.objects.filter(keyword='dropped').delete()
+
+    def test_full_tree_loads_in_fixed_queries_without_deleted_rows(self):
+        self.create_seo_tasks(5)
+
+        # ETag aggregate, SEO tasks with task and project joined, one per collection
+        with self.assertNumQueries(6):
+            response = self.client.get('/api/v1/seo-tasks/')
+
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(response.data[0]['project_name'], 'Website')
+        self.assertEqual([k['keyword'] for k in response.data[0]['keyword_tracking']], ['acme'])
+        self.assertEqual(response.json()[0]['onpage_metrics'][0]['keyword_density'], '1.00')
+
+    def test_include_limits_collections(self):
+        self.create_seo_tasks(3)
+
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/v1/seo-tasks/', {'include': 'keyword_tracking'})
+
+        self.assertIn('keyword_tracking', response.data[0])
+        self.assertNotIn('onpage_metrics', response.data[0])
+
+    def test_unknown_include_is_rejected(self):
+        response = self.client.get('/api/v1/seo-tasks/', {'include': 'backlinks'})
+
+        self.assertEqual(response.status_code, 400)
+
+
+class SocialRollupTests(SEOFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.instagram = self.create_post('instagram')
+        self.facebook = self.create_post('facebook')
+
+    def create_post(self, platform):
+        return SocialMediaPost.objects.create(
+            project=self.project, platform=platform, post_type='image',
+            post_url='https://example.com/p', posting_date=date(2024, 1, 1)
+        )
+
+    def record(self, post, day, likes, reach=0, hour=12):
+        return SocialMetrics.objects.create(
+            post=post, likes=likes, reach=reach,
+            recorded_at=datetime(2024, 1, day, hour, tzinfo=timezone.utc)
+        )
+
+    def rollup(self, *args):
+        call_command('rollup_social_metrics', *args, stdout=StringIO())
+
+    def series(self, **params):
+        response = self.client.get('/api/v1/social-posts/analytics/', {'project_id': self.project.id, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(str(row['bucket_start']), row['platform'], row['likes']) for row in response.data]
+
+    def test_buckets_take_each_posts_latest_snapshot(self):
+        # 2024-01-01 is a Monday; snapshots are running totals
+        self.record(self.instagram, 1, 5, reach=100, hour=9)
+        self.record(self.instagram, 1, 10, reach=150, hour=18)
+        self.record(self.instagram, 3, 12)
+        self.record(self.instagram, 8, 20)
+        self.record(self.facebook, 2, 3)
+        self.record(self.create_post('instagram'), 1, 4)
+        self.rollup()
+
+        self.assertEqual(self.series(), [
+            ('2024-01-01', 'instagram', 14), ('2024-01-02', 'facebook', 3),
+            ('2024-01-03', 'instagram', 12), ('2024-01-08', 'instagram', 20),
+        ])
+        # The week holds the first post's Wednesday total plus the second post's Monday one
+        self.assertEqual(self.series(period='week', platform='instagram'), [
+            ('2024-01-01', 'instagram', 16), ('2024-01-08', 'instagram', 20),
+        ])
+
+    def test_late_snapshots_are_folded_into_past_buckets(self):
+        self.record(self.instagram, 8, 7)
+        self.rollup()
+        self.record(self.instagram, 1, 4)
+        self.record(self.instagram, 8, 9, hour=20)
+        self.rollup()
+
+        self.assertEqual(self.series(), [('2024-01-01', 'instagram', 4), ('2024-01-08', 'instagram', 9)])
+
+    def test_since_recomputes_after_deletions(self):
+        self.record(self.instagram, 1, 4)
+        dropped = self.record(self.instagram, 2, 6)
+        self.rollup()
+        dropped.delete()
+
+        self.rollup('--since', '2024-01-02')
+
+        self.assertEqual(self.series(period='week'), [('2024-01-01', 'instagram', 4)])
+
+
+class KeywordMovementTests(SEOFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        task = Task.objects.create(
+            project=self.project, title='Rankings', description='', task_type=self.task_type,
+            priority='low', due_date=date(2024, 6, 1), created_by=self.user
+        )
+        self.seo_task = SEOTask.objects.create(task=task, seo_type='keyword')
+
+    def track(self, keyword, target, ranks):
+        row = SEOKeywords.objects.create(
+            seo_task=self.seo_task, keyword=keyword, search_volume=100,
+            difficulty=10, current_rank=ranks[-1], target_rank=target
+        )
+        SEOKeywordRankHistory.objects.filter(keyword=row).delete()
+        SEOKeywordRankHistory.objects.bulk_create([
+            SEOKeywordRankHistory(keyword=row, date=date(2024, 1, day), rank=rank)
+            for day, rank in enumerate(ranks, start=1)
+        ])
+        return row
+
+    def test_saving_a_keyword_records_todays_rank_once(self):
+        keyword = self.track('acme', 1, [9])
+        keyword.current_rank = 7
+        keyword.save()
+        keyword.current_rank = 5
+        keyword.save()
+
+        self.assertEqual(list(keyword.rank_history.order_by('date').values_list('rank', flat=True)), [9, 5])
+
+    def test_movement_report(self):
+        self.track('rising', 3, [20, 12, 4])
+        self.track('falling', 5, [2, 6])
+        self.track('steady', 10, [8, 8])
+
+        response = self.client.get('/api/v1/seo-keywords/movement/', {
+            'project_id': self.project.id, 'start': '2024-01-01', 'end': '2024-01-31'
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['tracked'], 3)
+        self.assertEqual(response.data['average_position'], 6)
+        self.assertEqual(response.data['average_change'], 4)
+        self.assertEqual(response.data['on_target'], 1)
+        self.assertEqual(response.data['average_distance_to_target'], 0.67)
+        self.assertEqual([row['keyword'] for row in response.data['winners']], ['rising'])
+        self.assertEqual(response.data['losers'][0]['change'], -4)
+
+    def test_empty_window(self):
+        self.track('acme', 1, [3])
+
+        response = self.client.get('/api/v1/seo-keywords/movement/', {
+            'project_id': self.project.id, 'start': '2023-01-01', 'end': '2023-01-31'
+        })
+
+        self.assertEqual(response.data['keywords'], 1)
+        self.assertIsNone(response.data['average_position'])
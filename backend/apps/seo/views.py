@@ -1,4 +1,8 @@
+from django.db.models import Prefetch
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from .models import (
     SEOTask, SEOOnPage, SEOOffPage, SEOTechnical, 
     SEOKeywords, GMBProfile, SocialMediaPost, SocialMetrics
@@ -6,44 +10,93 @@ from .models import (
 from .serializers import (
     SEOTaskSerializer, SEOOnPageSerializer, SEOOffPageSerializer,
     SEOTechnicalSerializer, SEOKeywordsSerializer, GMBProfileSerializer,
-    SocialMediaPostSerializer, SocialMetricsSerializer
+    SocialMediaPostSerializer, SocialMetricsSerializer, SocialAnalyticsQuerySerializer,
+    KeywordMovementQuerySerializer, SEO_TASK_COLLECTIONS
 )
+from .rank_reports import movement_report
+from .rollups import get_series
+from core.mixins import CachedListMixin, ConditionalGetMixin, SparseFieldsMixin
 
-class SEOTaskViewSet(viewsets.ModelViewSet):
+class SEOTaskViewSet(ConditionalGetMixin, CachedListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = SEOTask.objects.all()
     serializer_class = SEOTaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    use_replica = True
+    cache_models = (
+        'seo.seotask', 'seo.seoonpage', 'seo.seooffpage', 'seo.seotechnical', 'seo.seokeywords',
+        'tasks.task', 'projects.project',
+    )
+    cache_project_param = 'project_id'
+
+    def get_include(self):
+        """
+        Nested collections requested with ?include=keyword_tracking,... ;
+        all of them when the parameter is absent.
+        """
+        include = self.request.query_params.get('include')
+        if include is None:
+            return set(SEO_TASK_COLLECTIONS)
+        names = {name.strip() for name in include.split(',') if name.strip()}
+        unknown = names - SEO_TASK_COLLECTIONS.keys()
+        if unknown:
+            raise ValidationError({'include': f"Unknown collections: {', '.join(sorted(unknown))}"})
+        return names
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['include'] = self.get_include()
+        return context
 
     def get_queryset(self):
         project_id = self.request.query_params.get('project_id')
+        # Explicit managers keep soft-deleted children out of the prefetch
+        queryset = self.queryset.select_related('task__project').prefetch_related(*[
+            Prefetch(name, queryset=model.objects.order_by('id'))
+            for name, model in SEO_TASK_COLLECTIONS.items() if name in self.get_include()
+        ])
         if project_id:
-            return self.queryset.filter(task__project_id=project_id)
-        return self.queryset
+            return queryset.filter(task__project_id=project_id)
+        return queryset
 
-class SEOOnPageViewSet(viewsets.ModelViewSet):
+class SEOOnPageViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = SEOOnPage.objects.all()
     serializer_class = SEOOnPageSerializer
     permission_classes = [permissions.IsAuthenticated]
+    use_replica = True
 
-class SEOOffPageViewSet(viewsets.ModelViewSet):
+class SEOOffPageViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = SEOOffPage.objects.all()
     serializer_class = SEOOffPageSerializer
     permission_classes = [permissions.IsAuthenticated]
+    use_replica = True
 
-class SEOTechnicalViewSet(viewsets.ModelViewSet):
+class SEOTechnicalViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = SEOTechnical.objects.all()
     serializer_class = SEOTechnicalSerializer
     permission_classes = [permissions.IsAuthenticated]
+    use_replica = True
 
-class SEOKeywordsViewSet(viewsets.ModelViewSet):
+class SEOKeywordsViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = SEOKeywords.objects.all()
     serializer_class = SEOKeywordsSerializer
     permission_classes = [permissions.IsAuthenticated]
+    use_replica = True
+
+    @action(detail=False)
+    def movement(self, request):
+        """
+        Winners, losers and average positions for a project's keywords.
+        GET /api/v1/seo-keywords/movement/?project_id=1&start=2024-01-01&end=2024-01-31
+        """
+        serializer = KeywordMovementQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(movement_report(**serializer.validated_data))
 
-class GMBProfileViewSet(viewsets.ModelViewSet):
+class GMBProfileViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = GMBProfile.objects.all()
     serializer_class = GMBProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
+    use_replica = True
 
     def get_queryset(self):
         project_id = self.request.query_params.get('project_id')
@@ -51,18 +104,33 @@ class GMBProfileViewSet(viewsets.ModelViewSet):
             return self.queryset.filter(project_id=project_id)
         return self.queryset
 
-class SocialMediaPostViewSet(viewsets.ModelViewSet):
+class SocialMediaPostViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = SocialMediaPost.objects.all()
     serializer_class = SocialMediaPostSerializer
     permission_classes = [permissions.IsAuthenticated]
+    use_replica = True
 
     def get_queryset(self):
         project_id = self.request.query_params.get('project_id')
+        queryset = self.queryset.prefetch_related(
+            Prefetch('metrics', queryset=SocialMetrics.objects.order_by('recorded_at', 'id'))
+        )
         if project_id:
-            return self.queryset.filter(project_id=project_id)
-        return self.queryset
+            return queryset.filter(project_id=project_id)
+        return queryset
+
+    @action(detail=False)
+    def analytics(self, request):
+        """
+        Engagement chart data from the rollup tables.
+        GET /api/v1/social-posts/analytics/?project_id=1&period=week&start=2024-01-01
+        """
+        serializer = SocialAnalyticsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(list(get_series(**serializer.validated_data)))
 
-class SocialMetricsViewSet(viewsets.ModelViewSet):
+class SocialMetricsViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = SocialMetrics.objects.all()
     serializer_class = SocialMetricsSerializer
     permission_classes = [permissions.IsAuthenticated]
+    use_replica = True
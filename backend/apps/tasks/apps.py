@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class TasksConfig(AppConfig):
     name = 'apps.tasks'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
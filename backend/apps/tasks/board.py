@@ -0,0 +1,91 @@
+"""
+Kanban ordering. Cards use sparse `board_order` values spaced BOARD_ORDER_STEP
+apart, so moving a single card only rewrites that card: it takes the midpoint
+between its new neighbours. A column is renumbered only when a gap runs out.
+"""
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from core.models import bulk_updated
+from .models import Task
+
+BOARD_ORDER_STEP = 1024
+
+
+def next_board_order(project_id, status):
+    last = Task.objects.filter(project_id=project_id, status=status).aggregate(Max('board_order'))
+    return (last['board_order__max'] or 0) + BOARD_ORDER_STEP
+
+
+def reorder_column(tasks, status):
+    """
+    Places `tasks` (all of one project) at the top of the `status` column
+    in the given order with a single bulk_update. Cards of the column that
+    are not listed keep their relative order below them, so the column
+    never ends up with ties or interleaved cards.
+    """
+    with transaction.atomic():
+        listed = {task.pk for task in tasks}
+        rest = Task.objects.filter(project_id=tasks[0].project_id, status=status).exclude(pk__in=listed)
+        tasks = [*tasks, *rest.order_by('board_order', 'id')]
+
+        previous = {task.pk: {'status': task.status, 'board_order': task.board_order} for task in tasks}
+        now = timezone.now()
+        for index, task in enumerate(tasks, start=1):
+            task.status = status
+            task.board_order = index * BOARD_ORDER_STEP
+            task.updated_at = now
+
+        Task.objects.bulk_update(tasks, ['status', 'board_order', 'updated_at'])
+        bulk_updated.send(sender=Task, objs=tasks, previous=previous)
+    return tasks
+
+
+def move_task(task, status, before=None, after=None):
+    """
+    Moves one card into `status`, directly above `before` or below `after`
+    (or to the bottom when neither is given). Returns the rows written.
+    """
+    column = Task.objects.filter(project_id=task.project_id, status=status).exclude(pk=task.pk)
+    anchor = before or after
+
+    if anchor and column.filter(board_order=anchor.board_order).exclude(pk=anchor.pk).exists():
+        # Tied neighbours have no gap between them; renumber instead
+        return rebalance_with(task, status, column, before, after)
+
+    if before:
+        high = before.board_order
+        low = column.filter(board_order__lt=high).aggregate(Max('board_order'))['board_order__max']
+        low = high - 2 * BOARD_ORDER_STEP if low is None else low
+    elif after:
+        low = after.board_order
+        high = column.filter(board_order__gt=low).aggregate(Min('board_order'))['board_order__min']
+        high = low + 2 * BOARD_ORDER_STEP if high is None else high
+    else:
+        task.status = status
+        task.board_order = next_board_order(task.project_id, status)
+        task.save(update_fields=['status', 'board_order', 'updated_at'])
+        return [task]
+
+    position = (low + high) // 2
+    if not low < position < high:
+        return rebalance_with(task, status, column, before, after)
+
+    task.status = status
+    task.board_order = position
+    task.save(update_fields=['status', 'board_order', 'updated_at'])
+    return [task]
+
+
+def rebalance_with(task, status, column, before=None, after=None):
+    ordered = list(column.order_by('board_order', 'id'))
+    ids = [card.pk for card in ordered]
+    if before:
+        index = ids.index(before.pk)
+    elif after:
+        index = ids.index(after.pk) + 1
+    else:
+        index = len(ordered)
+    ordered.insert(index, task)
+    return reorder_column(ordered, status)
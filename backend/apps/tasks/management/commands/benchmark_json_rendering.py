@@ -0,0 +1,89 @@
+import gzip
+import json
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from apps.projects.models import Client, Project
+from apps.tasks.models import Task, TaskComment, TaskFile, TaskProgress, TaskReview, TaskType
+from apps.tasks.serializers import TaskSerializer
+from apps.tasks.views import TaskViewSet
+from apps.users.models import Department, Role, User
+from core.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares DRF's JSONRenderer with core.renderers.ORJSONRenderer on a "
+        "TaskViewSet list payload. Fixture rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.create_fixtures(options['tasks'])
+            queryset = TaskViewSet.with_related(Task.objects.filter(project=self.project))
+            data = TaskSerializer(queryset, many=True).data
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{len(data)} tasks, best of {options['repeat']} renders")
+        bodies = []
+        for renderer in (JSONRenderer(), ORJSONRenderer()):
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                body = renderer.render(data, 'application/json')
+                timings.append(time.perf_counter() - started)
+            self.stdout.write(
+                f"{type(renderer).__name__:>16}: {min(timings) * 1000:8.2f} ms  "
+                f"{len(body):>9} bytes  {len(gzip.compress(body)):>8} gzipped"
+            )
+            bodies.append(body)
+        self.stdout.write(
+            f"Same document: {json.loads(bodies[0]) == json.loads(bodies[1])}  "
+            f"byte-identical: {bodies[0] == bodies[1]}"
+        )
+
+    def create_fixtures(self, count):
+        department = Department.objects.create(name='Benchmark')
+        user = User.objects.create_user(
+            username='benchmark', email='benchmark@example.com', password=None, name='Benchmark',
+            role=Role.objects.create(name='BENCHMARK'), department=department
+        )
+        client = Client.objects.create(
+            name='Bench', email='bench@example.com', phone='0', company_name='Bench Ltd', address='-'
+        )
+        self.project = Project.objects.create(
+            name='Benchmark', client=client, department=department, project_manager=user,
+            created_by=user, start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+        )
+        task_type = TaskType.objects.create(name='Benchmark')
+        tasks = Task.objects.bulk_create([
+            Task(
+                project=self.project, title=f'Task {i}', description='Lorem ipsum ' * 10,
+                task_type=task_type, priority='medium', due_date=date(2024, 6, 1),
+                created_by=user, board_order=i
+            )
+            for i in range(count)
+        ])
+        files = TaskFile.objects.bulk_create([
+            TaskFile(task=task, uploaded_by=user, file_path=f'/files/{task.pk}.png', file_type='png')
+            for task in tasks
+        ])
+        TaskReview.objects.bulk_create([
+            TaskReview(
+                task_file=task_file, reviewer=user, reviewed_by_role='PM',
+                review_version=1, comments='Looks good', status='approved'
+            )
+            for task_file in files
+        ])
+        TaskComment.objects.bulk_create([TaskComment(task=task, user=user, comment='Done') for task in tasks])
+        TaskProgress.objects.bulk_create([
+            TaskProgress(task=task, progress_percentage=50, updated_by=user) for task in tasks
+        ])
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_live_row_indexes'),
+        ('tasks', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_project_b78682_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_due_dat_bce847_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['project', 'status'], name='task_live_project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['due_date'], name='task_live_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskassignment',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['task'], name='taskassign_live_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcomment',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['task'], name='taskcomment_live_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskfile',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['task'], name='taskfile_live_task_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:29
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_live_row_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='taskassignment',
+            name='taskassign_live_task_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='taskcomment',
+            name='taskcomment_live_task_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='taskfile',
+            name='taskfile_live_task_idx',
+        ),
+    ]
@@ -1,6 +1,6 @@
 
 from django.db import models
-from core.models import SoftDeleteModel
+from core.models import SoftDeleteModel, live_index
 from django.conf import settings
 
 class TaskType(SoftDeleteModel):
@@ -35,8 +35,8 @@ class Task(SoftDeleteModel):
 
     class Meta:
         indexes = [
-            models.Index(fields=['project', 'status']),
-            models.Index(fields=['due_date']),
+            live_index('project', 'status', name='task_live_project_status_idx'),
+            live_index('due_date', name='task_live_due_date_idx'),
         ]
 
 class TaskAssignment(SoftDeleteModel):
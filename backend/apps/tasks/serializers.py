@@ -49,7 +49,38 @@ class TaskSerializer(serializers.ModelSerializer):
         model = Task
         fields = '__all__'
         read_only_fields = ['created_by', 'created_at', 'updated_at']
+        field_sources = {'latest_progress': ('latest_progress_value',)}
 
     def get_latest_progress(self, obj):
+        # Annotated by TaskViewSet.with_related; fall back to a lookup otherwise
+        if hasattr(obj, 'latest_progress_value'):
+            return obj.latest_progress_value
         last = obj.progress_history.order_by('-updated_at').first()
         return last.progress_percentage if last else 0
+
+class TaskReorderSerializer(serializers.Serializer):
+    """
+    Payload for `tasks/reorder/`: either ordered `task_ids` for the top of
+    a column (unlisted cards follow them), or a single `task_id` with an
+    optional `before_id`/`after_id` neighbour in the target column.
+    """
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES)
+    task_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False, max_length=1000
+    )
+    task_id = serializers.IntegerField(required=False)
+    before_id = serializers.IntegerField(required=False)
+    after_id = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        if ('task_ids' in attrs) == ('task_id' in attrs):
+            raise serializers.ValidationError("Provide either task_ids or task_id.")
+        if 'before_id' in attrs and 'after_id' in attrs:
+            raise serializers.ValidationError("Provide at most one of before_id and after_id.")
+        for name in ('before_id', 'after_id'):
+            if name in attrs and attrs[name] == attrs.get('task_id'):
+                raise serializers.ValidationError({name: "A task cannot be placed next to itself."})
+        task_ids = attrs.get('task_ids', [])
+        if len(set(task_ids)) != len(task_ids):
+            raise serializers.ValidationError({'task_ids': "Task ids must be unique."})
+        return attrs
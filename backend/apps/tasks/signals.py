@@ -0,0 +1,17 @@
+from core.cache import invalidate_on_change
+from core.models import touch_parents
+from .models import Task, TaskAssignment, TaskComment, TaskFile, TaskProgress, TaskReview, TaskType
+
+
+def connect():
+    # Children rendered inside TaskSerializer / TaskFileSerializer
+    for model in (TaskAssignment, TaskFile, TaskComment, TaskProgress):
+        touch_parents(model, 'task')
+    touch_parents(TaskReview, 'task_file')
+    touch_parents(TaskReview, 'task_file__task')
+
+    invalidate_on_change(Task, 'project')
+    for model in (TaskAssignment, TaskFile, TaskComment, TaskProgress):
+        invalidate_on_change(model, 'task__project')
+    invalidate_on_change(TaskReview, 'task_file__task__project')
+    invalidate_on_change(TaskType)
@@ -1,3 +1,346 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from apps.projects.models import Client, Project, ProjectMember
+from apps.reports.models import DashboardStats
+from apps.users.models import Department, Role, User
+from core.cache import ResponseCache, response_cache
+from core.fastlist import ValuesPlan
+from .models import Task, TaskAssignment, TaskComment, TaskFile, TaskProgress, TaskReview, TaskType
+from .serializers import TaskSerializer, TaskTypeSerializer
+
+
+class TaskFixtureMixin:
+    def setUp(self):
+        cache.clear()
+        response_cache.clear()
+        self.department = Department.objects.create(name='Development')
+        self.role = Role.objects.create(name='TEAM_MEMBER')
+        self.user = User.objects.create_user(
+            username='member', email='member@example.com', password='secret',
+            name='Member', role=self.role, department=self.department
+        )
+        client = Client.objects.create(
+            name='Acme', email='acme@example.com', phone='123', company_name='Acme Ltd', address='Street 1'
+        )
+        self.project = Project.objects.create(
+            name='Website', client=client, department=self.department,
+            project_manager=self.user, created_by=self.user,
+            start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+        )
+        ProjectMember.objects.create(project=self.project, user=self.user, role_in_project='MEMBER')
+        self.task_type = TaskType.objects.create(name='Dev')
+        self.client.force_authenticate(user=self.user)
+
+    def create_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(
+                project=self.project, title=f'Task {i}', description='', task_type=self.task_type,
+                priority='low', due_date=date(2024, 6, 1), created_by=self.user
+            )
+            TaskAssignment.objects.create(task=task, employee=self.user, assigned_by=self.user)
+            task_file = TaskFile.objects.create(
+                task=task, uploaded_by=self.user, file_path='/f.png', file_type='png'
+            )
+            TaskReview.objects.create(
+                task_file=task_file, reviewer=self.user, reviewed_by_role='PM',
+                review_version=1, comments='ok', status='approved'
+            )
+            TaskComment.objects.create(task=task, user=self.user, comment='hello')
+            TaskProgress.objects.create(task=task, progress_percentage=10, updated_by=self.user)
+            TaskProgress.objects.create(task=task, progress_percentage=40, updated_by=self.user)
+
+
+class TaskListQueryCountTests(TaskFixtureMixin, APITestCase):
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/v1/tasks/')
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_query_count_is_constant_as_tasks_grow(self):
+        self.create_tasks(2)
+        small, _ = self.count_list_queries()
+        self.create_tasks(10)
+        large, data = self.count_list_queries()
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(data), 12)
+
+    def test_latest_progress_uses_most_recent_entry(self):
+        self.create_tasks(1)
+        _, data = self.count_list_queries()
+
+        self.assertEqual(data[0]['latest_progress'], 40)
+        self.assertEqual(data[0]['assignments'][0]['employee_details']['role_name'], 'TEAM_MEMBER')
+        self.assertEqual(data[0]['files'][0]['reviews'][0]['reviewer_name'], 'Member')
+
+
+class TaskSparseFieldsTests(TaskFixtureMixin, APITestCase):
+    def get(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/v1/tasks/', params)
+        return response, [query['sql'] for query in ctx.captured_queries]
+
+    def test_board_columns_run_narrow_sql(self):
+        self.create_tasks(3)
+
+        response, queries = self.get(fields='id,title,status,board_order,project_name')
+
+        self.assertEqual(set(response.data[0]), {'id', 'title', 'status', 'board_order', 'project_name'})
+        # The conditional GET aggregate, then the narrowed task query
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('description', queries[1])
+        self.assertNotIn('tasks_tasktype', queries[1])
+
+    def test_expand_opts_into_nested_collections(self):
+        self.create_tasks(2)
+        self.get()
+
+        response, queries = self.get(expand='comments')
+
+        self.assertIn('comments', response.data[0])
+        self.assertNotIn('files', response.data[0])
+        self.assertEqual(response.data[0]['latest_progress'], 40)
+        self.assertEqual(len(queries), 3)
+
+    def test_unknown_fields_are_rejected(self):
+        response, _ = self.get(fields='id,secret')
+
+        self.assertEqual(response.status_code, 400)
+
+
+class TaskConditionalGetTests(TaskFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_tasks(2)
+        self.task = Task.objects.order_by('id').first()
+
+    def revalidate(self, url, response):
+        with CaptureQueriesContext(connection) as ctx:
+            repeat = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        return repeat, len(ctx.captured_queries)
+
+    def test_unchanged_list_is_not_resent(self):
+        response = self.client.get('/api/v1/tasks/')
+        self.assertIn('Last-Modified', response)
+
+        repeat, queries = self.revalidate('/api/v1/tasks/', response)
+
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(queries, 1)
+
+    def test_nested_changes_and_deletions_change_the_list_etag(self):
+        response = self.client.get('/api/v1/tasks/')
+        TaskComment.objects.create(task=self.task, user=self.user, comment='new')
+        self.assertEqual(self.revalidate('/api/v1/tasks/', response)[0].status_code, 200)
+
+        response = self.client.get('/api/v1/tasks/')
+        self.task.delete()
+        self.assertEqual(self.revalidate('/api/v1/tasks/', response)[0].status_code, 200)
+
+    def test_related_changes_change_the_list_etag(self):
+        response = self.client.get('/api/v1/tasks/')
+        self.project.name = 'Renamed'
+        self.project.save()
+
+        repeat, _ = self.revalidate('/api/v1/tasks/', response)
+
+        self.assertEqual(repeat.status_code, 200)
+        self.assertEqual(repeat.data[0]['project_name'], 'Renamed')
+
+    def test_detail_revalidates_on_the_etag(self):
+        url = f'/api/v1/tasks/{self.task.id}/'
+        response = self.client.get(url)
+
+        self.assertEqual(self.revalidate(url, response)[0].status_code, 304)
+        # The row timestamp alone would miss a renamed project
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 200
+        )
+
+        TaskReview.objects.create(
+            task_file=self.task.files.get(), reviewer=self.user, reviewed_by_role='PM',
+            review_version=2, comments='redo', status='rework'
+        )
+        self.assertEqual(self.revalidate(url, response)[0].status_code, 200)
+
+
+class TaskResponseCacheTests(TaskFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_tasks(2)
+        self.other = Project.objects.create(
+            name='Intranet', client=self.project.client, department=self.department,
+            project_manager=self.user, created_by=self.user,
+            start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+        )
+        ProjectMember.objects.create(project=self.other, user=self.user, role_in_project='MEMBER')
+
+    def count_queries(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/v1/tasks/', params)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_repeat_lists_skip_the_serializer_queries(self):
+        first = self.count_queries()
+        # Only the conditional GET aggregate remains
+        self.assertEqual(self.count_queries(), 1)
+        self.assertLess(1, first)
+        self.assertEqual(response_cache.counters()['tasks.task']['hits'], 1)
+
+    def test_writes_invalidate_only_their_project(self):
+        self.count_queries(project_id=self.project.id)
+
+        Task.objects.create(
+            project=self.other, title='Elsewhere', description='', task_type=self.task_type,
+            priority='low', due_date=date(2024, 6, 1), created_by=self.user
+        )
+        self.assertEqual(self.count_queries(project_id=self.project.id), 1)
+
+        task = Task.objects.filter(project=self.project).first()
+        TaskComment.objects.create(task=task, user=self.user, comment='new')
+        self.assertGreater(self.count_queries(project_id=self.project.id), 1)
+
+    def test_moving_a_task_invalidates_its_old_project(self):
+        task = Task.objects.filter(project=self.project).first()
+        self.client.get('/api/v1/tasks/', {'project_id': self.project.id})
+
+        response = self.client.patch(f'/api/v1/tasks/{task.id}/', {'project': self.other.id})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get('/api/v1/tasks/', {'project_id': self.project.id})
+        self.assertNotIn(task.id, [row['id'] for row in response.data])
+
+    def test_lru_evictions_are_counted(self):
+        small = ResponseCache(l1_size=1)
+        small.get_or_set('a', ['tag-a'], lambda: 1)
+        small.get_or_set('b', ['tag-b'], lambda: 2)
+
+        self.assertEqual(small.counters()['tag-a'], {'misses': 1, 'evictions': 1})
+
+
+class TaskTypeFastListTests(TaskFixtureMixin, APITestCase):
+    def test_list_matches_serializer(self):
+        TaskType.objects.create(name='SEO', description='Search')
+
+        response = self.client.get('/api/v1/task-types/')
+
+        expected = TaskTypeSerializer(TaskType.objects.all(), many=True).data
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+
+    def test_method_fields_and_nested_lists_are_not_compiled(self):
+        self.assertIsNone(ValuesPlan.compile(TaskSerializer(), Task))
+
+
+class SoftDeleteCascadeTests(TaskFixtureMixin, APITestCase):
+    def test_queryset_delete_cascades_to_children(self):
+        self.create_tasks(3)
+
+        total, per_model = Task.objects.filter(project=self.project).delete()
+
+        self.assertEqual(per_model['tasks.Task'], 3)
+        self.assertEqual(per_model['tasks.TaskComment'], 3)
+        self.assertEqual(total, 12)
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(TaskComment.objects.exists())
+        self.assertEqual(Task.all_objects.count(), 3)
+
+    def test_restore_brings_back_only_the_same_cascade(self):
+        self.create_tasks(1)
+        task = Task.objects.get()
+        earlier = TaskComment.objects.create(task=task, user=self.user, comment='removed earlier')
+        earlier.delete()
+
+        task.delete()
+        self.assertIsNotNone(task.deleted_at)
+        task.restore()
+
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(list(TaskComment.objects.values_list('comment', flat=True)), ['hello'])
+        self.assertEqual(TaskFile.objects.count(), 1)
+
+
+class TaskReorderTests(TaskFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_tasks(3)
+        self.a, self.b, self.c = Task.objects.order_by('id')
+
+    def column(self, status='todo'):
+        return list(Task.objects.filter(status=status).order_by('board_order', 'id').values_list('id', flat=True))
+
+    def test_column_is_reordered_in_one_request(self):
+        response = self.client.post(
+            '/api/v1/tasks/reorder/', {'status': 'in_progress', 'task_ids': [self.c.id, self.a.id, self.b.id]},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.column('in_progress'), [self.c.id, self.a.id, self.b.id])
+        self.assertEqual(self.column('todo'), [])
+        # bulk_update bypasses save signals; the dashboard snapshot must still follow
+        self.assertEqual(DashboardStats.objects.get().tasks_in_progress, 3)
+
+    def test_moving_one_card_writes_one_row(self):
+        self.client.post(
+            '/api/v1/tasks/reorder/', {'status': 'todo', 'task_ids': [self.a.id, self.b.id, self.c.id]},
+            format='json'
+        )
+
+        response = self.client.post(
+            '/api/v1/tasks/reorder/', {'status': 'todo', 'task_id': self.c.id, 'before_id': self.b.id},
+            format='json'
+        )
+
+        self.assertEqual([row['id'] for row in response.data], [self.c.id])
+        self.assertEqual(self.column(), [self.a.id, self.c.id, self.b.id])
+
+    def test_partial_list_keeps_unlisted_cards_below(self):
+        Task.objects.update(board_order=0)
+
+        response = self.client.post(
+            '/api/v1/tasks/reorder/', {'status': 'todo', 'task_ids': [self.c.id, self.b.id]}, format='json'
+        )
+
+        self.assertEqual([row['id'] for row in response.data], [self.c.id, self.b.id, self.a.id])
+        self.assertEqual(self.column(), [self.c.id, self.b.id, self.a.id])
+        self.assertEqual(len(set(Task.objects.values_list('board_order', flat=True))), 3)
+
+    def test_tied_orders_are_rebalanced(self):
+        Task.objects.update(board_order=0)
+
+        response = self.client.post(
+            '/api/v1/tasks/reorder/', {'status': 'todo', 'task_id': self.c.id, 'after_id': self.a.id},
+            format='json'
+        )
+
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(self.column(), [self.a.id, self.c.id, self.b.id])
+
+    def test_a_task_cannot_anchor_on_itself(self):
+        Task.objects.update(board_order=0)
+
+        for anchor in ('before_id', 'after_id'):
+            response = self.client.post(
+                '/api/v1/tasks/reorder/', {'status': 'todo', 'task_id': self.b.id, anchor: self.b.id},
+                format='json'
+            )
+
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(anchor, response.data)
+
+    def test_tasks_outside_the_users_projects_are_rejected(self):
+        ProjectMember.objects.all().delete()
+
+        response = self.client.post(
+            '/api/v1/tasks/reorder/', {'status': 'done', 'task_ids': [self.a.id]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -1,57 +1,155 @@
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import Task, TaskType, TaskFile, TaskComment, TaskReview, TaskProgress
-from .serializers import TaskSerializer, TaskTypeSerializer, TaskFileSerializer, TaskCommentSerializer, TaskReviewSerializer
+from django.db.models import OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce
+from .models import Task, TaskType, TaskFile, TaskComment, TaskReview, TaskProgress, TaskAssignment
+from .serializers import (
+    TaskSerializer, TaskTypeSerializer, TaskFileSerializer, TaskCommentSerializer,
+    TaskReviewSerializer, TaskReorderSerializer
+)
+from .board import move_task, next_board_order, reorder_column
 from apps.activity.utils import log_system_activity
+from apps.projects.access import get_accessible_project_ids
+from core.authentication import get_user_instance
+from core.mixins import CachedListMixin, ConditionalGetMixin, FastListMixin, SparseFieldsMixin
 from core.permissions import IsProjectManager
+from core.roles import get_request_role
 
-class TaskTypeViewSet(viewsets.ModelViewSet):
+class TaskTypeViewSet(ConditionalGetMixin, FastListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = TaskType.objects.all()
     serializer_class = TaskTypeSerializer
     permission_classes = [permissions.IsAuthenticated]
+    fast_list = True
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ConditionalGetMixin, CachedListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    use_replica = True
+    cache_models = (
+        'tasks.task', 'tasks.taskassignment', 'tasks.taskfile', 'tasks.taskreview',
+        'tasks.taskcomment', 'tasks.taskprogress', 'tasks.tasktype',
+        'projects.project', 'projects.projectmember', 'users.user', 'users.role', 'users.department',
+    )
+    cache_project_param = 'project_id'
 
     def get_queryset(self):
-        user = self.request.user
         project_id = self.request.query_params.get('project_id')
         
-        queryset = self.queryset
+        queryset = self.with_related(self.queryset)
         if project_id:
             queryset = queryset.filter(project_id=project_id)
         
-        if user.role.name in ['SUPER_ADMIN', 'PROJECT_MANAGER']:
+        return self.filter_visible(queryset).order_by('board_order', 'id')
+
+    def filter_visible(self, queryset):
+        if get_request_role(self.request) in ['SUPER_ADMIN', 'PROJECT_MANAGER']:
             return queryset
         
         # Team members see tasks in projects they are part of
-        return queryset.filter(project__members__user=user)
+        return queryset.filter(project_id__in=get_accessible_project_ids(self.request.user.pk))
+
+    @staticmethod
+    def with_related(queryset):
+        """
+        Loads the full graph rendered by TaskSerializer in a fixed number of
+        queries: one for tasks (with project/task type joined and the latest
+        progress value computed by a subquery), plus one per nested collection.
+        """
+        latest_progress = TaskProgress.objects.filter(
+            task=OuterRef('pk')
+        ).order_by('-updated_at', '-id').values('progress_percentage')[:1]
+
+        return queryset.select_related('project', 'task_type').prefetch_related(
+            Prefetch(
+                'assignments',
+                queryset=TaskAssignment.objects.select_related('employee__role', 'employee__department')
+            ),
+            Prefetch(
+                'files',
+                queryset=TaskFile.objects.select_related('uploaded_by').prefetch_related(
+                    Prefetch('reviews', queryset=TaskReview.objects.select_related('reviewer'))
+                )
+            ),
+            Prefetch('comments', queryset=TaskComment.objects.select_related('user')),
+        ).annotate(
+            latest_progress_value=Coalesce(Subquery(latest_progress), Value(0))
+        )
 
     def perform_create(self, serializer):
-        task = serializer.save(created_by=self.request.user)
+        user = get_user_instance(self.request.user)
+        extra = {}
+        if 'board_order' not in serializer.initial_data:
+            # New cards go to the bottom of their column
+            extra['board_order'] = next_board_order(
+                serializer.validated_data['project'].pk,
+                serializer.validated_data.get('status', 'todo')
+            )
+        task = serializer.save(created_by=user, **extra)
         log_system_activity(
-            user=self.request.user,
+            user=user,
             project=task.project,
             task=task,
             action=f"Created task: {task.title}"
         )
 
-class TaskFileViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'])
+    def reorder(self, request):
+        """
+        Bulk Kanban reordering for one column of one project.
+        POST /api/v1/tasks/reorder/
+        {"status": "in_progress", "task_ids": [5, 3, 9]}  -> these first, then the rest of the column
+        {"status": "done", "task_id": 5, "before_id": 9}  -> move a single card
+        """
+        serializer = TaskReorderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        ids = data.get('task_ids') or [data['task_id']]
+        anchor_id = data.get('before_id') or data.get('after_id')
+        lookup = ids + ([anchor_id] if anchor_id else [])
+        tasks = self.filter_visible(Task.objects.filter(pk__in=lookup)).in_bulk()
+
+        missing = [pk for pk in lookup if pk not in tasks]
+        if missing:
+            return Response({'error': f'Unknown tasks: {missing}'}, status=status.HTTP_400_BAD_REQUEST)
+        if len({task.project_id for task in tasks.values()}) > 1:
+            return Response({'error': 'Tasks must belong to the same project'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if 'task_ids' in data:
+            updated = reorder_column([tasks[pk] for pk in ids], data['status'])
+        else:
+            anchor = tasks[anchor_id] if anchor_id else None
+            if anchor and anchor.status != data['status']:
+                return Response({'error': 'Neighbour must be in the target column'}, status=status.HTTP_400_BAD_REQUEST)
+            updated = move_task(
+                tasks[data['task_id']], data['status'],
+                before=anchor if data.get('before_id') else None,
+                after=anchor if data.get('after_id') else None,
+            )
+
+        return Response([
+            {'id': task.id, 'status': task.status, 'board_order': task.board_order} for task in updated
+        ])
+
+class TaskFileViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = TaskFile.objects.all()
     serializer_class = TaskFileSerializer
     permission_classes = [permissions.IsAuthenticated]
+    conditional_models = ('users.user',)
 
-class TaskCommentViewSet(viewsets.ModelViewSet):
+class TaskCommentViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = TaskComment.objects.all()
     serializer_class = TaskCommentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    conditional_models = ('users.user',)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user=get_user_instance(self.request.user))
 
-class TaskReviewViewSet(viewsets.ModelViewSet):
+class TaskReviewViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = TaskReview.objects.all()
     serializer_class = TaskReviewSerializer
     permission_classes = [IsProjectManager]
+    conditional_models = ('users.user',)
@@ -36,6 +36,9 @@ class User(AbstractUser, SoftDeleteModel):
         choices=[('active', 'Active'), ('inactive', 'Inactive')], 
         default='active'
     )
+    # Bumped whenever access-relevant fields change; tokens carrying an older
+    # version are rejected by the stateless JWT authentication
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         db_table = 'users'
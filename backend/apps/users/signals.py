@@ -0,0 +1,51 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from core.authentication import forget_user
+from core.cache import invalidate_on_change
+from core.models import soft_deleted
+from .models import Department, Role, User
+
+# Changing any of these revokes the user's outstanding tokens
+TOKEN_FIELDS = ('is_active', 'status', 'role_id', 'department_id', 'password')
+
+
+def bump_token_version(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk:
+        return
+    previous = User.all_objects.filter(pk=instance.pk).values(*TOKEN_FIELDS, 'token_version').first()
+    if previous and any(previous[field] != getattr(instance, field) for field in TOKEN_FIELDS):
+        instance.token_version = previous['token_version'] + 1
+
+
+def user_changed(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+def users_soft_deleted(sender, pks, **kwargs):
+    # Bulk soft deletes skip pre_save, so revoke outstanding tokens here
+    User.all_objects.filter(pk__in=pks).update(token_version=F('token_version') + 1)
+    for pk in pks:
+        forget_user(pk)
+
+
+def role_changed(sender, instance, created=False, **kwargs):
+    # Tokens carry the role name, so renaming a role revokes its users' tokens
+    if created:
+        return
+    users = User.all_objects.filter(role=instance)
+    pks = list(users.values_list('pk', flat=True))
+    users.update(token_version=F('token_version') + 1)
+    for pk in pks:
+        forget_user(pk)
+
+
+def connect():
+    pre_save.connect(bump_token_version, sender=User, dispatch_uid='token_version_user_save')
+    post_save.connect(user_changed, sender=User, dispatch_uid='forget_user_save')
+    post_delete.connect(user_changed, sender=User, dispatch_uid='forget_user_delete')
+    soft_deleted.connect(users_soft_deleted, sender=User, dispatch_uid='token_version_user_soft_delete')
+    post_save.connect(role_changed, sender=Role, dispatch_uid='token_version_role_save')
+    invalidate_on_change(User)
+    invalidate_on_change(Role)
+    invalidate_on_change(Department)
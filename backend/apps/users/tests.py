@@ -1,3 +1,92 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from core.authentication import user_records, user_versions
+from .models import Department, Role, User
+
+
+class RoleAwareAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin_role = Role.objects.create(name='SUPER_ADMIN')
+        self.user = User.objects.create_user(
+            username='admin', email='admin@example.com', password='secret', name='Admin',
+            role=self.admin_role, department=Department.objects.create(name='Development')
+        )
+
+    def login(self):
+        response = self.client.post('/api/login/', {'username': 'admin', 'password': 'secret'})
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return AccessToken(response.data['access'])
+
+    def test_token_carries_role_and_department(self):
+        token = self.login()
+
+        self.assertEqual(token['role'], 'SUPER_ADMIN')
+        self.assertEqual(token['department'], self.user.department_id)
+
+    def test_role_is_loaded_with_the_user(self):
+        self.login()
+
+        # The user (role and department joined), the ETag aggregate, the roles
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/v1/roles/')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(JWT_ROLE_CLAIMS=True)
+    def test_role_change_rejects_tokens_with_stale_claims(self):
+        self.login()
+        self.assertEqual(self.client.get('/api/v1/roles/').status_code, 200)
+
+        # A write that bypasses this process's signals, as another worker's would
+        User.objects.filter(pk=self.user.pk).update(role=Role.objects.create(name='TEAM_MEMBER'))
+
+        self.assertEqual(self.client.get('/api/v1/roles/').status_code, 401)
+
+
+@override_settings(JWT_STATELESS_USER=True)
+class StatelessAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_versions.clear()
+        user_records.clear()
+        self.user = User.objects.create_user(
+            username='admin', email='admin@example.com', password='secret', name='Admin',
+            role=Role.objects.create(name='SUPER_ADMIN')
+        )
+        response = self.client.post('/api/login/', {'username': 'admin', 'password': 'secret'})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def test_repeat_requests_skip_the_user_query(self):
+        self.client.get('/api/v1/roles/')
+
+        # Only the ETag aggregate and the roles: the user comes from the token
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/roles/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_views_needing_the_orm_user_still_work(self):
+        response = self.client.get('/api/v1/users/me/')
+
+        self.assertEqual(response.data['email'], 'admin@example.com')
+        self.assertEqual(response.data['role_name'], 'SUPER_ADMIN')
+
+    def test_deactivation_revokes_outstanding_tokens(self):
+        self.assertEqual(self.client.get('/api/v1/roles/').status_code, 200)
+
+        self.user.status = 'inactive'
+        self.user.save()
+
+        self.assertEqual(self.client.get('/api/v1/roles/').status_code, 401)
+
+    def test_role_rename_revokes_outstanding_tokens(self):
+        self.assertEqual(self.client.get('/api/v1/roles/').status_code, 200)
+
+        role = self.user.role
+        role.name = 'PROJECT_MANAGER'
+        role.save()
+
+        self.assertEqual(self.client.get('/api/v1/roles/').status_code, 401)
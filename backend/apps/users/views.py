@@ -6,6 +6,8 @@ from .serializers import (
     UserSerializer, UserCreateUpdateSerializer, 
     RoleSerializer, DepartmentSerializer
 )
+from core.authentication import get_user_instance
+from core.mixins import ConditionalGetMixin, SparseFieldsMixin
 from core.permissions import IsSuperAdmin
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -25,19 +27,20 @@ class CurrentUserView(APIView):
             "email": user.email,
             "role": getattr(user, "role", None),
         })
-class RoleViewSet(viewsets.ModelViewSet):
+class RoleViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
     permission_classes = [IsSuperAdmin]
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
     permission_classes = [IsSuperAdmin]
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     permission_classes = [IsSuperAdmin]
+    conditional_models = ('users.role', 'users.department')
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
@@ -62,5 +65,5 @@ class UserViewSet(viewsets.ModelViewSet):
         Endpoint to retrieve the current logged-in user's profile.
         GET /api/v1/users/me/
         """
-        serializer = UserSerializer(request.user)
+        serializer = UserSerializer(get_user_instance(request.user))
         return Response(serializer.data)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -49,20 +50,75 @@ INSTALLED_APPS = [
     'apps.reports',
     'apps.activity',
     'apps.seo',
+    'apps.archive',
+    'apps.search',
+    'core',
 ]
 from datetime import timedelta
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.RoleAwareJWTAuthentication',
+    ),
+    # orjson-backed JSON; both fall back to DRF's stdlib path without orjson
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
 }
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    'TOKEN_OBTAIN_SERIALIZER': 'core.tokens.RoleTokenObtainPairSerializer',
+}
+
+# Trust the role claim embedded in access tokens (checked against the role
+# loaded with the user) instead of reading request.user.role
+JWT_ROLE_CLAIMS = False
+
+# Stateless token-user mode: build request.user from the access token and
+# skip the per-request user query. Revocations (token_version bumps)
+# propagate to other processes within JWT_USER_VERSION_TTL.
+JWT_STATELESS_USER = False
+JWT_USER_VERSION_TTL = 5  # seconds
+JWT_USER_RECORD_TTL = 60  # seconds
+
+# Buffered audit log writes (apps.activity.buffer)
+ACTIVITY_LOG_BUFFER = {
+    'ENABLED': True,
+    'BATCH_SIZE': 100,
+    'MAX_PENDING': 10000,
+}
+# Per-process cache, plus a
+# filesystem cache shared by all workers on the host (core.cache)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Two-tier tagged response cache (core.cache.ResponseCache)
+RESPONSE_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'shared',
+    'TIMEOUT': 300,  # seconds, shared tier
+    'L1_SIZE': 512,
+    'L1_TTL': 30,  # seconds
 }
 MIDDLEWARE = [
+    # Compresses responses for clients sending Accept-Encoding: gzip
+    'django.middleware.gzip.GZipMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -71,6 +127,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Last, so it is the middleware that calls the view
+    'core.middleware.ReplicaRoutingMiddleware',
 ]
 CORS_ALLOW_ALL_ORIGINS = True
 ROOT_URLCONF = 'config.urls'
@@ -96,12 +154,72 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
+# Pick a profile with DJANGO_DATABASE_PROFILE. 'production' keeps
+# connections open across requests and runs SQLite in WAL mode, so reads
+# proceed alongside the single writer and commits skip a full fsync.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # ms to wait for the write lock
+    'mmap_size': 256 * 1024 * 1024,  # bytes
+    'cache_size': -64000,  # KiB per connection
+    'temp_store': 'MEMORY',
+}
+
+DATABASE_PROFILES = {
+    'development': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    },
+    'production': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,  # seconds
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            # Take the write lock at BEGIN so concurrent writers queue on
+            # busy_timeout instead of failing to upgrade a read lock
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+}
+
+DATABASE_PROFILE = os.environ.get('DJANGO_DATABASE_PROFILE', 'development')
+
+DATABASES = {
+    'default': DATABASE_PROFILES[DATABASE_PROFILE],
+}
+
+# Read-only copy of the primary kept current by external replication
+# (e.g. Litestream or LiteFS), set with DJANGO_REPLICA_DATABASE. The
+# replication tool owns its journal, so connections only tune reads and
+# refuse writes.
+REPLICA_DATABASE = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'CONN_MAX_AGE': DATABASES['default'].get('CONN_MAX_AGE', 0),
+    'OPTIONS': {
+        'init_command': ';'.join(
+            f'PRAGMA {name}={value}' for name, value in {
+                'query_only': 'ON',
+                **{name: SQLITE_PRAGMAS[name] for name in ('busy_timeout', 'mmap_size', 'cache_size', 'temp_store')},
+            }.items()
+        ),
+    },
 }
+if os.environ.get('DJANGO_REPLICA_DATABASE'):
+    DATABASES['replica'] = {**REPLICA_DATABASE, 'NAME': os.environ['DJANGO_REPLICA_DATABASE']}
+
+# Safe-method requests to views with `use_replica = True` read from one of
+# these aliases (core.routers, core.middleware.ReplicaRoutingMiddleware)
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+# Users who wrote within this window read from the primary; the pin is
+# kept in this cache so every worker sees it
+REPLICA_PIN_CACHE = 'shared'
+REPLICA_PIN_SECONDS = 5
+# A replica that failed is skipped for this long
+REPLICA_RETRY_SECONDS = 30
 
 
 # Password validation
@@ -0,0 +1,12 @@
+"""
+Settings for `manage.py test`: the project settings plus a replica
+alias for the read-routing tests (core.tests.ReplicaRoutingTests).
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASES, REPLICA_DATABASE
+
+# A separate, empty test database; without query_only so the runner can
+# migrate it. Only tests that override DATABASE_REPLICAS read from it.
+DATABASES['replica'] = {**REPLICA_DATABASE, 'NAME': BASE_DIR / 'replica.sqlite3', 'OPTIONS': {}}
+DATABASE_REPLICAS = []
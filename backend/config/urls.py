@@ -10,6 +10,7 @@ from apps.tasks.views import (
 )
 from apps.activity.views import ActivityLogViewSet
 from apps.reports.views import DashboardStatsView
+from apps.search.views import SearchView
 from apps.seo.views import (
     SEOTaskViewSet, SEOOnPageViewSet, SEOOffPageViewSet,
     SEOTechnicalViewSet, SEOKeywordsViewSet, GMBProfileViewSet,
@@ -64,5 +65,6 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/', include(router.urls)),
     path('api/v1/dashboard/stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
+    path('api/v1/search/', SearchView.as_view(), name='search'),
     path('api/v1/auth/', include('rest_framework.urls')), 
 ]
@@ -0,0 +1,152 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.lru import LRUCache
+from core.roles import ROLE_CLAIM
+from core.tokens import VERSION_CLAIM
+
+
+# Keys are str(user id): simplejwt serializes the user id claim as a string.
+
+# user id -> (token_version, is_active); short TTL bounds how long a revoked
+# token keeps working in processes that did not see the change
+user_versions = LRUCache(maxsize=10000, ttl=getattr(settings, 'JWT_USER_VERSION_TTL', 5))
+
+# user id -> User with role and department joined, for views that need the ORM object
+user_records = LRUCache(maxsize=1000, ttl=getattr(settings, 'JWT_USER_RECORD_TTL', 60))
+
+
+def forget_user(user_id):
+    user_versions.delete(str(user_id))
+    user_records.delete(str(user_id))
+
+
+class TokenRole:
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+
+class AuthTokenUser(TokenUser):
+    """
+    Request user built from the access token claims. Attributes that are
+    not carried by the token fall through to the ORM user, loaded once
+    through the `user_records` LRU.
+    """
+
+    @cached_property
+    def role(self):
+        name = self.token.get(ROLE_CLAIM)
+        return TokenRole(name) if name else None
+
+    @cached_property
+    def department_id(self):
+        return self.token.get('department')
+
+    @cached_property
+    def status(self):
+        return self.token.get('status')
+
+    @property
+    def instance(self):
+        user = user_records.get(str(self.id))
+        if user is None:
+            user = get_user_model().objects.select_related('role', 'department').get(pk=self.id)
+            user_records.set(str(self.id), user)
+        return user
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name == 'token':
+            raise AttributeError(name)
+        return getattr(self.instance, name)
+
+
+def get_user_instance(user):
+    """
+    ORM User behind request.user, whichever authentication mode produced it.
+    """
+    return user.instance if isinstance(user, AuthTokenUser) else user
+
+
+class RoleAwareJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that loads the user with role and department joined
+    in a single query, so later `request.user.role` accesses are free.
+
+    With JWT_ROLE_CLAIMS enabled, the role claim of the token is checked
+    against the role loaded with the user and the token is rejected once
+    the role has changed.
+
+    With JWT_STATELESS_USER enabled, request.user is instead built from the
+    token claims (see AuthTokenUser) and the only state consulted is the
+    user's token version, cached in-process for JWT_USER_VERSION_TTL
+    seconds. Saving a user with changed access fields bumps the version,
+    so its outstanding tokens stop working.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        if getattr(settings, 'JWT_STATELESS_USER', False):
+            return self.get_token_user(user_id, validated_token)
+
+        user = self.get_orm_user(user_id, validated_token)
+        self.verify_role_claim(user, validated_token)
+        return user
+
+    def get_orm_user(self, user_id, validated_token):
+        """The checks of simplejwt's get_user, on a query that joins role and department."""
+        try:
+            user = self.user_model.objects.select_related('role', 'department').get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+    def get_token_user(self, user_id, validated_token):
+        state = user_versions.get(str(user_id))
+        if state is None:
+            state = self.user_model.objects.filter(pk=user_id).values_list(
+                'token_version', 'is_active'
+            ).first()
+            if state is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user_versions.set(str(user_id), state)
+
+        token_version, is_active = state
+        if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if validated_token.get(VERSION_CLAIM) != token_version:
+            raise AuthenticationFailed(_("Token has been revoked."), code="token_revoked")
+
+        return AuthTokenUser(validated_token)
+
+    def verify_role_claim(self, user, validated_token):
+        if not getattr(settings, 'JWT_ROLE_CLAIMS', False) or ROLE_CLAIM not in validated_token:
+            return
+        # Compared with the role just loaded, never a cached copy, so a
+        # demotion takes effect in every process on the next request
+        role_name = user.role.name if user.role_id else None
+        if validated_token[ROLE_CLAIM] != role_name:
+            raise AuthenticationFailed(_("The user's role has changed."), code="role_changed")
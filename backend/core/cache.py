@@ -0,0 +1,179 @@
+import hashlib
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import pre_save
+
+from core.lru import LRUCache
+from core.models import on_rows_changed, path_values
+from core.routers import use_primary
+
+DEFAULTS = {
+    'ENABLED': True,
+    'ALIAS': 'shared',
+    'TIMEOUT': 300,  # seconds, shared tier
+    'L1_SIZE': 512,
+    'L1_TTL': 30,  # seconds
+}
+
+
+def model_tag(label, project_id=None):
+    """Tag for every row of a model, or only the rows of one project."""
+    return f'{label}:project:{project_id}' if project_id is not None else label
+
+
+class ResponseCache:
+    """
+    Two-tier cache for rendered list data. Tier one is a bounded
+    in-process LRU; tier two is a shared Django cache backend. Entries are
+    filed under tags and keyed by the current version of each tag, so
+    bumping a tag (see invalidate) orphans every entry carrying it in both
+    tiers at once. Tag versions live in the shared tier so all processes
+    see them.
+    """
+
+    def __init__(self, enabled=True, alias='shared', timeout=300, l1_size=512, l1_ttl=30):
+        self.enabled = enabled
+        self.alias = alias
+        self.timeout = timeout
+        self.local = LRUCache(maxsize=l1_size, ttl=l1_ttl, on_evict=self._evicted)
+        self._lock = threading.Lock()
+        self._counters = defaultdict(Counter)
+
+    @classmethod
+    def from_settings(cls):
+        options = {**DEFAULTS, **getattr(settings, 'RESPONSE_CACHE', {})}
+        return cls(
+            enabled=options['ENABLED'],
+            alias=options['ALIAS'],
+            timeout=options['TIMEOUT'],
+            l1_size=options['L1_SIZE'],
+            l1_ttl=options['L1_TTL'],
+        )
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _count(self, tags, counter):
+        with self._lock:
+            for tag in tags:
+                self._counters[tag][counter] += 1
+
+    def _evicted(self, key, value):
+        self._count(value[0], 'evictions')
+
+    def tag_versions(self, tags):
+        """Current version of each tag, as a string that changes whenever one is bumped."""
+        tags = sorted(set(tags))
+        stored = self.shared.get_many([f'tag:{tag}' for tag in tags])
+        missing = {f'tag:{tag}' for tag in tags} - stored.keys()
+        for tag_key in missing:
+            # Seed from the clock so a lost version never revives old entries
+            self.shared.add(tag_key, time.time_ns(), None)
+        if missing:
+            stored.update(self.shared.get_many(list(missing)))
+        return ','.join(f'{tag}={stored.get(f"tag:{tag}")}' for tag in tags)
+
+    def _versioned_key(self, key, tags):
+        versions = self.tag_versions(tags)
+        return 'response:' + hashlib.md5(f'{key}|{versions}'.encode()).hexdigest()
+
+    def get_or_set(self, key, tags, compute):
+        """
+        Returns the cached value for `key` under `tags`, calling `compute()`
+        and storing its result in both tiers on a miss.
+        """
+        if not self.enabled:
+            return compute()
+        tags = sorted(set(tags))
+        versioned = self._versioned_key(key, tags)
+
+        entry = self.local.get(versioned)
+        if entry is None:
+            entry = self.shared.get(versioned)
+            if entry is not None:
+                self.local.set(versioned, entry)
+        if entry is not None:
+            self._count(tags, 'hits')
+            return entry[1]
+
+        self._count(tags, 'misses')
+        # Entries outlive replica lag, so they are built from the primary
+        with use_primary():
+            value = compute()
+        entry = (tags, value)
+        self.local.set(versioned, entry)
+        self.shared.set(versioned, entry, self.timeout)
+        return value
+
+    def invalidate(self, *tags):
+        for tag in set(tags):
+            try:
+                self.shared.incr(f'tag:{tag}')
+            except ValueError:
+                self.shared.add(f'tag:{tag}', time.time_ns(), None)
+        self._count(set(tags), 'invalidations')
+
+    def counters(self):
+        """Per-tag hits, misses, evictions and invalidations seen by this process."""
+        with self._lock:
+            return {tag: dict(counts) for tag, counts in sorted(self._counters.items())}
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+        with self._lock:
+            self._counters.clear()
+
+
+response_cache = ResponseCache.from_settings()
+
+
+# Labels of models whose tags are also kept per project (see invalidate_on_change)
+PROJECT_SCOPED = set()
+
+
+def invalidate_on_change(model, project_path=None):
+    """
+    Bumps the model's tag, and with `project_path` (the lookup from the
+    model to its project id, or 'pk' for Project itself) the per-project
+    tags of the affected rows, after every write to `model`. A save also
+    bumps the project the row was stored under, read before the write, so
+    a row moved between projects leaves neither list stale. Tags are
+    bumped immediately and again on commit, so a reader racing the
+    transaction cannot pin pre-commit data under the new version.
+    """
+    label = model._meta.label_lower
+    if project_path:
+        PROJECT_SCOPED.add(label)
+
+    def changed(instance=None, pks=None):
+        tags = [model_tag(label)]
+        if project_path:
+            project_ids = set(path_values(model, project_path, instance, pks))
+            if instance is not None:
+                # A row moved to another project leaves the old one stale too
+                project_ids.update(instance.__dict__.pop('_cached_project_ids', ()))
+            tags += [model_tag(label, project_id) for project_id in project_ids if project_id is not None]
+        response_cache.invalidate(*tags)
+        transaction.on_commit(lambda: response_cache.invalidate(*tags))
+
+    def remember_projects(sender, instance, raw=False, **kwargs):
+        if not raw and instance.pk is not None:
+            instance._cached_project_ids = path_values(model, project_path, pks=[instance.pk])
+
+    if project_path and project_path != 'pk':
+        pre_save.connect(remember_projects, sender=model, weak=False, dispatch_uid=f'response_cache_{label}')
+    on_rows_changed(model, changed, f'response_cache_{label}')
+
+
+def tags_for(labels, project_id=None):
+    """Tags a response built from `labels` depends on, optionally for one project."""
+    return [
+        model_tag(label, project_id if label in PROJECT_SCOPED else None) for label in labels
+    ]
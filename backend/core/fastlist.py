@@ -0,0 +1,145 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.settings import ISO_8601, api_settings
+
+# Readable fields whose to_representation() only needs the raw column value
+COLUMN_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.FloatField,
+    serializers.DecimalField, serializers.BooleanField, serializers.DateTimeField,
+    serializers.DateField, serializers.TimeField, serializers.DurationField,
+    serializers.ChoiceField, serializers.UUIDField, serializers.JSONField,
+    serializers.ReadOnlyField, serializers.PrimaryKeyRelatedField,
+)
+UNSUPPORTED_FIELDS = (serializers.MultipleChoiceField, serializers.FilePathField)
+
+
+def column_path(model, attrs):
+    """
+    values() lookup for a serializer source on `model`, the model it
+    points to (None for plain columns) and the lookups of the nullable
+    relations crossed on the way; None when the source is not a chain of
+    forward relations ending in a concrete column.
+    """
+    opts = model._meta
+    parts = []
+    nullable = []
+    field = None
+    for attr in attrs:
+        if field is not None:
+            if not field.is_relation:
+                return None
+            if field.null:
+                nullable.append('__'.join(parts))
+            opts = field.related_model._meta
+        try:
+            field = opts.pk if attr == 'pk' else opts.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.many_to_many:
+            return None
+        parts.append(field.name)
+    return '__'.join(parts), field.related_model if field.is_relation else None, nullable
+
+
+def datetime_transform(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or tz is None:
+        return field.to_representation
+
+    def transform(value):
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return transform
+
+
+def field_transform(field):
+    """Function turning a non-null column value into the field's output."""
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return field.pk_field.to_representation if field.pk_field else None
+    if isinstance(field, serializers.ReadOnlyField):
+        return None
+    if isinstance(field, serializers.DateTimeField):
+        return datetime_transform(field)
+    if type(field).to_representation is serializers.CharField.to_representation:
+        return str
+    if type(field) is serializers.IntegerField:
+        return int
+    return field.to_representation
+
+
+class ValuesPlan:
+    """
+    Renders rows of queryset.values(*columns) the way `serializer` renders
+    model instances. Build one with ValuesPlan.compile(), which returns None
+    for serializers whose output depends on more than plain columns.
+    """
+
+    def __init__(self, columns, entries):
+        self.columns = columns
+        self.entries = entries
+
+    @classmethod
+    def compile(cls, serializer, model):
+        columns = []
+        entries = cls.compile_entries(serializer, model, '', columns)
+        return cls(columns, entries) if entries is not None else None
+
+    @classmethod
+    def compile_entries(cls, serializer, model, prefix, columns):
+        # Custom representations cannot be reproduced from the columns
+        if type(serializer).to_representation is not serializers.Serializer.to_representation:
+            return None
+        entries = []
+        for field in serializer._readable_fields:
+            if field.source == '*':
+                return None
+            resolved = column_path(model, field.source_attrs)
+            if resolved is None:
+                return None
+            path, target, nullable = resolved
+            column = prefix + path
+            guards = [prefix + lookup for lookup in nullable]
+            # A null relation mid-source makes DRF fall back to the field's
+            # default, None or skipping it; defaults are not reproduced
+            if guards and (field.default is not empty or not (field.allow_null or not field.required)):
+                return None
+            for lookup in (column, *guards):
+                if lookup not in columns:
+                    columns.append(lookup)
+
+            if isinstance(field, serializers.BaseSerializer):
+                if isinstance(field, serializers.ListSerializer) or target is None:
+                    return None
+                transform = cls.compile_entries(field, target, f'{column}__', columns)
+                if transform is None:
+                    return None
+            elif isinstance(field, COLUMN_FIELDS) and not isinstance(field, UNSUPPORTED_FIELDS):
+                transform = field_transform(field)
+            else:
+                return None
+            entries.append((field.field_name, column, transform, guards, not field.allow_null))
+        return entries
+
+    def render_row(self, row, entries):
+        data = {}
+        for name, column, transform, guards, skip in entries:
+            if guards and any(row[guard] is None for guard in guards):
+                if not skip:
+                    data[name] = None
+                continue
+            value = row[column]
+            if value is None:
+                data[name] = None
+            elif transform is None:
+                data[name] = value
+            elif isinstance(transform, list):
+                data[name] = self.render_row(row, transform)
+            else:
+                data[name] = transform(value)
+        return data
+
+    def render(self, rows):
+        entries = self.entries
+        return [self.render_row(row, entries) for row in rows]
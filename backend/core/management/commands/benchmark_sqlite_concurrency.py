@@ -0,0 +1,173 @@
+import multiprocessing
+import random
+import statistics
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.utils import timezone
+
+from apps.activity.models import ActivityLog
+from apps.projects.models import Client, Project
+from apps.tasks.models import Task, TaskType
+from apps.users.models import Department, Role, User
+
+ALIAS = 'benchmark'
+PROJECTS = 20
+TASKS = 5000
+BOARD_FIELDS = ('id', 'title', 'status', 'board_order', 'updated_at')
+
+
+def register_database(settings_dict):
+    # configure_settings() fills in the defaults Django expects on an alias
+    configured = connections.configure_settings({'default': settings_dict})
+    connections.settings[ALIAS] = configured['default']
+    # Drop a wrapper left over from the previous profile
+    if hasattr(connections._connections, ALIAS):
+        connections[ALIAS].close()
+        del connections[ALIAS]
+
+
+def serve_requests(settings_dict, duration, write_ratio, seed, results):
+    """
+    One worker process: a request loop that reads a project's board or
+    edits a task and logs the change, with Django's per-request
+    connection handling around each request. Writes go through
+    queryset update() and bulk_create() like the board and the activity
+    log buffer do; model signals are not sent, since their receivers
+    read through the default alias.
+    """
+    register_database(settings_dict)
+    connection = connections[ALIAS]
+    tasks = Task.objects.using(ALIAS)
+    rng = random.Random(seed)
+    stats = {'reads': [], 'writes': [], 'errors': 0}
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        connection.close_if_unusable_or_obsolete()  # request_started
+        project_id = rng.randrange(PROJECTS) + 1
+        write = rng.random() < write_ratio
+        started = time.perf_counter()
+        try:
+            if write:
+                # Fixture tasks are dealt round-robin over the projects
+                task_id = rng.randrange(TASKS // PROJECTS) * PROJECTS + project_id
+                with transaction.atomic(using=ALIAS):
+                    tasks.filter(pk=task_id).update(
+                        status=rng.choice(('todo', 'in_progress', 'done')), updated_at=timezone.now()
+                    )
+                    ActivityLog.objects.using(ALIAS).bulk_create([ActivityLog(
+                        user_id=1, project_id=project_id, task_id=task_id, action=f'Updated task {task_id}'
+                    )])
+            else:
+                list(tasks.filter(project_id=project_id).order_by('board_order', 'id').values(*BOARD_FIELDS)[:50])
+        except OperationalError:
+            stats['errors'] += 1
+        else:
+            stats['writes' if write else 'reads'].append(time.perf_counter() - started)
+        connection.close_if_unusable_or_obsolete()  # request_finished
+    connections.close_all()
+    results.put(stats)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs a mixed read/write request loop over the task board and activity "
+        "log in N worker processes against a migrated scratch SQLite file for "
+        "each DATABASE_PROFILES entry and reports throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=5.0, help="Seconds per profile")
+        parser.add_argument('--write-ratio', type=float, default=0.2)
+        parser.add_argument('--profiles', nargs='+', default=list(settings.DATABASE_PROFILES))
+
+    def handle(self, *args, **options):
+        unknown = set(options['profiles']) - settings.DATABASE_PROFILES.keys()
+        if unknown:
+            raise CommandError(f"Unknown profiles: {', '.join(sorted(unknown))}")
+
+        self.stdout.write(
+            f"{options['workers']} workers, {options['duration']:g}s each, "
+            f"{options['write_ratio']:.0%} writes"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for name in options['profiles']:
+                settings_dict = {**settings.DATABASE_PROFILES[name], 'NAME': Path(directory) / f'{name}.sqlite3'}
+                self.create_database(settings_dict)
+                self.report(name, self.run_workers(settings_dict, options))
+
+    def create_database(self, settings_dict):
+        register_database(settings_dict)
+        call_command('migrate', database=ALIAS, verbosity=0)
+        with transaction.atomic(using=ALIAS):
+            self.create_fixtures()
+        # Workers are forked; none may inherit an open connection
+        connections.close_all()
+
+    def create_fixtures(self):
+        # bulk_create keeps model signals, and their default-alias reads, out of it
+        department, = Department.objects.using(ALIAS).bulk_create([Department(name='Benchmark')])
+        role, = Role.objects.using(ALIAS).bulk_create([Role(name='BENCHMARK')])
+        user, = User.objects.using(ALIAS).bulk_create([User(
+            username='benchmark', email='benchmark@example.com', password='!', name='Benchmark',
+            role=role, department=department
+        )])
+        client, = Client.objects.using(ALIAS).bulk_create([Client(
+            name='Bench', email='bench@example.com', phone='0', company_name='Bench Ltd', address='-'
+        )])
+        projects = Project.objects.using(ALIAS).bulk_create([
+            Project(
+                name=f'Project {i}', client=client, department=department, project_manager=user,
+                created_by=user, start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+            )
+            for i in range(PROJECTS)
+        ])
+        task_type, = TaskType.objects.using(ALIAS).bulk_create([TaskType(name='Benchmark')])
+        Task.objects.using(ALIAS).bulk_create([
+            Task(
+                project=projects[i % PROJECTS], title=f'Task {i + 1}', description='', task_type=task_type,
+                priority='medium', due_date=date(2024, 6, 1), created_by=user, board_order=i
+            )
+            for i in range(TASKS)
+        ], batch_size=500)
+
+    def run_workers(self, settings_dict, options):
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        workers = [
+            context.Process(
+                target=serve_requests,
+                args=(settings_dict, options['duration'], options['write_ratio'], seed, results),
+            )
+            for seed in range(options['workers'])
+        ]
+        for worker in workers:
+            worker.start()
+        stats = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        return {
+            'reads': [t for s in stats for t in s['reads']],
+            'writes': [t for s in stats for t in s['writes']],
+            'errors': sum(s['errors'] for s in stats),
+            'duration': options['duration'],
+        }
+
+    def report(self, name, stats):
+        def summary(timings):
+            if not timings:
+                return f"{0:>8.0f}/s  p95 {'-':>8}"
+            p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+            return f"{len(timings) / stats['duration']:>8.0f}/s  p95 {p95 * 1000:6.1f}ms"
+
+        self.stdout.write(
+            f"{name:>12}: reads {summary(stats['reads'])}  writes {summary(stats['writes'])}  "
+            f"lock errors {stats['errors']}"
+        )
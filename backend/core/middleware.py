@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import caches
+from django.db import DatabaseError
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from core.routers import choose_replica, mark_unhealthy, read_from
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def pin_key(user_id):
+    return f'replica_pin:{user_id}'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Runs safe-method requests to views with `use_replica = True` against a
+    read replica (settings.DATABASE_REPLICAS). A successful write by a
+    signed-in user pins that user to the primary for REPLICA_PIN_SECONDS
+    through a key in the shared cache, so they read their own writes from
+    every worker and client while replicas catch up. A view that fails
+    with a database error on a replica is retried once on the primary.
+    Keep this last in MIDDLEWARE so it is the one that calls the view.
+    """
+    jwt = JWTAuthentication()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @property
+    def pins(self):
+        return caches[settings.REPLICA_PIN_CACHE]
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            # DRF stores the user it authenticated on the underlying request
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                self.pins.set(pin_key(user.pk), True, settings.REPLICA_PIN_SECONDS)
+        return response
+
+    def caller_id(self, request):
+        """
+        Id of the user behind the bearer token or the session, read before
+        DRF authenticates the request and without loading the user.
+        """
+        header = self.jwt.get_header(request)
+        raw_token = self.jwt.get_raw_token(header) if header is not None else None
+        if raw_token is not None:
+            try:
+                return self.jwt.get_validated_token(raw_token).get(api_settings.USER_ID_CLAIM)
+            except InvalidToken:
+                return None
+        session = getattr(request, 'session', None)
+        return session.get(SESSION_KEY) if session is not None else None
+
+    def is_pinned(self, request):
+        user_id = self.caller_id(request)
+        return user_id is not None and self.pins.get(pin_key(user_id)) is not None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if (
+            not settings.DATABASE_REPLICAS
+            or request.method not in SAFE_METHODS
+            or not getattr(view_class, 'use_replica', False)
+            or self.is_pinned(request)
+        ):
+            return None
+        alias = choose_replica()
+        if alias is None:
+            return None
+        try:
+            with read_from(alias):
+                return view_func(request, *view_args, **view_kwargs)
+        except DatabaseError:
+            mark_unhealthy(alias)
+            # Django calls the view again, now reading from the primary
+            return None
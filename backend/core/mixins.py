@@ -0,0 +1,309 @@
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Count, Max, Prefetch
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from core.cache import response_cache, tags_for
+from core.fastlist import ValuesPlan
+from core.roles import get_request_role
+
+
+def parse_names(value):
+    return {name.strip() for name in value.split(',') if name.strip()} if value is not None else None
+
+
+def select_related_paths(tree, prefix=''):
+    for name, children in tree.items():
+        path = f'{prefix}{name}'
+        yield path
+        yield from select_related_paths(children, f'{path}__')
+
+
+def prefetch_root(lookup):
+    path = lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+    return path.split('__')[0]
+
+
+class SparseFieldsMixin:
+    """
+    `?fields=id,title` limits a read to the named serializer fields and
+    `?expand=files` opts into nested collections: when either is given,
+    nested serializers are left out unless requested. The queryset is
+    narrowed to match: unused select_related/prefetch_related lookups are
+    dropped and only() loads the columns the remaining fields read.
+
+    Serializer method fields declare what they read in
+    `Meta.field_sources = {'name': ('attribute_or_lookup', ...)}`; an
+    undeclared one disables the queryset narrowing.
+    """
+
+    def get_requested_fields(self):
+        """Names of the top-level fields to render, or None for all of them."""
+        if not hasattr(self, '_requested_fields'):
+            self._requested_fields = self.parse_requested_fields()
+        return self._requested_fields
+
+    def parse_requested_fields(self):
+        if self.request is None or self.request.method not in ('GET', 'HEAD'):
+            return None
+        fields = parse_names(self.request.query_params.get('fields'))
+        expand = parse_names(self.request.query_params.get('expand'))
+        if fields is None and expand is None:
+            return None
+
+        available = self.get_serializer_class()().fields
+        unknown = (fields or set()) | (expand or set())
+        unknown -= available.keys()
+        if unknown:
+            raise ValidationError({'fields': f"Unknown fields: {', '.join(sorted(unknown))}"})
+
+        if fields is None:
+            fields = {
+                name for name, field in available.items()
+                if not isinstance(field, serializers.BaseSerializer)
+            }
+        return fields | (expand or set())
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = self.get_requested_fields()
+        if requested is not None:
+            fields = getattr(serializer, 'child', serializer).fields
+            for name in list(fields):
+                if name not in requested:
+                    fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        requested = self.get_requested_fields()
+        if requested is None:
+            return queryset
+        return self.narrow_queryset(queryset, requested)
+
+    def field_paths(self, requested):
+        """
+        ORM paths read by the requested fields, or None when some field's
+        dependencies are unknown.
+        """
+        serializer_class = self.get_serializer_class()
+        declared = getattr(getattr(serializer_class, 'Meta', None), 'field_sources', {})
+        available = serializer_class().fields
+        paths = set()
+        for name in requested:
+            field = available[name]
+            if name in declared:
+                paths.update(declared[name])
+            elif isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+                return None
+            else:
+                paths.add(field.source.replace('.', '__'))
+        return paths
+
+    def narrow_queryset(self, queryset, requested):
+        paths = self.field_paths(requested)
+        if paths is None:
+            return queryset
+        opts = queryset.model._meta
+        roots = {path.split('__')[0] for path in paths}
+
+        # Drop joins and prefetches no requested field reads
+        if isinstance(queryset.query.select_related, dict):
+            joins = [
+                path for path in select_related_paths(queryset.query.select_related)
+                if path.split('__')[0] in roots
+            ]
+            queryset = queryset.select_related(None).select_related(*joins)
+        lookups = [
+            lookup for lookup in queryset._prefetch_related_lookups if prefetch_root(lookup) in roots
+        ]
+        queryset = queryset.prefetch_related(None).prefetch_related(*lookups)
+
+        # Project the concrete columns; reverse relations only need the pk
+        columns = {opts.pk.name}
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        columns.update(name.lstrip('-') for name in ordering)
+        for root in roots:
+            try:
+                field = opts.get_field(root)
+            except FieldDoesNotExist:
+                # Annotations and prefetch to_attr targets are not columns
+                if root in queryset.query.annotations or any(
+                    isinstance(lookup, Prefetch) and lookup.to_attr == root for lookup in lookups
+                ):
+                    continue
+                return queryset
+            if field.concrete and not field.many_to_many:
+                columns.add(root)
+        return queryset.only(*columns)
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for list and retrieve. Validators come
+    from one aggregate query (MAX(`conditional_field`) and COUNT over the
+    caller's filtered queryset) or, for a single object, its own
+    timestamp, so a matching request is answered with 304 before any
+    serializer runs. Nested children keep the parent's timestamp current
+    through core.models.touch_parents.
+
+    Related rows the serializer renders (a task's project name, a log
+    entry's user) do not move those timestamps, so the validators also
+    carry the response_cache versions of `conditional_models` (model
+    labels, defaulting to CachedListMixin's `cache_models`). Such views
+    revalidate on the ETag only.
+    """
+    conditional_field = None
+    conditional_models = None
+
+    def get_conditional_field(self):
+        if self.conditional_field:
+            return self.conditional_field
+        model = (self.queryset if self.queryset is not None else self.get_queryset()).model
+        names = {field.name for field in model._meta.concrete_fields}
+        return next((name for name in ('updated_at', 'created_at') if name in names), None)
+
+    def get_conditional_tags(self):
+        if self.conditional_models is not None:
+            return tags_for(self.conditional_models)
+        if getattr(self, 'cache_models', None):
+            return self.get_cache_tags()
+        return []
+
+    def make_etag(self, *parts):
+        request = self.request
+        key = '|'.join(str(part) for part in (
+            request.get_full_path(),
+            getattr(request.accepted_renderer, 'format', ''),
+            request.user.pk,
+            get_request_role(request),
+            response_cache.tag_versions(self.get_conditional_tags()),
+            *parts,
+        ))
+        return f'"{hashlib.md5(key.encode()).hexdigest()}"'
+
+    def with_validators(self, response, etag, last_modified):
+        if last_modified is not None and not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        if not response.has_header('ETag'):
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        field = self.get_conditional_field()
+        if field is None:
+            return super().list(request, *args, **kwargs)
+
+        stats = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            last_modified=Max(field), count=Count('pk')
+        )
+        etag = self.make_etag(stats['last_modified'] and stats['last_modified'].isoformat(), stats['count'])
+        # Deletions do not move MAX(updated_at), so lists revalidate on the ETag only
+        not_modified = get_conditional_response(request._request, etag=etag)
+        if not_modified is not None:
+            return self.with_validators(not_modified, etag, stats['last_modified'])
+        return self.with_validators(super().list(request, *args, **kwargs), etag, stats['last_modified'])
+
+    def retrieve(self, request, *args, **kwargs):
+        field = self.get_conditional_field()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        last_modified = None
+        if field is not None:
+            try:
+                last_modified = self.filter_queryset(self.get_queryset()).filter(
+                    **{self.lookup_field: kwargs[lookup_url_kwarg]}
+                ).prefetch_related(None).order_by().values_list(field, flat=True).first()
+            except (TypeError, ValueError, DjangoValidationError):
+                # Malformed lookups get their 404 from get_object()
+                pass
+        if last_modified is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = self.make_etag(last_modified.isoformat())
+        # A related row can change without moving the object's own timestamp
+        not_modified = get_conditional_response(
+            request._request, etag=etag,
+            last_modified=None if self.get_conditional_tags() else int(last_modified.timestamp())
+        )
+        if not_modified is not None:
+            return self.with_validators(not_modified, etag, last_modified)
+        return self.with_validators(super().retrieve(request, *args, **kwargs), etag, last_modified)
+
+
+class CachedListMixin:
+    """
+    Serves list data from core.cache.response_cache, keyed by the request
+    and the caller, and tagged with `cache_models` (model labels the
+    payload is built from). With `cache_project_param` set, a request
+    filtered to one project depends on that project's tags only, so
+    writes elsewhere leave it cached.
+    """
+    cache_models = ()
+    cache_project_param = None
+
+    def get_cache_tags(self):
+        project_id = None
+        if self.cache_project_param:
+            value = self.request.query_params.get(self.cache_project_param, '')
+            project_id = int(value) if value.isdigit() else None
+        return tags_for(self.cache_models, project_id)
+
+    def list(self, request, *args, **kwargs):
+        if not self.cache_models:
+            return super().list(request, *args, **kwargs)
+        key = '|'.join(str(part) for part in (
+            type(self).__name__,
+            request.get_full_path(),
+            getattr(request.accepted_renderer, 'format', ''),
+            request.user.pk,
+            get_request_role(request),
+        ))
+        parent = super()
+
+        def render():
+            return parent.list(request, *args, **kwargs).data
+
+        return Response(response_cache.get_or_set(key, self.get_cache_tags(), render))
+
+
+class FastListMixin:
+    """
+    With `fast_list = True`, list responses are built from
+    queryset.values() through a core.fastlist.ValuesPlan compiled from the
+    serializer, skipping model instances and per-row field walking. The
+    output matches the serializer's; serializers the plan cannot
+    reproduce (method fields, custom to_representation, many-valued
+    relations) fall back to the regular path.
+    """
+    fast_list = False
+
+    def get_values_plan(self):
+        if not self.fast_list:
+            return None
+        serializer = self.get_serializer(many=True)
+        return ValuesPlan.compile(serializer.child, self.get_queryset().model)
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        columns = list(plan.columns)
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        # Cursor pagination reads its position from the row
+        columns += [name.lstrip('-') for name in ordering if name.lstrip('-') not in columns]
+        rows = self.filter_queryset(self.get_queryset()).prefetch_related(None).values(*columns)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(rows))
@@ -1,7 +1,155 @@
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
 from django.utils import timezone
 
-class SoftDeleteManager(models.Manager):
+# Predicate applied by SoftDeleteManager to every query
+LIVE_ROWS = Q(deleted_at__isnull=True)
+
+# Sent once per model touched by a bulk soft delete / restore, with the
+# affected primary keys. Model save/delete signals are not sent for these.
+soft_deleted = Signal()  # sender, pks, deleted_at
+restored = Signal()  # sender, pks
+
+# Sent after a bulk_update, with the prior values of the changed fields
+# keyed by primary key, so receivers can compute before/after deltas.
+bulk_updated = Signal()  # sender, objs, previous
+
+# Sent after a bulk_create of new rows, which skips post_save.
+bulk_created = Signal()  # sender, objs
+
+def live_index(*fields, name):
+    """
+    Partial index covering only rows that are not soft-deleted, matching the
+    filter SoftDeleteManager adds, so deleted rows do not bloat hot lookups.
+    """
+    return models.Index(fields=list(fields), name=name, condition=LIVE_ROWS)
+
+def cascade_relations(model):
+    """
+    Reverse relations whose rows should follow `model` into the bin: foreign
+    keys declared with on_delete=CASCADE on other SoftDeleteModel subclasses.
+    """
+    return [
+        rel for rel in model._meta.related_objects
+        if not rel.many_to_many
+        and rel.on_delete is models.CASCADE
+        and issubclass(rel.related_model, SoftDeleteModel)
+    ]
+
+def soft_delete_rows(queryset, deleted_at, counter):
+    model = queryset.model
+    pks = list(queryset.filter(deleted_at__isnull=True).values_list('pk', flat=True))
+    if not pks:
+        return
+    counter[model._meta.label] += model._base_manager.filter(pk__in=pks).update(deleted_at=deleted_at)
+    soft_deleted.send(sender=model, pks=pks, deleted_at=deleted_at)
+
+    for rel in cascade_relations(model):
+        children = rel.related_model._base_manager.filter(**{f'{rel.field.name}__in': pks})
+        soft_delete_rows(children, deleted_at, counter)
+
+def restore_rows(queryset, counter):
+    model = queryset.model
+    batches = defaultdict(list)
+    for pk, deleted_at in queryset.filter(deleted_at__isnull=False).values_list('pk', 'deleted_at'):
+        batches[deleted_at].append(pk)
+
+    for deleted_at, pks in batches.items():
+        counter[model._meta.label] += model._base_manager.filter(pk__in=pks).update(
+            deleted_at=None, updated_at=timezone.now()
+        )
+        restored.send(sender=model, pks=pks)
+
+        # Only children removed by the same cascade share the parent's timestamp
+        for rel in cascade_relations(model):
+            children = rel.related_model._base_manager.filter(
+                **{f'{rel.field.name}__in': pks}, deleted_at=deleted_at
+            )
+            restore_rows(children, counter)
+
+def path_values(model, path, instance=None, pks=None):
+    """
+    Values reached through the lookup `path` from one `model` instance
+    (which may already be deleted) or from the rows with the given pks.
+    """
+    if path == 'pk':
+        return [instance.pk] if instance is not None else list(pks)
+    if instance is None:
+        return list(model._base_manager.filter(pk__in=pks).values_list(path, flat=True))
+    first, _, rest = path.partition('__')
+    field = model._meta.get_field(first)
+    value = getattr(instance, field.attname)
+    if not rest:
+        return [value]
+    return list(field.related_model._base_manager.filter(pk=value).values_list(rest, flat=True))
+
+def on_rows_changed(model, callback, dispatch_uid):
+    """
+    Calls `callback(instance=...)` after a row of `model` is saved or
+    deleted, and `callback(pks=...)` after it is soft-deleted, restored,
+    bulk-updated or bulk-created.
+    """
+    def instance_changed(sender, instance, raw=False, **kwargs):
+        if not raw:
+            callback(instance=instance)
+
+    def rows_changed(sender, pks=None, objs=None, **kwargs):
+        callback(pks=pks if pks is not None else [obj.pk for obj in objs])
+
+    post_save.connect(instance_changed, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    post_delete.connect(instance_changed, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    for signal in (soft_deleted, restored, bulk_updated, bulk_created):
+        signal.connect(rows_changed, sender=model, weak=False, dispatch_uid=dispatch_uid)
+
+def touch_parents(model, path):
+    """
+    Bumps `updated_at` on the row reached from `model` through `path`
+    (e.g. 'task' or 'task_file__task') whenever a `model` row changes, so
+    validators built from the parent's `updated_at` notice nested edits.
+    """
+    parent = model
+    for name in path.split('__'):
+        parent = parent._meta.get_field(name).related_model
+
+    def touch(instance=None, pks=None):
+        ids = path_values(model, path, instance, pks)
+        parent._base_manager.filter(pk__in=ids).update(updated_at=timezone.now())
+
+    on_rows_changed(model, touch, f'touch_{model._meta.label_lower}_{path}')
+
+def soft_delete(queryset, deleted_at):
+    counter = Counter()
+    with transaction.atomic(using=queryset.db):
+        soft_delete_rows(queryset, deleted_at, counter)
+    return sum(counter.values()), dict(counter)
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def delete(self):
+        """
+        Soft-deletes every matching row with one UPDATE per model, cascading
+        to related SoftDeleteModel rows. Returns the same (total, per-model)
+        shape as QuerySet.delete().
+        """
+        return soft_delete(self, timezone.now())
+
+    def restore(self):
+        """
+        Undeletes matching rows along with the children that were
+        soft-deleted in the same cascade.
+        """
+        counter = Counter()
+        with transaction.atomic(using=self.db):
+            restore_rows(self, counter)
+        return sum(counter.values()), dict(counter)
+
+    def hard_delete(self):
+        return super().delete()
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
     def get_queryset(self):
         return super().get_queryset().filter(deleted_at__isnull=True)
 
@@ -11,14 +159,23 @@ class SoftDeleteModel(models.Model):
     deleted_at = models.DateTimeField(null=True, blank=True)
 
     objects = SoftDeleteManager()
-    all_objects = models.Manager()
+    all_objects = SoftDeleteQuerySet.as_manager()
 
     class Meta:
         abstract = True
 
     def delete(self, **kwargs):
-        self.deleted_at = timezone.now()
-        self.save()
+        if self.deleted_at:
+            return 0, {}
+        deleted_at = timezone.now()
+        result = soft_delete(type(self).all_objects.filter(pk=self.pk), deleted_at)
+        self.deleted_at = deleted_at
+        return result
+
+    def restore(self):
+        result = type(self).all_objects.filter(pk=self.pk).restore()
+        self.deleted_at = None
+        return result
 
     def hard_delete(self, **kwargs):
-        super().delete(**kwargs)
\ No newline at end of file
+        return super().delete(**kwargs)
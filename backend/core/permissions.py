@@ -1,28 +1,29 @@
 
 from rest_framework import permissions
 
+from core.roles import get_request_role
+
 class IsSuperAdmin(permissions.BasePermission):
     def has_permission(self, request, view):
         return (
             request.user.is_authenticated and 
-            request.user.role and 
-            request.user.role.name == 'SUPER_ADMIN'
+            get_request_role(request) == 'SUPER_ADMIN'
         )
 
 class IsProjectManager(permissions.BasePermission):
     def has_permission(self, request, view):
-        if not request.user.is_authenticated or not request.user.role:
+        if not request.user.is_authenticated:
             return False
-        return request.user.role.name in ['SUPER_ADMIN', 'PROJECT_MANAGER']
+        return get_request_role(request) in ['SUPER_ADMIN', 'PROJECT_MANAGER']
 
 class IsSalesManager(permissions.BasePermission):
     def has_permission(self, request, view):
-        if not request.user.is_authenticated or not request.user.role:
+        if not request.user.is_authenticated:
             return False
-        return request.user.role.name in ['SUPER_ADMIN', 'SALES_MANAGER']
+        return get_request_role(request) in ['SUPER_ADMIN', 'SALES_MANAGER']
 
 class IsTeamMember(permissions.BasePermission):
     def has_permission(self, request, view):
-        if not request.user.is_authenticated or not request.user.role:
+        if not request.user.is_authenticated:
             return False
-        return request.user.role.name in ['SUPER_ADMIN', 'PROJECT_MANAGER', 'TEAM_MEMBER']
+        return get_request_role(request) in ['SUPER_ADMIN', 'PROJECT_MANAGER', 'TEAM_MEMBER']
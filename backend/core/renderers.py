@@ -0,0 +1,86 @@
+import datetime
+import decimal
+import uuid
+
+from django.db.models.query import QuerySet
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to DRF's stdlib path
+    orjson = None
+
+
+def orjson_default(obj):
+    """
+    Types orjson does not encode natively, converted the way DRF's
+    JSONEncoder does so both renderers produce the same document.
+    """
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, decimal.Decimal):
+        # Serializers coerce decimals to strings unless told otherwise
+        return float(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, QuerySet):
+        return tuple(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, 'tolist'):
+        # NumPy scalars and arrays
+        return obj.tolist()
+    if hasattr(obj, '__iter__'):
+        return tuple(obj)
+    raise TypeError
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson. Output parses to the same document as
+    DRF's renderer (UTC datetimes end in 'Z', decimals become numbers) but
+    is not always byte-identical: floats take orjson's shortest form
+    (1e16 rather than 1e+16), and NaN and Infinity are written as null
+    where DRF's strict mode raises. Anything orjson cannot encode, such as
+    integers wider than 64 bits, falls back to the stdlib path.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        option = orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        try:
+            ret = orjson.dumps(data, default=orjson_default, option=option)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped like DRF does, since they are invalid inside JavaScript strings
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser backed by orjson for UTF-8 request bodies."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8').lower()
+        if orjson is None or encoding.replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
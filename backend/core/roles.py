@@ -0,0 +1,15 @@
+from django.conf import settings
+
+ROLE_CLAIM = 'role'
+
+
+def get_request_role(request):
+    """
+    Role name of the authenticated user. With JWT_ROLE_CLAIMS enabled the
+    already verified token claim is used and no database access happens.
+    """
+    token = request.auth
+    if getattr(settings, 'JWT_ROLE_CLAIMS', False) and token is not None and ROLE_CLAIM in token:
+        return token[ROLE_CLAIM]
+    role = getattr(request.user, 'role', None)
+    return role.name if role else None
@@ -0,0 +1,70 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Alias reads are sent to for the current request; None means the primary
+read_alias = ContextVar('read_alias', default=None)
+
+# Replica alias -> monotonic time until which it is skipped after an error
+_unhealthy_until = {}
+
+
+@contextmanager
+def read_from(alias):
+    token = read_alias.set(alias)
+    try:
+        yield
+    finally:
+        read_alias.reset(token)
+
+
+def use_primary():
+    """
+    Reads inside the block go to the primary, for code that writes back
+    what it read (replica lag would otherwise be persisted).
+    """
+    return read_from(None)
+
+
+def mark_unhealthy(alias):
+    _unhealthy_until[alias] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+
+
+def choose_replica():
+    """A random replica that has not failed recently, or None."""
+    now = time.monotonic()
+    healthy = [
+        alias for alias in settings.DATABASE_REPLICAS
+        if _unhealthy_until.get(alias, 0) <= now
+    ]
+    random.shuffle(healthy)
+    for alias in healthy:
+        try:
+            connections[alias].ensure_connection()
+        except Exception:
+            mark_unhealthy(alias)
+            continue
+        return alias
+    return None
+
+
+class ReplicaRouter:
+    """
+    Sends reads to the alias chosen for the current request by
+    core.middleware.ReplicaRoutingMiddleware and everything else to the
+    primary. Outside an opted-in request this router stays neutral.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
@@ -0,0 +1,167 @@
+import gzip
+import json
+import tempfile
+import unittest
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import OperationalError, connections
+from django.test import override_settings
+from django.utils.functional import lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+
+from apps.activity.models import ActivityLog
+from apps.projects.models import Client, Project
+from apps.tasks.models import TaskType
+from apps.users.models import Department, Role, User
+from core import routers
+from core.management.commands.benchmark_sqlite_concurrency import ALIAS, register_database
+from core.middleware import pin_key
+from core.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='admin', email='admin@example.com', password='secret', name='Admin',
+            role=Role.objects.create(name='SUPER_ADMIN'), department=Department.objects.create(name='Development')
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_matches_drf_output(self):
+        data = {
+            'created_at': datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc),
+            'amount': Decimal('12.50'),
+            'id': uuid.UUID(int=1),
+            'label': lazy(lambda: 'Ready', str)(),
+            'note': 'line\u2028break',
+            'items': [1, 0.1, None, True],
+        }
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_non_finite_floats_are_written_as_null(self):
+        data = {'nan': float('nan'), 'inf': float('inf')}
+
+        self.assertEqual(ORJSONRenderer().render(data), b'{"nan":null,"inf":null}')
+        # DRF's strict mode refuses them instead
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(data)
+
+    def test_float_formatting_differs_but_parses_the_same(self):
+        data = [1e16, 1.5e-7]
+
+        self.assertEqual(ORJSONRenderer().render(data), b'[1e16,1.5e-7]')
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+    def test_endpoint_output_matches_drf_output(self):
+        TaskType.objects.create(name='Dev', description='Development work')
+
+        response = self.client.get('/api/v1/task-types/')
+
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_responses_are_gzipped_on_request(self):
+        TaskType.objects.bulk_create([TaskType(name=f'Type {i}', description='Lorem ipsum') for i in range(20)])
+
+        response = self.client.get('/api/v1/task-types/', HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content)), json.loads(JSONRenderer().render(response.data)))
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(APITestCase):
+    # The replica is a separate, empty test database: rows written to the
+    # primary are only visible to requests that read from the primary
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        department = Department.objects.create(name='Development')
+        self.user = User.objects.create_user(
+            username='admin', email='admin@example.com', password='secret', name='Admin',
+            role=Role.objects.create(name='SUPER_ADMIN'), department=department
+        )
+        client = Client.objects.create(
+            name='Acme', email='acme@example.com', phone='123', company_name='Acme Ltd', address='Street 1'
+        )
+        self.project = Project.objects.create(
+            name='Website', client=client, department=department,
+            project_manager=self.user, created_by=self.user,
+            start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+        )
+        routers._unhealthy_until.clear()
+        caches[settings.REPLICA_PIN_CACHE].clear()
+        ActivityLog.objects.create(user=self.user, project=self.project, action='Primary only')
+        # Accounts are on the replica too, so bearer tokens authenticate there
+        for model in (Role, Department, User):
+            model.objects.using('replica').bulk_create(model.objects.all())
+        response = self.client.post('/api/login/', {'username': 'admin', 'password': 'secret'})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def list_actions(self):
+        response = self.client.get('/api/v1/activity-logs/')
+        self.assertEqual(response.status_code, 200)
+        return [entry['action'] for entry in response.data['results']]
+
+    def test_opted_in_reads_go_to_the_replica(self):
+        self.assertEqual(self.list_actions(), [])
+        # Views without use_replica keep reading the primary
+        self.assertEqual(len(self.client.get('/api/v1/clients/').data), 1)
+
+    def test_writes_pin_the_user_to_the_primary(self):
+        self.client.post('/api/v1/task-types/', {'name': 'Dev'})
+        self.assertEqual(self.list_actions(), ['Primary only'])
+
+        # The pin follows the user, not a cookie, onto other clients
+        other = APIClient()
+        response = other.post('/api/login/', {'username': 'admin', 'password': 'secret'})
+        other.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(len(other.get('/api/v1/activity-logs/').data['results']), 1)
+
+        caches[settings.REPLICA_PIN_CACHE].delete(pin_key(self.user.pk))
+        self.assertEqual(self.list_actions(), [])
+
+    def test_replica_errors_fall_back_to_the_primary(self):
+        with connections['replica'].cursor() as cursor:
+            cursor.execute('DROP TABLE activity_activitylog')
+
+        self.assertEqual(self.list_actions(), ['Primary only'])
+        self.assertIsNone(routers.choose_replica())
+
+
+class ProductionDatabaseProfileTests(unittest.TestCase):
+    # Plain TestCase: Django's test cases forbid connections to undeclared aliases
+
+    def test_connections_run_in_wal_mode_with_tuned_pragmas(self):
+        with tempfile.TemporaryDirectory() as directory:
+            register_database({
+                **settings.DATABASE_PROFILES['production'], 'NAME': Path(directory) / 'production.sqlite3'
+            })
+            try:
+                with connections[ALIAS].cursor() as cursor:
+                    pragmas = {
+                        name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                        for name in ('journal_mode', 'synchronous', 'busy_timeout')
+                    }
+                self.assertEqual(pragmas, {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 5000})
+                self.assertEqual(connections[ALIAS].transaction_mode, 'IMMEDIATE')
+            finally:
+                connections[ALIAS].close()
+
+    def test_replica_connections_only_read(self):
+        with tempfile.TemporaryDirectory() as directory:
+            register_database({**settings.REPLICA_DATABASE, 'NAME': Path(directory) / 'replica.sqlite3'})
+            try:
+                with connections[ALIAS].cursor() as cursor:
+                    self.assertEqual(cursor.execute('PRAGMA query_only').fetchone()[0], 1)
+                    with self.assertRaises(OperationalError):
+                        cursor.execute('CREATE TABLE entry (id INTEGER PRIMARY KEY)')
+                self.assertIsNone(connections[ALIAS].transaction_mode)
+            finally:
+                connections[ALIAS].close()
@@ -0,0 +1,21 @@
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from core.roles import ROLE_CLAIM
+
+VERSION_CLAIM = 'ver'
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Embeds the user's role name, department id, status and token version
+    in issued tokens so requests can be authorized from the token itself.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[ROLE_CLAIM] = user.role.name if user.role else None
+        token['department'] = user.department_id
+        token['status'] = user.status
+        token[VERSION_CLAIM] = user.token_version
+        return token